@@ -0,0 +1,208 @@
+import os
+import json
+import mmap
+import struct
+import argparse
+import threading
+
+from PyQt5.QtGui import QImage
+from PyQt5.QtCore import Qt, QBuffer, QByteArray, QIODevice
+
+from cover_constants import CARD_COVER_SIZES, COVER_EXTENSIONS, DETAILS_COVER_SIZE
+from instrumentation import configure_logging, get_logger
+
+ATLAS_PATH = "covers.atlas"
+ATLAS_MAGIC = b"GLCOVERS"
+ATLAS_VERSION = 1
+# Magic, version, offset and length of the index
+HEADER = struct.Struct("<8sIQQ")
+ATLAS_FORMAT = "jpg"
+ATLAS_QUALITY = 90
+COMPACT_RATIO = 0.5  # Compact once dead bytes are more than half the file
+# gui_v2's details cover and gui_v1's card sizes
+ATLAS_SIZES = (DETAILS_COVER_SIZE, *CARD_COVER_SIZES.values())
+
+log = get_logger("cover_atlas")
+
+
+def entry_name(source_path, width, height):
+    return f"{width}x{height}/{os.path.basename(source_path)}"
+
+
+def encode_image(image):
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    if not image.save(buffer, ATLAS_FORMAT, ATLAS_QUALITY):
+        return None
+    return bytes(data)
+
+
+class CoverAtlas:
+    # All pre-scaled covers in one file, so a cold start opens one file instead of
+    # one per cover. Layout: a fixed header pointing at the index, the encoded images
+    # back to back, then the index: JSON of "WIDTHxHEIGHT/file name" to
+    # [offset, length, source mtime_ns, source size].
+    # The launcher maps the file read-only and decodes straight from slices of the
+    # map. update() appends changed covers and a new index after the old ones and
+    # only then rewrites the header, so an interrupted build leaves the old index
+    # intact; the dead space is reclaimed by compacting into a new file.
+    def __init__(self, path=ATLAS_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = None
+        self.map = None
+        self.entries = {}
+        self.index_length = 0
+        self.open()
+
+    def open(self):
+        # Maps the file, returns False if there is no usable atlas
+        self.close()
+        try:
+            file = open(self.path, "rb")
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            log.warning("Could not open cover atlas %s: %s", self.path, e)
+            return False
+        try:
+            magic, version, index_offset, index_length = HEADER.unpack(file.read(HEADER.size))
+            if magic != ATLAS_MAGIC or version != ATLAS_VERSION:
+                raise ValueError("not a cover atlas")
+            atlas_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            entries = json.loads(atlas_map[index_offset:index_offset + index_length])
+        except (OSError, ValueError, struct.error) as e:
+            log.warning("Could not read cover atlas %s: %s", self.path, e)
+            file.close()
+            return False
+        with self.lock:
+            self.file, self.map, self.entries, self.index_length = file, atlas_map, entries, index_length
+        return True
+
+    def close(self):
+        # Loads still decoding keep their own reference, the map closes once they finish
+        with self.lock:
+            file, self.file, self.map, self.entries = self.file, None, None, {}
+        if file:
+            file.close()
+
+    def load_image(self, source_path, stat, width, height):
+        # The packed cover if it was built from this exact source, else None.
+        # Safe to call from worker threads.
+        with self.lock:
+            atlas_map = self.map
+            entry = self.entries.get(entry_name(source_path, width, height))
+        if atlas_map is None or not entry or entry[2:] != [stat.st_mtime_ns, stat.st_size]:
+            return None
+        offset, length = entry[:2]
+        # QImage decodes from the slice without copying it into a Python bytes first
+        with memoryview(atlas_map) as view, view[offset:offset + length] as data:
+            image = QImage.fromData(data, ATLAS_FORMAT)
+        return None if image.isNull() else image
+
+    def dead_bytes(self, file_size, entries):
+        # Space taken by replaced or dropped covers and old indexes if entries are kept
+        live = sum(entry[1] for entry in entries.values())
+        return file_size - HEADER.size - live - self.index_length
+
+    def update(self, source_paths, sizes=ATLAS_SIZES, compact=False):
+        # Packs every source at every size. Covers whose source is unchanged are kept,
+        # changed and new ones appended, and ones whose source is gone dropped.
+        entries = {}
+        added = {}
+        for source_path in source_paths:
+            try:
+                stat = os.stat(source_path)
+            except OSError:
+                continue
+            image = None
+            for width, height in sizes:
+                name = entry_name(source_path, width, height)
+                entry = self.entries.get(name)
+                if entry and entry[2:] == [stat.st_mtime_ns, stat.st_size]:
+                    entries[name] = entry
+                    continue
+                if image is None:
+                    image = QImage(source_path)  # Decoded once for all sizes
+                    if image.isNull():
+                        log.warning("Image loading failed: %s", source_path)
+                        break
+                data = encode_image(image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+                if data is None:
+                    log.warning("Could not encode cover: %s", source_path)
+                    continue
+                added[name] = (data, stat.st_mtime_ns, stat.st_size)
+        removed = len(set(self.entries) - set(entries) - set(added))
+        log.info("Cover atlas: %s covers added, %s removed, %s unchanged", len(added), removed, len(entries))
+
+        file_size = os.path.getsize(self.path) if self.map is not None else 0
+        if self.map is None or compact or self.dead_bytes(file_size, entries) > file_size * COMPACT_RATIO:
+            self.rewrite(entries, added)
+        elif added or removed:
+            self.append(entries, added)
+        return len(added), removed
+
+    def write_blobs(self, file, blobs, entries):
+        for name, (data, mtime, size) in blobs.items():
+            entries[name] = [file.tell(), len(data), mtime, size]
+            file.write(data)
+
+    def write_index(self, file, entries):
+        index = json.dumps(entries, separators=(",", ":")).encode("utf-8")
+        index_offset = file.tell()
+        file.write(index)
+        file.flush()
+        os.fsync(file.fileno())
+        return index_offset, len(index)
+
+    def append(self, entries, added):
+        self.close()
+        with open(self.path, "r+b") as file:
+            file.seek(0, os.SEEK_END)
+            self.write_blobs(file, added, entries)
+            index_offset, index_length = self.write_index(file, entries)
+            file.seek(0)
+            file.write(HEADER.pack(ATLAS_MAGIC, ATLAS_VERSION, index_offset, index_length))
+        self.open()
+
+    def rewrite(self, entries, added):
+        # Writes only the live covers to a new file and swaps it in
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(HEADER.pack(ATLAS_MAGIC, ATLAS_VERSION, 0, 0))
+            with self.lock:
+                atlas_map = self.map
+            kept = {name: (atlas_map[offset:offset + length], mtime, size)
+                    for name, (offset, length, mtime, size) in entries.items()}
+            self.write_blobs(file, {**kept, **added}, entries)
+            index_offset, index_length = self.write_index(file, entries)
+            file.seek(0)
+            file.write(HEADER.pack(ATLAS_MAGIC, ATLAS_VERSION, index_offset, index_length))
+        self.close()
+        del atlas_map
+        try:
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            # Windows refuses while a running launcher has the atlas mapped
+            log.error("Could not replace %s, is the launcher running? %s", self.path, e)
+            os.remove(temp_path)
+        self.open()
+
+
+def cover_sources(directory):
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if name.lower().endswith(COVER_EXTENSIONS)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack the scaled game covers into one file")
+    parser.add_argument("directory", nargs="?", default="photos", help="folder with the original covers")
+    parser.add_argument("--atlas", default=ATLAS_PATH, help="atlas file to create or update")
+    parser.add_argument("--compact", action="store_true", help="rewrite the atlas without dead space")
+    args = parser.parse_args()
+
+    configure_logging()
+    atlas = CoverAtlas(args.atlas)
+    atlas.update(cover_sources(args.directory), compact=args.compact)
+    atlas.close()
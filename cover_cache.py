@@ -0,0 +1,169 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtCore import Qt
+
+from instrumentation import get_logger, span, timed
+
+THUMBNAIL_FORMAT = "jpg"
+THUMBNAIL_QUALITY = 90
+
+log = get_logger("cover_cache")
+
+
+def cache_key(source_path, stat, width, height):
+    raw = f"{os.path.abspath(source_path)}|{stat.st_mtime_ns}|{stat.st_size}|{width}x{height}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class CoverCache:
+    # Two cache levels for scaled covers:
+    #  - memory: LRU of ready-to-display QPixmaps, bounded in bytes (GUI thread only)
+    #  - disk: the packed cover atlas if one was built, then pre-scaled thumbnails
+    #    per target size, keyed by source path/mtime/size
+    # load_image() only touches QImage and is safe to call from worker threads.
+    def __init__(self, cache_dir=".cover_cache", memory_limit=128 * 1024 * 1024, disk_limit=256 * 1024 * 1024,
+                 atlas=None):
+        self.cache_dir = cache_dir
+        self.atlas = atlas
+        self.memory_limit = memory_limit
+        self.disk_limit = disk_limit
+        self.pixmaps = OrderedDict()
+        self.memory_used = 0
+        self.disk_lock = threading.Lock()
+        self.disk_used = None
+        self.stats = {"memory_hits": 0, "memory_misses": 0, "atlas_hits": 0, "disk_hits": 0, "disk_misses": 0,
+                      "memory_evictions": 0, "disk_evictions": 0}
+
+    def thumbnail_path(self, key, width, height):
+        return os.path.join(self.cache_dir, f"{width}x{height}", f"{key}.{THUMBNAIL_FORMAT}")
+
+    @timed("cover.load")
+    def load_image(self, source_path, width, height):
+        # Returns the cover scaled to fit width x height, from the disk cache if possible
+        try:
+            stat = os.stat(source_path)
+        except OSError:
+            return None
+        if self.atlas is not None:
+            image = self.atlas.load_image(source_path, stat, width, height)
+            if image is not None:
+                with self.disk_lock:
+                    self.stats["atlas_hits"] += 1
+                return image
+        key = cache_key(source_path, stat, width, height)
+        thumbnail_path = self.thumbnail_path(key, width, height)
+
+        image = QImage(thumbnail_path)
+        with self.disk_lock:
+            self.stats["disk_hits" if not image.isNull() else "disk_misses"] += 1
+        if not image.isNull():
+            return image
+
+        with span("cover.decode"):
+            image = QImage(source_path)
+            if image.isNull():
+                log.warning("Image loading failed: %s", source_path)
+                return None
+            image = image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.store_thumbnail(image, thumbnail_path)
+        return image
+
+    def store_thumbnail(self, image, thumbnail_path):
+        os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+        temp_path = f"{thumbnail_path}.{threading.get_ident()}.tmp"
+        if not image.save(temp_path, THUMBNAIL_FORMAT, THUMBNAIL_QUALITY):
+            log.warning("Could not write thumbnail: %s", thumbnail_path)
+            return
+        os.replace(temp_path, thumbnail_path)
+        with self.disk_lock:
+            if self.disk_used is None:
+                self.disk_used = self.measure_disk_usage()
+            else:
+                self.disk_used += os.path.getsize(thumbnail_path)
+            if self.disk_used > self.disk_limit:
+                self.evict_disk()
+
+    def measure_disk_usage(self):
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                total += os.path.getsize(os.path.join(root, name))
+        return total
+
+    def evict_disk(self):
+        # Drops the oldest thumbnails until the cache is back under 90% of its limit
+        files = []
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+        target = self.disk_limit * 0.9
+        for _, size, path in files:
+            if self.disk_used <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.disk_used -= size
+            self.stats["disk_evictions"] += 1
+
+    def peek_pixmap(self, source_path, width, height):
+        # Memory level only, returns None instead of loading
+        try:
+            mtime = os.stat(source_path).st_mtime_ns
+        except OSError:
+            return None
+        key = (source_path, width, height)
+        cached = self.pixmaps.get(key)
+        if cached and cached[0] == mtime:
+            self.pixmaps.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return cached[1]
+        self.stats["memory_misses"] += 1
+        return None
+
+    def get_pixmap(self, source_path, width, height):
+        # GUI thread only: QPixmaps can't be created elsewhere
+        pixmap = self.peek_pixmap(source_path, width, height)
+        if pixmap is not None:
+            return pixmap
+        image = self.load_image(source_path, width, height)
+        if image is None:
+            return None
+        return self.add_image(source_path, width, height, image)
+
+    def add_image(self, source_path, width, height, image):
+        # Turns an image loaded by load_image() into a cached pixmap (GUI thread only)
+        try:
+            mtime = os.stat(source_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        pixmap = QPixmap.fromImage(image)
+        self.put_pixmap((source_path, width, height), mtime, pixmap)
+        return pixmap
+
+    def put_pixmap(self, key, mtime, pixmap):
+        old = self.pixmaps.pop(key, None)
+        if old:
+            self.memory_used -= self.pixmap_size(old[1])
+        self.pixmaps[key] = (mtime, pixmap)
+        self.memory_used += self.pixmap_size(pixmap)
+        while self.memory_used > self.memory_limit and len(self.pixmaps) > 1:
+            _, (_, evicted) = self.pixmaps.popitem(last=False)
+            self.memory_used -= self.pixmap_size(evicted)
+            self.stats["memory_evictions"] += 1
+
+    @staticmethod
+    def pixmap_size(pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def clear_memory(self):
+        self.pixmaps.clear()
+        self.memory_used = 0
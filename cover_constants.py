@@ -0,0 +1,9 @@
+# Cover sizes and formats shared by the GUIs and the cover storage modules, kept free
+# of Qt so storage code can use them without importing widgets
+
+# gui_v2's details pane
+DETAILS_COVER_SIZE = (500, 800)
+# Cover size of a gui_v1 card for each display style
+CARD_COVER_SIZES = {"grid": (300, 400), "horizontal": (375, 450)}
+# Cover file types, preferred first when a game has covers in several formats
+COVER_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
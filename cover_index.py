@@ -0,0 +1,135 @@
+import os
+
+from search_index import normalize, edit_distance
+from cover_constants import COVER_EXTENSIONS
+from instrumentation import get_logger
+
+COVER_DIRECTORY = "./photos"
+PLACEHOLDER_COVER = "default_cover.jpg.jpg"
+ROMAN_NUMERALS = {numeral: str(value) for value, numeral in enumerate(
+    ["i", "ii", "iii", "iv", "v", "vi", "vii", "viii", "ix", "x", "xi", "xii", "xiii", "xiv", "xv"], 1)}
+MIN_FUZZY_SCORE = 0.5
+
+log = get_logger("cover_index")
+
+
+def cover_words(name):
+    # Normalized words with roman numerals as digits: "Assassin's Creed IV" -> assassins creed 4
+    return tuple(ROMAN_NUMERALS.get(word, word) for word in normalize(name))
+
+
+def same_word(a, b):
+    return a == b or (min(len(a), len(b)) >= 5 and edit_distance(a, b, 1) <= 1)
+
+
+def fuzzy_score(words, candidate):
+    # Share of the longer name covered when every word of the shorter one is found in it.
+    # Numbers must agree exactly, "Dark Souls" never takes the "Dark Souls II" cover.
+    if sorted(word for word in words if word.isdigit()) != sorted(word for word in candidate if word.isdigit()):
+        return 0
+    shorter, longer = sorted((words, candidate), key=len)
+    if not all(any(same_word(word, other) for other in longer) for word in shorter):
+        return 0
+    return len(shorter) / len(longer)
+
+
+class CoverIndex:
+    # Maps game names to cover files, built from one listing of the cover directory
+    # instead of an os.path.exists per game. Tries the exact file name first, then
+    # normalized words (case, accents, trademark glyphs, roman numerals), then a fuzzy
+    # word match that must be unambiguous. Games without a cover have no path, the
+    # GUIs show placeholder_pixmap() for them.
+    def __init__(self, directory=COVER_DIRECTORY, placeholder=PLACEHOLDER_COVER):
+        self.directory = directory
+        self.placeholder = os.path.join(directory, placeholder)
+        self.placeholder_pixmaps = {}
+        self.directory_mtime = None
+        self.refresh()
+
+    def refresh(self):
+        # Rebuilds the index if files were added to or removed from the directory
+        try:
+            mtime = os.stat(self.directory).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self.directory_mtime and mtime is not None:
+            return False
+        self.directory_mtime = mtime
+        self.exact = {}
+        self.normalized = {}
+        self.word_covers = {}
+        self.matches = {}
+        self.fuzzy_matches = {}
+        try:
+            filenames = os.listdir(self.directory)
+        except OSError as e:
+            log.warning("Cover directory not readable: %s", e)
+            filenames = []
+        placeholder = os.path.basename(self.placeholder)
+        rank = {extension: index for index, extension in enumerate(COVER_EXTENSIONS)}
+        for filename in sorted(filenames, key=lambda name: rank.get(os.path.splitext(name)[1].lower(), len(rank))):
+            stem, extension = os.path.splitext(filename)
+            if extension.lower() not in rank or filename == placeholder:
+                continue
+            path = os.path.join(self.directory, filename)
+            self.exact.setdefault(stem, path)
+            words = cover_words(stem)
+            if words and words not in self.normalized:
+                self.normalized[words] = path
+                for word in words:
+                    self.word_covers.setdefault(word, []).append(words)
+        return True
+
+    def find(self, name):
+        # The cover file for a game, or None
+        if name in self.matches:
+            return self.matches[name]
+        path = self.exact.get(name)
+        if path is None:
+            words = cover_words(name)
+            path = self.normalized.get(words)
+            if path is None and words:
+                path = self.find_fuzzy(name, words)
+        self.matches[name] = path
+        return path
+
+    def find_fuzzy(self, name, words):
+        candidates = {candidate for word in words for candidate in self.word_covers.get(word, ())}
+        scored = sorted(((fuzzy_score(words, candidate), candidate) for candidate in candidates), reverse=True)
+        if not scored or scored[0][0] < MIN_FUZZY_SCORE:
+            return None
+        if len(scored) > 1 and scored[1][0] == scored[0][0]:
+            return None  # Ambiguous, a wrong cover is worse than the placeholder
+        path = self.normalized[scored[0][1]]
+        self.fuzzy_matches[name] = path
+        return path
+
+    def cover_path(self, name):
+        # The cover file for a game, or None; never the placeholder, so a missing cover
+        # is never decoded and cached as if it were the game's own
+        return self.find(name)
+
+    def placeholder_pixmap(self, cover_cache, width, height):
+        # Kept outside the cover cache's LRU, it is shown for every game without a cover
+        pixmap = self.placeholder_pixmaps.get((width, height))
+        if pixmap is None:
+            pixmap = cover_cache.get_pixmap(self.placeholder, width, height)
+            if pixmap is not None:
+                self.placeholder_pixmaps[(width, height)] = pixmap
+        return pixmap
+
+    def report_missing(self, names, path="missing_covers.txt"):
+        # Writes which games have no cover and which only matched fuzzily, so the
+        # files can be added or renamed
+        missing = sorted(name for name in names if self.find(name) is None)
+        fuzzy = sorted((name, self.fuzzy_matches[name]) for name in names if name in self.fuzzy_matches)
+        lines = [f"Games without a cover ({len(missing)}):"] + [f"  {name}" for name in missing]
+        lines += [f"Covers matched by a similar name ({len(fuzzy)}):"] + [f"  {name} -> {cover}" for name, cover in fuzzy]
+        try:
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("\n".join(lines) + "\n")
+        except OSError as e:
+            log.warning("Could not write cover report: %s", e)
+        if missing or fuzzy:
+            log.info("%s games without a cover, %s matched by a similar name, see %s", len(missing), len(fuzzy), path)
+        return missing
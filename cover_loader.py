@@ -0,0 +1,81 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+REQUEST_PRIORITY = 1
+PREFETCH_PRIORITY = 0
+
+
+class CoverLoadTask(QRunnable):
+    def __init__(self, loader, source_path, width, height, generation):
+        super().__init__()
+        self.loader = loader
+        self.source_path = source_path
+        self.width = width
+        self.height = height
+        self.generation = generation
+
+    def run(self):
+        # Work for a selection the user has already moved past is skipped
+        if self.generation != self.loader.generation:
+            self.loader.image_loaded.emit(self.source_path, self.width, self.height, None, False)
+            return
+        image = self.loader.cache.load_image(self.source_path, self.width, self.height)
+        self.loader.image_loaded.emit(self.source_path, self.width, self.height, image, True)
+
+
+class CoverLoader(QObject):
+    # Decodes and scales covers on a thread pool and hands them back through signals.
+    # Every request() starts a new generation: queued work for older selections is
+    # dropped and the neighbours passed to prefetch() are loaded at a lower priority.
+    cover_ready = pyqtSignal(str, object)
+    cover_loaded = pyqtSignal(str, bool)
+    image_loaded = pyqtSignal(str, int, int, object, bool)
+
+    def __init__(self, cache, max_threads=2, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.generation = 0
+        self.pending = set()
+        self.wanted = None
+        self.image_loaded.connect(self.on_image_loaded)
+
+    def request(self, source_path, width, height):
+        # Returns the pixmap at once if it is in memory, otherwise cover_ready follows
+        self.generation += 1
+        self.pool.clear()
+        self.pending.clear()
+        self.wanted = (source_path, width, height)
+
+        pixmap = self.cache.peek_pixmap(source_path, width, height)
+        if pixmap is not None:
+            self.wanted = None
+            return pixmap
+        self.submit(source_path, width, height, REQUEST_PRIORITY)
+        return None
+
+    def prefetch(self, source_paths, width, height):
+        for source_path in source_paths:
+            if self.cache.peek_pixmap(source_path, width, height) is None:
+                self.submit(source_path, width, height, PREFETCH_PRIORITY)
+
+    def submit(self, source_path, width, height, priority):
+        key = (source_path, width, height)
+        if key in self.pending:
+            return
+        self.pending.add(key)
+        self.pool.start(CoverLoadTask(self, source_path, width, height, self.generation), priority)
+
+    def on_image_loaded(self, source_path, width, height, image, completed):
+        key = (source_path, width, height)
+        self.pending.discard(key)
+        if not completed:
+            return
+        pixmap = self.cache.add_image(source_path, width, height, image) if image is not None else None
+        self.cover_loaded.emit(source_path, pixmap is not None)
+        if key == self.wanted:
+            self.wanted = None
+            self.cover_ready.emit(source_path, pixmap)
+
+    def wait(self):
+        self.pool.waitForDone()
@@ -0,0 +1,105 @@
+import os
+import time
+import threading
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from cover_downloader import (
+    DOWNLOADED, FAILED, SAVE_DIRECTORY, WIKI_URL, create_session, download_game_cover, format_game_title
+)
+
+SHORTCUT_EXTENSIONS = (".lnk", ".url")
+SKIPPED = "skipped"
+
+
+class HostRateLimiter:
+    # Spaces out requests to the same host by at least min_interval seconds,
+    # shared by all worker threads
+    def __init__(self, min_interval=0.2):
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.next_slot = {}
+
+    def wait(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def library_titles(directories):
+    # Game titles of the launcher's library: the names of its shortcuts
+    titles = set()
+    for directory in directories:
+        if not os.path.isdir(directory):
+            print(f"Directory not found: {directory}")
+            continue
+        for filename in os.listdir(directory):
+            name, extension = os.path.splitext(filename)
+            if extension.lower() in SHORTCUT_EXTENSIONS:
+                titles.add(name)
+    return sorted(titles)
+
+
+def cover_exists(game_title, directories):
+    filename = f"{format_game_title(game_title)}.jpg"
+    return any(os.path.exists(os.path.join(directory, filename)) for directory in directories)
+
+
+def download_covers(titles, save_directory=SAVE_DIRECTORY, base_url=WIKI_URL, max_workers=8,
+                    min_interval=0.2, skip_existing=True, existing_directories=(), cache=None, metadata=None,
+                    retries=3):
+    # Fetches the cover of every title on a bounded thread pool, returns a summary.
+    # Titles with a cover in save_directory or existing_directories are skipped.
+    started = time.monotonic()
+    results = {}
+    pending = []
+    for title in dict.fromkeys(titles):  # Drop duplicates, keep the order
+        if skip_existing and cover_exists(title, (save_directory, *existing_directories)):
+            results[title] = SKIPPED
+        else:
+            pending.append(title)
+
+    # The limiter sits in the session, so retries are spaced out like every other request
+    session = create_session(pool_size=max_workers, retries=retries, rate_limiter=HostRateLimiter(min_interval))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(download_game_cover, title, session, save_directory, base_url,
+                            cache=cache, metadata=metadata): title
+            for title in pending
+        }
+        for future in as_completed(futures):
+            title = futures[future]
+            try:
+                results[title] = future.result()
+            except Exception as e:
+                print(f"Unexpected error downloading '{title}': {e}")
+                results[title] = FAILED
+    session.close()
+    for store in (cache, metadata):
+        if store:
+            store.save()
+
+    counts = {}
+    for outcome in results.values():
+        counts[outcome] = counts.get(outcome, 0) + 1
+    return {
+        "total": len(results),
+        "counts": counts,
+        "failed": sorted(title for title, outcome in results.items() if outcome not in (DOWNLOADED, SKIPPED)),
+        "elapsed": time.monotonic() - started,
+        "results": results,
+        "cache": dict(cache.stats) if cache else None,
+    }
+
+
+def print_summary(summary):
+    counts = ", ".join(f"{count} {outcome}" for outcome, count in sorted(summary["counts"].items()))
+    print(f"Processed {summary['total']} titles in {summary['elapsed']:.1f}s: {counts or 'nothing to do'}")
+    if summary["cache"]:
+        print("HTTP cache: " + ", ".join(f"{count} {outcome}" for outcome, count in summary["cache"].items()))
+    for title in summary["failed"]:
+        print(f"  {title}: {summary['results'][title]}")
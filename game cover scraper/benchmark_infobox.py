@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+import argparse
+from http_cache import CACHE_DIRECTORY
+from infobox_parser import EXTRACTORS
+
+# Compares the infobox extractors on saved pages, by default the fixture pages the
+# tests use. Real articles are in the scraper's HTTP cache after a normal run:
+#   python benchmark_infobox.py .scraper_cache/responses
+FIXTURE_PAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests", "fixtures", "pages")
+
+def load_pages(paths):
+    pages = {}
+    for path in paths:
+        files = [os.path.join(path, name) for name in sorted(os.listdir(path))] if os.path.isdir(path) else [path]
+        for filename in files:
+            with open(filename, "rb") as file:
+                data = file.read()
+            if data.lstrip()[:1] == b"<":  # Skip cached images
+                pages[filename] = data
+    return pages
+
+def time_extractor(extract, pages, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = {name: extract(html) for name, html in pages.items()}
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark infobox image extraction")
+    parser.add_argument("paths", nargs="*", default=[FIXTURE_PAGES],
+                        help="saved HTML pages or directories of them (default: the test fixtures, "
+                             f"{os.path.join(CACHE_DIRECTORY, 'responses')} has the cached articles)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per extractor, the best is reported")
+    args = parser.parse_args()
+
+    pages = load_pages(args.paths)
+    if not pages:
+        print("No saved pages found")
+        sys.exit(1)
+    total_kb = sum(len(html) for html in pages.values()) / 1024
+    print(f"{len(pages)} pages, {total_kb:.0f} KB")
+
+    baseline, expected = time_extractor(EXTRACTORS["bs4"], pages, args.repeat)
+    for name, extract in EXTRACTORS.items():
+        elapsed, results = (baseline, expected) if name == "bs4" else time_extractor(extract, pages, args.repeat)
+        mismatches = [page for page in pages if results[page] != expected[page]]
+        print(f"{name:<12} {elapsed * 1000 / len(pages):8.2f} ms/page  {baseline / elapsed:6.1f}x  "
+              f"{len(mismatches)} mismatches")
+        for page in mismatches:
+            print(f"  {page}: {results[page]} != {expected[page]}")
+
+if __name__ == "__main__":
+    main()
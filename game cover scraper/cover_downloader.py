@@ -1,63 +1,147 @@
 import os
+import time
+import hashlib
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
+from http_cache import DEFAULT_TTL
+from infobox_parser import FOUND, NO_INFOBOX, NO_IMAGE, extract_infobox_image
+
+WIKI_URL = "https://en.wikipedia.org/wiki/"
+SAVE_DIRECTORY = './game_covers/'
+REQUEST_TIMEOUT = (5, 20)  # Connect and read timeouts in seconds
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Specify a user agent header
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Outcomes returned by download_game_cover (plus NO_INFOBOX and NO_IMAGE)
+DOWNLOADED = "downloaded"
+FAILED = "failed"
 
 def format_game_title(game_title):
     # Replace underscores with spaces
     return game_title.replace('_', ' ')
 
-def download_game_cover(game_title):
-    url = f"https://en.wikipedia.org/wiki/{game_title.replace(' ', '_')}"
-    save_directory = './game_covers/'
-    
-    # Specify a user agent header
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Find the infobox table
-        infobox_table = soup.find('table', class_='infobox')
-        
-        if infobox_table:
-            # Find the specific line with the class 'infobox-image'
-            infobox_image_line = infobox_table.find('td', class_='infobox-image')
-            
-            if infobox_image_line:
-                # Find the image URL within the infobox-image line
-                image_tag = infobox_image_line.find('img')
-                if image_tag:
-                    image_url = image_tag['src']
-                    
-                    # Handle URLs starting with '//'
-                    if image_url.startswith('//'):
-                        image_url = 'https:' + image_url
-                    
-                    # Download the image
-                    image_response = requests.get(image_url, headers=headers)
-                    image_response.raise_for_status()
-                    
-                    # Determine the filename to save
-                    filename = f"{format_game_title(game_title)}.jpg"
-                    filepath = os.path.join(save_directory, filename)
-                    
-                    # Save the image locally
-                    with open(filepath, 'wb') as f:
-                        f.write(image_response.content)
-                    
-                    print(f"Successfully downloaded and saved '{game_title}' cover image as '{filename}' in '{save_directory}'")
-                else:
-                    print(f"No image found in 'infobox-image' line for '{game_title}' on Wikipedia")
+def retry_after(response):
+    # Seconds asked for by a Retry-After header, None if there is none (or it is a date)
+    value = response.headers.get("Retry-After", "").strip()
+    return float(value) if value.isdigit() else None
+
+class RetryingAdapter(HTTPAdapter):
+    # Retries failed connections and 429/5xx responses with exponential backoff,
+    # honouring Retry-After. Done here rather than with urllib3's Retry so that every
+    # attempt, retries included, waits for the rate limiter.
+    def __init__(self, retries=3, backoff_factor=0.5, rate_limiter=None, **kwargs):
+        super().__init__(max_retries=0, **kwargs)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.rate_limiter = rate_limiter
+
+    def send(self, request, **kwargs):
+        for attempt in range(self.retries + 1):
+            if self.rate_limiter:
+                self.rate_limiter.wait(request.url)
+            delay = self.backoff_factor * 2 ** attempt
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == self.retries:
+                    raise
             else:
-                print(f"No 'infobox-image' line found in infobox table for '{game_title}' on Wikipedia")
-        else:
-            print(f"No infobox table found for '{game_title}' on Wikipedia")
-    
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+                requested = retry_after(response)
+                if requested is not None:
+                    delay = requested
+                response.close()
+            time.sleep(delay)
+
+def create_session(pool_size=10, retries=3, backoff_factor=0.5, rate_limiter=None):
+    # One pooled session shared by every download. Every request, retries included,
+    # waits for rate_limiter (anything with a wait(url) method) when one is given.
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = RetryingAdapter(retries, backoff_factor, rate_limiter, pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def find_cover_url(html, page_url):
+    # Returns (outcome, image URL) for the infobox image of a Wikipedia page.
+    # The page is streamed only up to the image instead of building a full DOM.
+    outcome, src = extract_infobox_image(html)
+    if outcome != FOUND:
+        return outcome, None
+
+    # Handles protocol-relative ('//') and relative URLs
+    return DOWNLOADED, urljoin(page_url, src)
+
+def download_game_cover(game_title, session=None, save_directory=SAVE_DIRECTORY, base_url=WIKI_URL, rate_limiter=None,
+                        cache=None, metadata=None):
+    # With an HttpCache, unchanged pages and images are served from disk or revalidated.
+    # With TitleMetadata, the cover URL found last time is used without fetching the article.
+    # rate_limiter only applies to the session created here, a given session brings its own.
+    url = f"{base_url}{game_title.replace(' ', '_')}"
+    session = session or create_session(pool_size=1, rate_limiter=rate_limiter)
+
+    def get(url):
+        # Returns (body, final URL)
+        if cache:
+            return cache.fetch(session, url, REQUEST_TIMEOUT)
+        response = session.get(url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.content, response.url
+
+    # Determine the filename to save
+    filename = f"{format_game_title(game_title)}.jpg"
+    filepath = os.path.join(save_directory, filename)
+
+    try:
+        image = None
+        record = metadata.get(game_title) if metadata else None
+        if record and record.get("image_url") and time.time() - record["updated"] < DEFAULT_TTL:
+            try:
+                image, _ = get(record["image_url"])
+                article_url, image_url = record["article_url"], record["image_url"]
+            except requests.exceptions.RequestException:
+                image = None  # The cover moved, look it up in the article again
+
+        if image is None:
+            html, article_url = get(url)
+            outcome, image_url = find_cover_url(html, article_url)
+            if outcome != DOWNLOADED and metadata:
+                metadata.set(game_title, article_url=article_url, image_url=None, sha1=None, outcome=outcome)
+
+            if outcome == NO_INFOBOX:
+                print(f"No infobox table found for '{game_title}' on Wikipedia")
+                return outcome
+            if outcome == NO_IMAGE:
+                print(f"No image found in 'infobox-image' line for '{game_title}' on Wikipedia")
+                return outcome
+
+            # Download the image
+            image, _ = get(image_url)
+
+        digest = hashlib.sha1(image).hexdigest()
+        if metadata:
+            metadata.set(game_title, article_url=article_url, image_url=image_url, sha1=digest, outcome=DOWNLOADED)
+        if record and record.get("sha1") == digest and os.path.exists(filepath):
+            print(f"Cover for '{game_title}' is unchanged")
+            return DOWNLOADED
+
+        # Save the image locally, a partial download never replaces a good file
+        os.makedirs(save_directory, exist_ok=True)
+        temp_path = f"{filepath}.part"
+        with open(temp_path, 'wb') as f:
+            f.write(image)
+        os.replace(temp_path, filepath)
+
+        print(f"Successfully downloaded and saved '{game_title}' cover image as '{filename}' in '{save_directory}'")
+        return DOWNLOADED
+
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching or downloading cover image: {e}")
+        print(f"Error fetching or downloading cover image for '{game_title}': {e}")
+        return FAILED
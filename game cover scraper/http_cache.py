@@ -0,0 +1,185 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+CACHE_DIRECTORY = "./.scraper_cache/"
+DEFAULT_TTL = 7 * 24 * 3600  # Seconds a response is used without asking the server
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def write_atomic(path, data):
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+    os.replace(temp_path, path)
+
+
+def load_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Could not read {path}, starting empty: {e}")
+        return {}
+
+
+class HttpCache:
+    # On-disk cache of GET responses keyed by URL. Fresh entries (younger than ttl)
+    # are served without a request; stale ones are revalidated with If-None-Match /
+    # If-Modified-Since, so an unchanged page or image costs a 304 and no body.
+    # The bodies are capped at max_bytes, least recently used first out.
+    def __init__(self, cache_dir=CACHE_DIRECTORY, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.responses_dir = os.path.join(cache_dir, "responses")
+        os.makedirs(self.responses_dir, exist_ok=True)
+        self.entries = load_json(self.index_path)
+        self.dirty = False
+        self.stats = {"fresh": 0, "revalidated": 0, "fetched": 0, "evicted": 0}
+        self.remove_orphans()
+        self.size = sum(entry["size"] for entry in self.entries.values())
+
+    def body_path(self, url):
+        return os.path.join(self.responses_dir, hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+    def remove_orphans(self):
+        # Bodies written by a run that never saved its index, or index entries without a body
+        known = {os.path.basename(self.body_path(url)) for url in self.entries}
+        for filename in os.listdir(self.responses_dir):
+            if filename not in known:
+                os.remove(os.path.join(self.responses_dir, filename))
+        for url in [url for url in self.entries if not os.path.exists(self.body_path(url))]:
+            del self.entries[url]
+            self.dirty = True
+
+    def read_body(self, url):
+        try:
+            with open(self.body_path(url), "rb") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def fetch(self, session, url, timeout=None):
+        # Returns (body, final URL); raises requests exceptions like session.get
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(url)
+        if entry and now - entry["fetched_at"] < self.ttl:
+            body = self.read_body(url)
+            if body is not None:
+                self.touch(url, now, "fresh")
+                return body, entry["final_url"]
+            entry = None
+
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        response = session.get(url, headers=headers, timeout=timeout)
+
+        if response.status_code == 304 and entry:
+            body = self.read_body(url)
+            if body is not None:
+                self.touch(url, now, "revalidated", revalidated=True)
+                return body, entry["final_url"]
+            # The body vanished, fetch it again unconditionally
+            response = session.get(url, timeout=timeout)
+
+        response.raise_for_status()
+        self.store(url, response, now)
+        return response.content, response.url
+
+    def touch(self, url, now, outcome, revalidated=False):
+        with self.lock:
+            self.stats[outcome] += 1
+            # Another thread may have evicted the entry since its body was read
+            entry = self.entries.get(url)
+            if entry is None:
+                return
+            entry["last_used"] = now
+            if revalidated:
+                entry["fetched_at"] = now
+            self.dirty = True
+
+    def store(self, url, response, now):
+        body = response.content
+        write_atomic(self.body_path(url), body)
+        with self.lock:
+            old = self.entries.get(url)
+            if old:
+                self.size -= old["size"]
+            self.entries[url] = {
+                "final_url": response.url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": now,
+                "last_used": now,
+                "size": len(body),
+            }
+            self.size += len(body)
+            self.stats["fetched"] += 1
+            self.dirty = True
+            if self.size > self.max_bytes:
+                self.evict(keep=url)
+
+    def evict(self, keep):
+        # Least recently used bodies go first until the cache is under 90% of its cap
+        target = self.max_bytes * 0.9
+        for url in sorted(self.entries, key=lambda url: self.entries[url]["last_used"]):
+            if self.size <= target:
+                break
+            if url == keep:
+                continue
+            try:
+                os.remove(self.body_path(url))
+            except OSError:
+                pass
+            self.size -= self.entries.pop(url)["size"]
+            self.stats["evicted"] += 1
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            data = json.dumps(self.entries).encode("utf-8")
+            self.dirty = False
+        write_atomic(self.index_path, data)
+
+
+class TitleMetadata:
+    # What was found for each title on the last run: the article it resolved to,
+    # the cover's URL and the SHA-1 of the saved image
+    def __init__(self, path=os.path.join(CACHE_DIRECTORY, "metadata.json")):
+        self.path = path
+        self.lock = threading.Lock()
+        self.records = load_json(path)
+        self.dirty = False
+
+    def get(self, title):
+        with self.lock:
+            record = self.records.get(title)
+            return dict(record) if record else None
+
+    def set(self, title, **record):
+        record["updated"] = time.time()
+        with self.lock:
+            self.records[title] = record
+            self.dirty = True
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            data = json.dumps(self.records, indent=1).encode("utf-8")
+            self.dirty = False
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        write_atomic(self.path, data)
@@ -1,26 +1,98 @@
 from PIL import Image
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif')  # Supported image formats
+# The scraper's size, gui_v1's grid and horizontal card sizes and gui_v2's details cover
+TARGET_SIZES = ((320, 400), (300, 400), (375, 450), (500, 800))
+JPEG_QUALITY = 95
+
+def is_up_to_date(output_filepath, source_mtime):
+    try:
+        return os.stat(output_filepath).st_mtime >= source_mtime
+    except OSError:
+        return False
+
+def fit_size(image_size, box):
+    # The largest size with the image's aspect ratio that fits in box, like ImageOps.contain
+    (width, height), (box_width, box_height) = image_size, box
+    scale = min(box_width / width, box_height / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def resize_image(source_path, targets):
+    # Decodes the source once and writes every ((width, height), output path) target.
+    # Runs in a worker process; returns the written paths or raises on a bad image.
+    with Image.open(source_path) as img:
+        # Let the JPEG decoder scale down by up to 8x while decoding, to just above the largest target
+        img.draft("RGB", (max(width for (width, _), _ in targets), max(height for (_, height), _ in targets)))
+        # Convert image to RGB mode and remove alpha channel if present
+        img = img.convert("RGB")
+
+    written = []
+    for size, output_filepath in sorted(targets, reverse=True):
+        # Fit inside the target instead of stretching to it. reducing_gap shrinks with
+        # fast integer reduce() before the final LANCZOS pass
+        resized_img = img.resize(fit_size(img.size, size), Image.LANCZOS, reducing_gap=3.0)
+        os.makedirs(os.path.dirname(output_filepath), exist_ok=True)
+        root, extension = os.path.splitext(output_filepath)
+        temp_path = f"{root}.{os.getpid()}.tmp{extension}"
+        resized_img.save(temp_path, quality=JPEG_QUALITY)
+        os.replace(temp_path, output_filepath)
+        written.append(output_filepath)
+    return written
+
+def resize_covers(input_folder, output_folder, sizes=TARGET_SIZES, max_workers=None, flat=False):
+    # Writes each cover in every size to output_folder/WIDTHxHEIGHT/ (or straight into
+    # output_folder when flat), on a process pool. Outputs newer than their source are
+    # skipped and the originals are kept, so this is safe to re-run.
+    jobs = []
+    up_to_date = 0
+    for filename in sorted(os.listdir(input_folder)):
+        if not filename.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        source_path = os.path.join(input_folder, filename)
+        source_mtime = os.stat(source_path).st_mtime
+        targets = []
+        for width, height in sizes:
+            folder = output_folder if flat else os.path.join(output_folder, f"{width}x{height}")
+            output_filepath = os.path.join(folder, filename)
+            if is_up_to_date(output_filepath, source_mtime):
+                up_to_date += 1
+            else:
+                targets.append(((width, height), output_filepath))
+        if targets:
+            jobs.append((source_path, targets))
+
+    resized = failed = 0
+    if len(jobs) == 1 or max_workers == 1:
+        # Not worth starting worker processes
+        results = []
+        for source_path, targets in jobs:
+            try:
+                results.append((source_path, resize_image(source_path, targets), None))
+            except Exception as e:
+                results.append((source_path, None, e))
+    else:
+        results = []
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(resize_image, source_path, targets): source_path for source_path, targets in jobs}
+            for future in as_completed(futures):
+                try:
+                    results.append((futures[future], future.result(), None))
+                except Exception as e:
+                    results.append((futures[future], None, e))
+
+    for source_path, written, error in results:
+        if error:
+            failed += 1
+            print(f"Could not resize {source_path}: {error}")
+        else:
+            resized += len(written)
+            print(f"Resized {os.path.basename(source_path)} to {len(written)} sizes")
+
+    print(f"Resized {resized} images, {up_to_date} already up to date, {failed} failed")
+    return {"resized": resized, "up_to_date": up_to_date, "failed": failed}
 
 def resize_images(input_folder, output_folder, width, height):
-    # Create the output folder if it doesn't exist
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
-
-    # Loop through each file in the input folder
-    for filename in os.listdir(input_folder):
-        if filename.endswith(('.jpg', '.jpeg', '.png', '.gif')):  # Supported image formats
-            # Open the image file
-            with Image.open(os.path.join(input_folder, filename)) as img:
-                # Convert image to RGB mode and remove alpha channel if present
-                img = img.convert("RGB")
-                # Resize the image
-                resized_img = img.resize((width, height), Image.LANCZOS)
-                # Determine output filepath
-                output_filepath = os.path.join(output_folder, filename)
-                # Save the resized image to the output folder
-                resized_img.save(output_filepath, quality=95)
-                print(f"Resized image saved to {output_filepath}")
-
-                # Delete the original image file
-                os.remove(os.path.join(input_folder, filename))
-                print(f"Original image deleted: {filename}")
\ No newline at end of file
+    # A single size straight into output_folder; the originals are no longer deleted
+    return resize_covers(input_folder, output_folder, sizes=((width, height),), flat=True)
@@ -0,0 +1,155 @@
+import codecs
+from html.parser import HTMLParser
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+except ImportError:  # Optional, the standard library parser is used without it
+    etree = None
+
+FOUND = "found"
+NO_INFOBOX = "no infobox"
+NO_IMAGE = "no image"
+
+CHUNK_SIZE = 16 * 1024
+
+
+class StopParsing(Exception):
+    pass
+
+
+class InfoboxImageFinder:
+    # Follows just enough of the tag structure to answer what the BeautifulSoup version
+    # asks: soup.find('table', class_='infobox').find('td', class_='infobox-image').find('img').
+    # outcome is set as soon as the answer is known, the rest of the page is never parsed.
+    def __init__(self):
+        self.outcome = None
+        self.src = None
+        self.table_depth = 0  # Nesting depth inside the first infobox table
+        self.cell_depth = 0  # Nesting depth inside its first infobox-image cell
+
+    def start(self, tag, classes, src):
+        if not self.table_depth:
+            if tag == "table" and "infobox" in classes:
+                self.table_depth = 1
+            return
+        if tag == "table":
+            self.table_depth += 1
+        elif self.cell_depth:
+            if tag == "td":
+                self.cell_depth += 1
+            elif tag == "img":
+                self.finish(FOUND if src else NO_IMAGE, src or None)
+        elif tag == "td" and "infobox-image" in classes:
+            self.cell_depth = 1
+
+    def end(self, tag):
+        if not self.table_depth:
+            return
+        if tag == "td" and self.cell_depth:
+            self.cell_depth -= 1
+            if not self.cell_depth:
+                self.finish(NO_IMAGE)  # The image cell had no image
+        elif tag == "table":
+            self.table_depth -= 1
+            if not self.table_depth:
+                self.finish(NO_IMAGE)  # The infobox had no image cell
+
+    def finish(self, outcome, src=None):
+        self.outcome = outcome
+        self.src = src
+
+    def result(self):
+        if self.outcome:
+            return self.outcome, self.src
+        return (NO_IMAGE if self.table_depth else NO_INFOBOX), None
+
+
+class StreamingInfoboxParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.finder = InfoboxImageFinder()
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        self.finder.start(tag, (attrs.get("class") or "").split(), attrs.get("src"))
+        if self.finder.outcome:
+            raise StopParsing()
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)  # <img ... /> has no separate end tag
+
+    def handle_endtag(self, tag):
+        self.finder.end(tag)
+        if self.finder.outcome:
+            raise StopParsing()
+
+
+def as_bytes(html):
+    return html.encode("utf-8") if isinstance(html, str) else html
+
+
+def extract_with_html_parser(html):
+    # Standard library parser fed in chunks, aborted once the answer is known
+    parser = StreamingInfoboxParser()
+    decoder = codecs.getincrementaldecoder("utf-8")("replace")
+    html = as_bytes(html)
+    try:
+        for start in range(0, len(html), CHUNK_SIZE):
+            parser.feed(decoder.decode(html[start:start + CHUNK_SIZE]))
+        parser.close()
+    except StopParsing:
+        pass
+    return parser.finder.result()
+
+
+def extract_with_lxml(html):
+    # libxml2's pull parser, same early exit
+    parser = etree.HTMLPullParser(events=("start", "end"))
+    finder = InfoboxImageFinder()
+    html = as_bytes(html)
+    for start in range(0, len(html) + 1, CHUNK_SIZE):
+        chunk = html[start:start + CHUNK_SIZE]
+        if chunk:
+            parser.feed(chunk)
+        else:
+            parser.close()
+        for event, element in parser.read_events():
+            if event == "start":
+                finder.start(element.tag, (element.get("class") or "").split(), element.get("src"))
+            else:
+                finder.end(element.tag)
+            if finder.outcome:
+                return finder.result()
+    return finder.result()
+
+
+def extract_with_bs4(html):
+    # The original full-DOM lookup
+    soup = BeautifulSoup(html, 'html.parser')
+    infobox_table = soup.find('table', class_='infobox')
+    if not infobox_table:
+        return NO_INFOBOX, None
+    infobox_image_line = infobox_table.find('td', class_='infobox-image')
+    image_tag = infobox_image_line.find('img') if infobox_image_line else None
+    if not image_tag or not image_tag.get('src'):
+        return NO_IMAGE, None
+    return FOUND, image_tag['src']
+
+
+EXTRACTORS = {"html.parser": extract_with_html_parser, "bs4": extract_with_bs4}
+if etree is not None:
+    EXTRACTORS["lxml"] = extract_with_lxml
+DEFAULT_EXTRACTOR = "lxml" if etree is not None else "html.parser"
+
+
+def extract_infobox_image(html, extractor=DEFAULT_EXTRACTOR):
+    # Returns (outcome, src) for the infobox image, BeautifulSoup is the fallback
+    # if the streaming parser chokes on the page
+    try:
+        return EXTRACTORS[extractor](html)
+    except Exception as e:
+        if extractor == "bs4":
+            raise
+        print(f"Streaming infobox parser failed ({e}), falling back to BeautifulSoup")
+        return extract_with_bs4(html)
@@ -1,20 +1,73 @@
 import os
-from cover_downloader import download_game_cover, format_game_title
-from img_resizer import resize_images
+import json
+import argparse
+from cover_downloader import download_game_cover, format_game_title, WIKI_URL
+from batch_downloader import download_covers, library_titles, print_summary
+from http_cache import HttpCache, TitleMetadata
+from img_resizer import TARGET_SIZES, resize_covers
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Download game covers from Wikipedia")
+    parser.add_argument("titles", nargs="*", help="game titles (prompted for if none are given)")
+    parser.add_argument("--titles-file", help="file with one title per line")
+    parser.add_argument("--library", action="append", default=[], metavar="DIR",
+                        help="fetch covers for every shortcut in DIR (can be repeated)")
+    parser.add_argument("--settings", metavar="FILE",
+                        help="fetch covers for the directories in the launcher's settings.json")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent downloads (default: 8)")
+    parser.add_argument("--interval", type=float, default=0.2,
+                        help="minimum seconds between requests to the same host (default: 0.2)")
+    parser.add_argument("--base-url", default=WIKI_URL, help="wiki base URL, e.g. a local test server")
+    parser.add_argument("--refresh", action="store_true", help="download covers that already exist again")
+    parser.add_argument("--no-cache", action="store_true", help="don't use or update the HTTP and title caches")
+    parser.add_argument("--no-resize", action="store_true", help="skip resizing the downloaded covers")
+    return parser.parse_args()
+
+def collect_titles(args):
+    titles = list(args.titles)
+    if args.titles_file:
+        with open(args.titles_file, "r", encoding="utf-8") as file:
+            titles.extend(line.strip() for line in file if line.strip())
+    directories = list(args.library)
+    if args.settings:
+        with open(args.settings, "r") as file:
+            directories.extend(json.load(file).get("selected_directories", []))
+    titles.extend(library_titles(directories))
+    return titles
 
 def main():
+    args = parse_args()
+
     # Directory settings
-    game_title = input("Enter the title of the game (e.g., The Sims 3): ")
     input_folder = "./game_covers/"
     output_folder = "./game_covers/resized_imgs/"
-    width = 320
-    height = 400
 
-    # Download cover image
-    download_game_cover(game_title)
+    cache = metadata = None
+    if not args.no_cache:
+        cache = HttpCache()
+        metadata = TitleMetadata()
+
+    titles = collect_titles(args)
+    if titles:
+        # Batch mode: every missing cover is fetched concurrently
+        summary = download_covers(titles, input_folder, args.base_url, args.workers, args.interval,
+                                  skip_existing=not args.refresh, existing_directories=(output_folder,),
+                                  cache=cache, metadata=metadata)
+        print_summary(summary)
+    else:
+        game_title = input("Enter the title of the game (e.g., The Sims 3): ")
+        # Download cover image
+        download_game_cover(game_title, save_directory=input_folder, base_url=args.base_url,
+                            cache=cache, metadata=metadata)
+        for store in (cache, metadata):
+            if store:
+                store.save()
+
+    if args.no_resize:
+        return
 
-    # Resize downloaded image
-    resize_images(input_folder, output_folder, width, height)
+    # Resize downloaded images to every size the launchers use, one folder per size
+    resize_covers(input_folder, output_folder, TARGET_SIZES)
     print("Images resized and saved to", output_folder)
 
 if __name__ == "__main__":
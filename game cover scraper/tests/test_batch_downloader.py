@@ -0,0 +1,119 @@
+import os
+import sys
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_downloader import SKIPPED, download_covers
+from cover_downloader import DOWNLOADED, FAILED
+from infobox_parser import NO_IMAGE, NO_INFOBOX
+
+PAGES_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pages")
+IMAGE = b"\xff\xd8\xff\xe0 not really a jpeg"
+# Article -> fixture page; the flaky one answers 503 this many times first
+ARTICLES = {
+    "Found_Game": "found.html",
+    "Imageless_Game": "no_image.html",
+    "Game_Series": "no_infobox.html",
+    "Flaky_Game": "found.html",
+}
+FLAKY_FAILURES = 2
+MIN_INTERVAL = 0.05
+
+
+class WikiHandler(BaseHTTPRequestHandler):
+    # Serves the fixture pages like a wiki, records every request it gets
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((time.monotonic(), self.path))
+            attempts = sum(1 for _, path in server.requests if path == self.path)
+        article = self.path.rpartition("/")[2]
+        if self.path.startswith("/images/"):
+            self.respond(200, IMAGE)
+        elif article == "Down_Game" or (article == "Flaky_Game" and attempts <= FLAKY_FAILURES):
+            self.respond(503, b"Service unavailable", {"Retry-After": "0"})
+        elif article in ARTICLES:
+            with open(os.path.join(PAGES_DIRECTORY, ARTICLES[article]), "rb") as file:
+                self.respond(200, file.read())
+        else:
+            self.respond(404, b"Not found")
+
+    def respond(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def wiki():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WikiHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def base_url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/wiki/"
+
+
+def requested(server, path):
+    return sum(1 for _, requested_path in server.requests if requested_path == path)
+
+
+def test_outcomes(wiki, tmp_path):
+    summary = download_covers(["Found Game", "Imageless Game", "Game Series"], str(tmp_path), base_url(wiki),
+                              min_interval=0)
+    assert summary["results"] == {"Found Game": DOWNLOADED, "Imageless Game": NO_IMAGE, "Game Series": NO_INFOBOX}
+    assert summary["failed"] == ["Game Series", "Imageless Game"]
+    with open(tmp_path / "Found Game.jpg", "rb") as file:
+        assert file.read() == IMAGE
+
+
+def test_retries_until_the_page_loads(wiki, tmp_path):
+    summary = download_covers(["Flaky Game"], str(tmp_path), base_url(wiki), min_interval=0)
+    assert summary["results"] == {"Flaky Game": DOWNLOADED}
+    assert requested(wiki, "/wiki/Flaky_Game") == FLAKY_FAILURES + 1
+
+
+def test_gives_up_after_the_last_retry(wiki, tmp_path):
+    summary = download_covers(["Down Game"], str(tmp_path), base_url(wiki), min_interval=0, retries=2)
+    assert summary["results"] == {"Down Game": FAILED}
+    assert requested(wiki, "/wiki/Down_Game") == 3
+
+
+def test_retries_wait_for_the_rate_limiter(wiki, tmp_path):
+    summary = download_covers(["Found Game", "Flaky Game", "Down Game"], str(tmp_path), base_url(wiki),
+                              max_workers=4, min_interval=MIN_INTERVAL, retries=2)
+    assert summary["counts"] == {DOWNLOADED: 2, FAILED: 1}
+    # Two articles, two images and 2 + 3 failed attempts, all spaced out on the one host.
+    # Measured over the whole run: a single gap seen by the server shrinks when the
+    # request before it was delayed on its way there.
+    times = sorted(requested_at for requested_at, _ in wiki.requests)
+    assert len(times) == 9
+    assert times[-1] - times[0] >= (len(times) - 1) * MIN_INTERVAL * 0.9
+
+
+def test_skips_existing_covers(wiki, tmp_path):
+    existing = tmp_path / "resized"
+    existing.mkdir()
+    (existing / "Flaky Game.jpg").write_bytes(IMAGE)
+    (tmp_path / "Found Game.jpg").write_bytes(IMAGE)
+    summary = download_covers(["Found Game", "Flaky Game", "Found Game"], str(tmp_path), base_url(wiki),
+                              min_interval=0, existing_directories=(str(existing),))
+    assert summary["results"] == {"Found Game": SKIPPED, "Flaky Game": SKIPPED}
+    assert wiki.requests == []
@@ -0,0 +1,203 @@
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PyQt5.QtGui import QColor, QPainter, QPainterPath
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QRect, QRectF, QSortFilterProxyModel
+
+from cover_constants import CARD_COVER_SIZES
+
+CARD_MARGIN = 10
+CARD_PADDING = 5
+CARD_NAME_HEIGHT = 30
+
+AppPathRole = Qt.UserRole + 1
+ImagePathRole = Qt.UserRole + 2
+CoverMissingRole = Qt.UserRole + 3  # True once a card is known to have no cover
+
+
+class GameListModel(QAbstractListModel):
+    # One row per (name, app_path, image_path) game. Covers are only requested
+    # when a card is painted, so off-screen games are never decoded.
+    def __init__(self, cover_loader, parent=None):
+        super().__init__(parent)
+        self.cover_loader = cover_loader
+        self.cover_loader.cover_loaded.connect(self.on_cover_loaded)
+        self.games = []
+        self.rows_by_image = {}
+        self.missing_covers = set()
+        self.cover_size = CARD_COVER_SIZES["grid"]
+
+    def set_games(self, games):
+        self.beginResetModel()
+        self.games = list(games)
+        self.rows_by_image = {}
+        for row, (_, _, image_path) in enumerate(self.games):
+            self.rows_by_image.setdefault(image_path, []).append(row)
+        self.missing_covers.clear()
+        self.endResetModel()
+
+    def set_cover_size(self, cover_size):
+        if cover_size == self.cover_size:
+            return
+        self.cover_size = cover_size
+        if self.games:
+            self.dataChanged.emit(self.index(0), self.index(len(self.games) - 1), [Qt.DecorationRole])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.games)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name, app_path, image_path = self.games[index.row()]
+        if role == Qt.DisplayRole:
+            return name
+        if role == AppPathRole:
+            return app_path
+        if role == ImagePathRole:
+            return image_path
+        if role == Qt.DecorationRole:
+            return self.cover(image_path)
+        if role == CoverMissingRole:
+            return image_path is None or image_path in self.missing_covers
+        return None
+
+    def cover(self, image_path):
+        # None while loading and for games without a cover
+        if image_path is None or image_path in self.missing_covers:
+            return None
+        pixmap = self.cover_loader.cache.peek_pixmap(image_path, *self.cover_size)
+        if pixmap is None:
+            self.cover_loader.prefetch([image_path], *self.cover_size)
+        return pixmap
+
+    def on_cover_loaded(self, image_path, found):
+        rows = self.rows_by_image.get(image_path)
+        if not rows:
+            return
+        if not found:
+            self.missing_covers.add(image_path)
+        for row in rows:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+
+class SearchProxyModel(QSortFilterProxyModel):
+    # Shows the results of a SearchIndex query in rank order. With no results set
+    # every row is shown in the source model's order.
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.ranks = None
+
+    def set_results(self, names):
+        self.ranks = None if names is None else {name: rank for rank, name in enumerate(names)}
+        self.sort(-1 if self.ranks is None else 0)
+        self.invalidate()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.ranks is None:
+            return True
+        return self.sourceModel().index(source_row, 0, source_parent).data() in self.ranks
+
+    def lessThan(self, left, right):
+        # Rows that are about to be filtered out may still be compared, they sort last
+        if self.ranks is None:
+            return left.row() < right.row()
+        unranked = len(self.ranks)
+        return self.ranks.get(left.data(), unranked) < self.ranks.get(right.data(), unranked)
+
+
+class GameCardDelegate(QStyledItemDelegate):
+    # Paints a card (cover plus name) directly, no per-game widgets. placeholder(width,
+    # height) returns the pixmap shown for games without a cover, or None.
+    def __init__(self, parent=None, placeholder=None):
+        super().__init__(parent)
+        self.placeholder = placeholder
+        self.cover_size = CARD_COVER_SIZES["grid"]
+        self.bg_color = QColor("#313e57")
+        self.fg_color = QColor("white")
+
+    def set_colors(self, bg_color, fg_color):
+        self.bg_color = QColor(bg_color)
+        self.fg_color = QColor(fg_color)
+
+    def sizeHint(self, option, index):
+        width, height = self.cover_size
+        return QSize(width + 2 * (CARD_MARGIN + CARD_PADDING),
+                     height + CARD_NAME_HEIGHT + 2 * (CARD_MARGIN + CARD_PADDING))
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        card_rect = option.rect.adjusted(CARD_MARGIN, CARD_MARGIN, -CARD_MARGIN, -CARD_MARGIN)
+
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(card_rect), 10, 10)
+        painter.fillPath(path, self.bg_color.lighter(120) if option.state & QStyle.State_MouseOver else self.bg_color)
+
+        width, height = self.cover_size
+        cover_rect = QRect(card_rect.x() + CARD_PADDING, card_rect.y() + CARD_PADDING, width, height)
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is None and self.placeholder and index.data(CoverMissingRole):
+            pixmap = self.placeholder(width, height)
+        if pixmap is not None:
+            # Covers are pre-scaled to fit, center them in the cover area
+            x = cover_rect.x() + (width - pixmap.width()) // 2
+            y = cover_rect.y() + (height - pixmap.height()) // 2
+            painter.drawPixmap(x, y, pixmap)
+        else:
+            painter.fillRect(cover_rect, self.bg_color.darker(130))
+
+        name_rect = QRect(card_rect.x(), cover_rect.bottom() + 1, card_rect.width(), CARD_NAME_HEIGHT)
+        name = option.fontMetrics.elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, name_rect.width() - 2 * CARD_PADDING)
+        painter.setPen(self.fg_color)
+        painter.drawText(name_rect, Qt.AlignHCenter | Qt.AlignVCenter, name)
+        painter.restore()
+
+
+class GameGridView(QListView):
+    # Grid and horizontal layouts are view modes of the same list view
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.display_style = "grid"
+        self.setMovement(QListView.Static)
+        self.setResizeMode(QListView.Adjust)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(50)
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.viewport().setCursor(Qt.PointingHandCursor)
+        self.setFrameShape(QListView.NoFrame)
+
+    def set_display_style(self, display_style):
+        self.display_style = display_style
+        cover_size = CARD_COVER_SIZES.get(display_style, CARD_COVER_SIZES["grid"])
+        delegate = self.itemDelegate()
+        if isinstance(delegate, GameCardDelegate):
+            delegate.cover_size = cover_size
+        model = self.model()
+        source_model = model.sourceModel() if hasattr(model, "sourceModel") else model
+        if isinstance(source_model, GameListModel):
+            source_model.set_cover_size(cover_size)
+
+        self.setFlow(QListView.LeftToRight)
+        if display_style == "horizontal":
+            self.setWrapping(False)
+            self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+            self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        else:
+            self.setWrapping(True)
+            self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+            self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.scheduleDelayedItemsLayout()
+
+    def wheelEvent(self, event):
+        if self.display_style == "horizontal":
+            delta = event.angleDelta().y()
+            horizontal_scrollbar = self.horizontalScrollBar()
+            horizontal_scrollbar.setValue(horizontal_scrollbar.value() - delta)
+            event.accept()
+        else:
+            super().wheelEvent(event)
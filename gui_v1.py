@@ -1,16 +1,31 @@
 import sys
 import os
+from startup import start_with_splash
+from instrumentation import configure_logging, get_logger, timed, dump_metrics_if_requested
+from metrics_overlay import MetricsOverlay
 import json
 import subprocess
 from datetime import datetime
-import win32com.client
+from library_index import LibraryIndex
+from library_dedup import LibraryGames, target_key
+from library_resolver import LibraryResolver
+from shortcut_parser import read_cached_shortcut
+from cover_cache import CoverCache
+from cover_atlas import CoverAtlas
+from cover_index import CoverIndex
+from cover_loader import CoverLoader
+from game_grid import GameListModel, GameCardDelegate, GameGridView, SearchProxyModel, AppPathRole
+from search_index import SearchIndex
+from settings_store import SettingsStore
 
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QLabel, QWidget, QScrollArea,
-    QGridLayout, QPushButton, QFileDialog, QListWidget, QDialog, QLineEdit, QMenu, QSplashScreen, QSystemTrayIcon
+    QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QLabel, QWidget,
+    QPushButton, QFileDialog, QListWidget, QDialog, QLineEdit, QMenu, QSplashScreen, QSystemTrayIcon
 )
 from PyQt5.QtGui import QPixmap, QImage, QIcon, QCursor
-from PyQt5.QtCore import Qt, QEvent, pyqtSignal, QObject, pyqtSignal, QTimer
+from PyQt5.QtCore import Qt, QEvent, pyqtSignal, QObject, pyqtSignal
+
+log = get_logger("gui_v1")
 
 def load_image(image_path):
     image = QImage(image_path)
@@ -28,6 +43,7 @@ class SettingsDialog(QDialog):
         self.setWindowTitle("Settings")
         self.setModal(True)
         self.parent_app = parent
+        self.settings = parent.settings
 
         self.layout = QVBoxLayout(self)
 
@@ -96,49 +112,40 @@ class SettingsDialog(QDialog):
 
     def load_directories_list(self):
         self.directory_list_widget.clear()
-        filename = "settings.json"
-        if os.path.exists(filename):
-            with open(filename, "r") as file:
-                settings = json.load(file)
-                selected_directories = settings.get("selected_directories", [])
-                for directory in selected_directories:
-                    self.directory_list_widget.addItem(directory)
-
-                online_games_dir = "C:/Users/jakec/Desktop/CS/.PERSONAL PROJECTS/GAMEGUI/Online Games"
-                if self.show_online_games and online_games_dir not in selected_directories:
-                    self.directory_list_widget.addItem(online_games_dir)
-                elif not self.show_online_games:
-                    for i in range(self.directory_list_widget.count()):
-                        if self.directory_list_widget.item(i).text() == online_games_dir:
-                            self.directory_list_widget.takeItem(i)
-                            break
+        selected_directories = self.settings.get("selected_directories")
+        for directory in selected_directories:
+            self.directory_list_widget.addItem(directory)
+
+        online_games_dir = "C:/Users/jakec/Desktop/CS/.PERSONAL PROJECTS/GAMEGUI/Online Games"
+        if self.show_online_games and online_games_dir not in selected_directories:
+            self.directory_list_widget.addItem(online_games_dir)
+        elif not self.show_online_games:
+            for i in range(self.directory_list_widget.count()):
+                if self.directory_list_widget.item(i).text() == online_games_dir:
+                    self.directory_list_widget.takeItem(i)
+                    break
 
     def load_settings(self):
-        filename = "settings.json"
-        if os.path.exists(filename):
-            with open(filename, "r") as file:
-                settings = json.load(file)
-                self.dark_mode = settings.get("dark_mode", False)
-                self.show_online_games = settings.get("show_online_games", False)
-                self.display_style = settings.get("display_style", "grid")
-                print(f"Loaded settings: {settings}")
+        self.dark_mode = self.settings.get("dark_mode")
+        self.show_online_games = self.settings.get("show_online_games")
+        self.display_style = self.settings.get("display_style")
 
     def save_settings(self):
-        settings = {
+        # The settings store validates, notifies the launcher and writes the file
+        self.settings.update({
             "dark_mode": self.dark_mode,
             "selected_directories": [self.directory_list_widget.item(i).text() for i in range(self.directory_list_widget.count())],
             "display_style": self.display_style,
             "show_online_games": self.show_online_games
-        }
-
-        filename = "settings.json"
-        with open(filename, "w") as file:
-            json.dump(settings, file)
-        print(f"Saved settings: {settings}")
+        })
 
 class GameLauncherApp(QMainWindow):
-    def __init__(self):
+    shortcut_resolved = pyqtSignal(str, object, object, bool)
+    library_resolved = pyqtSignal(object)
+
+    def __init__(self, progress=None):
         super().__init__()
+        self.progress = progress  # Reports startup phases to the splash screen
         self.setWindowTitle("Game Launcher")
         self.setGeometry(100, 100, 800, 600)
         self.default_settings = {
@@ -151,33 +158,57 @@ class GameLauncherApp(QMainWindow):
         self.tray_icon = None  # Initialize tray_icon to None
         self.selected_directories = ["E:/Video Games/Games", "F:/GAMES"]
         self.current_directory = self.selected_directories[0]
-        self.showFullScreen()
         self.scroll_style = "horizontal"
+        self.settings = SettingsStore(defaults=dict(self.default_settings, display_style=self.scroll_style))
+        self.settings.settings_changed.connect(self.on_settings_changed)
+        QApplication.instance().aboutToQuit.connect(self.settings.flush)
          # Initialize game_count_label here
         self.game_count_label = QLabel("", self)
+        self.library_index = LibraryIndex()
+        self.library_games = LibraryGames()
+        self.library_regrouped = False
+        self.library_resolver = LibraryResolver(self.shortcut_resolved.emit, self.library_resolved.emit)
+        self.shortcut_resolved.connect(self.on_shortcut_resolved)
+        self.library_resolved.connect(self.on_library_resolved)
+        self.cover_cache = CoverCache(atlas=CoverAtlas())
+        self.cover_index = CoverIndex()
+        self.cover_loader = CoverLoader(self.cover_cache, max_threads=4, parent=self)
+        self.report_progress("Loading settings")
         self.load_settings()
+        self.report_progress("Loading library")
         self.initUI()
+        self.metrics_overlay = MetricsOverlay(self)
+        QApplication.instance().aboutToQuit.connect(dump_metrics_if_requested)
+        self.report_progress("Finishing up")
         self.settings_dialog = SettingsDialog(self)
         self.settings_dialog.dark_mode_changed.connect(self.update_dark_mode_ui)
-        self.settings_dialog.online_games_toggled.connect(self.update_online_games)  # Connect online_games_toggled signal
         self.settings_dialog.finished.connect(self.refresh_ui)
-        self.settings_dialog.finished.connect(self.update_game_list)  # Connect finished signal to refresh_ui slot
         self.tray_icon = self.create_tray_icon()
         self.tray_icon.show()
         self.update_colors()
+        # Shown last, so the first frame is the finished window
+        self.showFullScreen()
 
-    def update_online_games(self, show_online_games):
-        self.show_online_games = show_online_games
-        self.update_game_list()  # Refresh game list when online games setting changes
-
+    def report_progress(self, message):
+        if self.progress:
+            self.progress(message)
 
     def refresh_ui(self):
+        # The game list is refreshed by on_settings_changed, only if the library settings changed.
+        # That includes show_online_games, the dialog's toggle only takes effect once saved.
         self.update_colors()
-        self.update_game_list()
+
+    def on_settings_changed(self, changes):
+        if "dark_mode" in changes:
+            self.update_dark_mode_ui(changes["dark_mode"])
+        if {"selected_directories", "show_online_games", "source_precedence"} & changes.keys():
+            self.selected_directories = self.settings.get("selected_directories")
+            self.show_online_games = self.settings.get("show_online_games")
+            self.source_precedence = self.settings.get("source_precedence")
+            self.update_game_list()
 
     def update_game_list(self):
-        self.create_frame()  # Clear existing game cards
-        self.display_all_games()  # Display updated game cards
+        self.display_all_games()  # Reload the game model
 
     def update_dark_mode_ui(self, dark_mode):
         self.dark_mode = dark_mode
@@ -229,28 +260,26 @@ class GameLauncherApp(QMainWindow):
     #     tray_icon.setContextMenu(tray_menu)
     #     return tray_icon
 
-    def wheelEvent(self, event):
-        if self.scroll_style == "horizontal":
-            delta = event.angleDelta().y()
-            horizontal_scrollbar = self.scroll_area.horizontalScrollBar()
-            horizontal_scrollbar.setValue(horizontal_scrollbar.value() - delta)
-        else:
-            super().wheelEvent(event)
-
     def initUI(self):
         central_widget = QWidget(self)
         self.setCentralWidget(central_widget)
         self.layout = QVBoxLayout(central_widget)
 
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.layout.addWidget(self.scroll_area)
-
-        self.scroll_content = QWidget()
-        self.scroll_area.setWidget(self.scroll_content)
-
-        self.grid_layout = QGridLayout(self.scroll_content)
-        self.scroll_content.setLayout(self.grid_layout)
+        # Cards are painted by a delegate, only the visible ones are drawn
+        self.game_model = GameListModel(self.cover_loader, self)
+        self.search_index = SearchIndex()
+        self.proxy_model = SearchProxyModel(self)
+        self.proxy_model.setSourceModel(self.game_model)
+
+        self.card_delegate = GameCardDelegate(self, placeholder=self.placeholder_cover)
+        self.game_view = GameGridView()
+        self.game_view.setModel(self.proxy_model)
+        self.game_view.setItemDelegate(self.card_delegate)
+        # activated covers clicks (per the style's single/double click setting) and Enter,
+        # connecting clicked as well would launch twice
+        self.game_view.activated.connect(self.handle_click)
+        self.game_view.customContextMenuRequested.connect(self.show_context_menu)
+        self.layout.addWidget(self.game_view)
 
         self.nav_bar = QHBoxLayout()
         self.game_count_label = QLabel("", self)
@@ -285,39 +314,24 @@ class GameLauncherApp(QMainWindow):
         else:
             self.scroll_style = "grid"
         self.settings_dialog.display_style = self.scroll_style
-        self.settings_dialog.save_settings()
-        self.display_all_games()
+        self.settings.set("display_style", self.scroll_style)
+        self.game_view.set_display_style(self.scroll_style)  # Same model, different view mode
 
     def update_dark_mode_ui(self, dark_mode):
         self.dark_mode = dark_mode
         self.update_colors()  # Update colors when dark mode is changed
     
     def update_colors(self):
-        try:
-            with open('settings.json', 'r') as file:
-                settings = json.load(file)
-                self.dark_mode = settings.get('dark_mode', self.default_settings['dark_mode'])
-        except FileNotFoundError:
-            self.dark_mode = self.default_settings['dark_mode']
-
+        # self.dark_mode is kept current by the settings store, no need to read the file
         bg_color = "#1e1e1e" if self.dark_mode else "#f0f0f0"
         self.setStyleSheet(f"background-color: {bg_color};")
 
         fg_color = "white" if self.dark_mode else "black"
         self.game_count_label.setStyleSheet(f"color: {fg_color};")
         
-        # Update text color of game title labels
-        for row in range(self.grid_layout.rowCount()):
-            for col in range(self.grid_layout.columnCount()):
-                item = self.grid_layout.itemAtPosition(row, col)
-                if item:
-                    widget = item.widget()
-                    if widget and hasattr(widget, "layout"):
-                        layout = widget.layout()
-                        if layout and layout.count() > 1:
-                            name_label = layout.itemAt(1).widget()
-                            if name_label and isinstance(name_label, QLabel):
-                                name_label.setStyleSheet(f"background-color: {self.get_bg_color()}; color: {fg_color};")
+        # Update the card colors, the delegate repaints visible cards only
+        self.card_delegate.set_colors(self.get_bg_color(), fg_color)
+        self.game_view.viewport().update()
 
         for widget in [self.settings_button, self.search_bar]:
             widget.setStyleSheet(f"color: {fg_color};")
@@ -332,117 +346,45 @@ class GameLauncherApp(QMainWindow):
                 self.close()
             elif event.key() == Qt.Key_F12:
                 self.close()
+            elif event.key() == Qt.Key_F3:
+                self.metrics_overlay.toggle()
         return super().eventFilter(obj, event)
 
     def display_all_games(self):
-        self.create_frame()  # Clear existing game cards
-        combined_games = []
-        for directory in self.selected_directories:
-            combined_games.extend(self.get_games_from_directory(directory))
-
-        if self.scroll_style == "grid":
-            self.create_application_cards_grid(self.current_directory, self.game_count_label)
-        elif self.scroll_style == "horizontal":
-            self.create_application_cards_horizontal(self.game_count_label)
-
-
-    def create_application_cards_grid(self, directory, game_count_label):
-        games = []  
-
-        for directory in self.selected_directories:
-            games.extend(self.get_games_from_directory(directory))
-
-        games = list(set(games))
-        games.sort(key=lambda game: game[0])
-
-        num_cols = 5  
-        for index, game in enumerate(games):
-            row = index // num_cols
-            col = index % num_cols
-            name, app_path, image_path = game
-            self.create_card(name, app_path, image_path, row, col)
-
-        game_count_label.setText(f"Games: {len(games)}")
-        self.current_directory = directory
-
-        # Adjust the stretch factors for rows and columns to prioritize the top-left corner
-        if games:
-            num_rows = len(games) // num_cols + int(len(games) % num_cols != 0)
-            for i in range(num_rows):
-                self.grid_layout.setRowStretch(i, 0)  # Set stretch factor for each row to 0
-            for j in range(num_cols):
-                self.grid_layout.setColumnStretch(j, 1)  # Set stretch factor for each column to 0
-
-
-    def create_application_cards_horizontal(self, game_count_label):
-        games = []
-        for directory in self.selected_directories:
-            games.extend(self.get_games_from_directory(directory))
-
-        games = list(set(games))
-        games.sort(key=lambda game: game[0])
-
-        self.grid_layout.setHorizontalSpacing(20)
-        self.grid_layout.setVerticalSpacing(20)
-        self.grid_layout.setContentsMargins(20, 200, 20, 20)
-
-        if len(games) == 1:
-            col = 0  # Set column index to 0 if there is only one game
-        else:
-            col = 0
-            for index, game in enumerate(games):
-                name, app_path, image_path = game
-                if index == len(games) - 1:  # If it's the last game
-                    col = max(0, col - 1)  # Ensure it appears at the left side of the screen
-                self.create_card(name, app_path, image_path, 0, col)
-                col += 1
-
-        game_count_label.setText(f"Games: {len(games)}")
-
-
-
-    def create_card(self, name, app_path, image_path, row, col):
-        card_layout = QVBoxLayout()
-
-        try:
-            pixmap = load_image(image_path)
-        except Exception as e:
-            print(f"Error loading image: {e}")
-            pixmap = load_image("default_cover.jpg")
-
-        image_label = QLabel(self)
-        if self.scroll_style == "grid":
-            image_label.setPixmap(pixmap.scaled(300, 400, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        elif self.scroll_style == "horizontal":
-            image_label.setPixmap(pixmap.scaled(375, 450, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        image_label.setCursor(Qt.PointingHandCursor)
-        image_label.mousePressEvent = lambda event, app_path=app_path: self.handle_click(event, app_path)
-
-        name_label = QLabel(name, self)
-        name_label.setAlignment(Qt.AlignHCenter)
-        name_label.setStyleSheet(f"color: {self.get_fg_color()};")
-
-        card_layout.addWidget(image_label)
-        card_layout.addWidget(name_label)
-
-        card_widget = QWidget()
-        card_widget.setLayout(card_layout)
-        card_widget.setMaximumHeight(550)
-        card_widget.setStyleSheet(f"""
-            background-color: {self.get_bg_color()};
-            border-radius: 10px;
-            padding: 5px;
-            margin: 10px;
-        """)
-        self.grid_layout.addWidget(card_widget, row, col)
-
-    def handle_click(self, event, app_path):
-        if event.button() == Qt.LeftButton:
-            self.launch(app_path)
-        elif event.button() == Qt.RightButton:
-            self.show_context_menu(event, app_path)
-
-    def show_context_menu(self, event, app_path):
+        self.cover_index.refresh()
+        sources = self.get_library_sources()
+        self.library_games = LibraryGames(self.source_precedence)
+        names = self.library_games.build(sources)
+        if self.library_games.duplicates:
+            log.info("Merged %d duplicate shortcuts into other games", self.library_games.duplicates)
+        self.cover_index.report_missing(names)
+        self.show_games(names)
+
+        # Shortcuts the library index has no target for yet are resolved in the
+        # background, a target can show that two of them are the same game
+        self.library_regrouped = False
+        self.library_resolver.start(entry for _, entries in sources for entry in entries if entry["target"] is None)
+
+    def show_games(self, names):
+        # One card per game, launched through its preferred shortcut
+        games = [(name, self.library_games.shortcuts(name)[0], self.cover_index.cover_path(name)) for name in names]
+        self.game_model.set_games(games)
+        self.search_index.build(game[0] for game in games)
+        self.proxy_model.set_results(self.search_index.search(self.search_bar.text()))
+        self.game_view.set_display_style(self.scroll_style)
+        self.game_count_label.setText(f"Games: {self.proxy_model.rowCount()}")
+
+    def placeholder_cover(self, width, height):
+        return self.cover_index.placeholder_pixmap(self.cover_cache, width, height)
+
+    def handle_click(self, index):
+        self.launch(index.data(AppPathRole))
+
+    def show_context_menu(self, position):
+        index = self.game_view.indexAt(position)
+        if not index.isValid():
+            return
+        app_path = index.data(AppPathRole)
         context_menu = QMenu(self)
         
         fg_color = "white" if self.dark_mode else "black"
@@ -451,10 +393,19 @@ class GameLauncherApp(QMainWindow):
         context_menu.setStyleSheet(f"background-color: {bg_color}; color: {fg_color};")
 
         open_location_action = context_menu.addAction("Open File Location")
+        # Shortcuts of the same game found in other directories
+        alternative_actions = {}
+        alternatives = self.library_games.shortcuts(index.data(Qt.DisplayRole))[1:]
+        if alternatives:
+            alternatives_menu = context_menu.addMenu("Launch From")
+            for path in alternatives:
+                alternative_actions[alternatives_menu.addAction(path)] = path
         
         action = context_menu.exec_(QCursor.pos())
         if action == open_location_action:
             self.open_file_location(app_path)
+        elif action in alternative_actions:
+            self.launch(alternative_actions[action])
 
     def open_file_location(self, app_path):
         target_path = self.get_shortcut_target(app_path)
@@ -462,38 +413,39 @@ class GameLauncherApp(QMainWindow):
             normalized_path = os.path.normpath(target_path)
             subprocess.Popen(f'explorer /select,"{normalized_path}"', shell=True)
         else:
-            print(f"Could not find target for shortcut: {app_path}")
+            log.warning("Could not find target for shortcut: %s", app_path)
     
     def get_shortcut_target(self, shortcut_path):
-        try:
-            shell = win32com.client.Dispatch("WScript.Shell")
-            shortcut = shell.CreateShortcut(shortcut_path)
-            target_path = shortcut.TargetPath
-            return target_path
-        except Exception as e:
-            print(f"Error reading shortcut: {e}")
-            return None
-
+        target_path, arguments = read_cached_shortcut(shortcut_path)
+        self.library_index.set_target(shortcut_path, target_path, arguments)
+        return target_path
+
+    def on_shortcut_resolved(self, shortcut_path, target, arguments, missing):
+        self.library_index.set_target(shortcut_path, target, arguments)
+        if self.library_games.set_target(shortcut_path, target_key(target, arguments)):
+            self.library_regrouped = True
+
+    def on_library_resolved(self, stats):
+        self.library_index.save()
+        log.info("Resolved %d shortcuts in %s ms", stats["resolved"], stats["elapsed_ms"])
+        if self.library_regrouped:
+            # Shown again once per batch rather than once per merged shortcut
+            self.library_regrouped = False
+            self.show_games(sorted(self.library_games.games))
+
+    @timed("game.launch")
     def launch(self, app_path):
         subprocess.Popen(app_path, shell=True)
         self.hide()
         self.tray_icon.show()
 
     def load_settings(self):
-        try:
-            with open('settings.json', 'r') as file:
-                settings = json.load(file)
-                self.dark_mode = settings.get('dark_mode', self.default_settings['dark_mode'])
-                self.selected_directories = settings.get('selected_directories', self.default_settings['selected_directories'])
-                self.current_directory = settings.get('current_directory', self.default_settings['current_directory'])
-                self.scroll_style = settings.get('display_style', 'horizontal')
-                self.show_online_games = settings.get('show_online_games', False)  # Load show_online_games setting
-        except FileNotFoundError:
-            self.dark_mode = self.default_settings['dark_mode']
-            self.selected_directories = self.default_settings['selected_directories']
-            self.current_directory = self.default_settings['current_directory']
-            self.scroll_style = 'horizontal'
-            self.show_online_games = False
+        self.dark_mode = self.settings.get('dark_mode')
+        self.selected_directories = self.settings.get('selected_directories')
+        self.current_directory = self.settings.get('current_directory')
+        self.scroll_style = self.settings.get('display_style')
+        self.show_online_games = self.settings.get('show_online_games')  # Load show_online_games setting
+        self.source_precedence = self.settings.get('source_precedence')
             
 
     def save_directories(self):
@@ -501,38 +453,22 @@ class GameLauncherApp(QMainWindow):
         with open(filename, "w") as file:
             json.dump(self.selected_directories, file)
 
-    def get_games_from_directory(self, directory):
-        games = []
-
-        if isinstance(directory, str) and os.path.isdir(directory):
-            # Scan the main directory
-            for entry in os.scandir(directory):
-                if entry.is_file() and (entry.name.endswith(".lnk") or entry.name.endswith(".url")):
-                    name = os.path.splitext(entry.name)[0]
-                    image_path = os.path.join("photos", f"{name}.jpg")
-                    games.append((name, entry.path, image_path))
-
+    @timed("library.scan")
+    def get_library_sources(self):
+        # (directory, shortcut entries) of every directory, served from the library index if unchanged
+        directories = [directory for directory in self.selected_directories if isinstance(directory, str)]
         # Optionally include games from the online games directory
         if self.show_online_games:
-            online_games_dir = "C:/Users/jakec/Desktop/CS/.PERSONAL PROJECTS/GAMEGUI/Online Games"
-            if os.path.isdir(online_games_dir):
-                for entry in os.scandir(online_games_dir):
-                    if entry.is_file() and (entry.name.endswith(".lnk") or entry.name.endswith(".url")):
-                        name = os.path.splitext(entry.name)[0]
-                        image_path = os.path.join("photos", f"{name}.jpg")
-                        games.append((name, entry.path, image_path))
-
-        return games
+            directories.append("C:/Users/jakec/Desktop/CS/.PERSONAL PROJECTS/GAMEGUI/Online Games")
 
+        sources = []
+        for directory in dict.fromkeys(directories):
+            entries = self.library_index.scan_directory(directory)
+            if entries is not None:
+                sources.append((directory, entries))
 
-    def create_frame(self):
-        for i in reversed(range(self.grid_layout.count())):
-            widget = self.grid_layout.itemAt(i).widget()
-            self.grid_layout.removeWidget(widget)
-            if widget:
-                widget.deleteLater()  # Properly delete the widget
-        self.grid_layout.setSpacing(20)
-        self.grid_layout.setContentsMargins(20, 20, 20, 20)
+        self.library_index.save()
+        return sources
 
 
     def get_bg_color(self):
@@ -542,70 +478,9 @@ class GameLauncherApp(QMainWindow):
         return "white" if self.dark_mode else "black"
     
     def filter_games(self, text):
-        text = text.lower()  # Convert search text to lowercase for case-insensitive matching
-        #print(f"Filtering games with search text: {text}")
-        
-        # Get the current display style from settings
-        current_display_style = self.settings_dialog.display_style
-        
-        # Keep track of the row and column indices for visible games in grid view
-        visible_games = []
-        num_cols = 5  # Number of columns in the grid layout
-        game_count = 0  # Initialize game count
-        
-        # Hide all widgets before filtering
-        for i in range(self.grid_layout.count()):
-            widget_item = self.grid_layout.itemAt(i)
-            if widget_item:
-                widget = widget_item.widget()
-                if widget and hasattr(widget, "layout"):
-                    layout = widget.layout()
-                    if layout:
-                        if layout.count() > 1:
-                            name_label = layout.itemAt(1).widget()
-                            if name_label and isinstance(name_label, QLabel):
-                                if current_display_style == "grid":
-                                    widget.hide()
-                                else:
-                                    widget.setVisible(False)
-        
-        # Iterate through all game widgets in the grid layout
-        for i in range(self.grid_layout.count()):
-            widget_item = self.grid_layout.itemAt(i)
-            if widget_item:
-                widget = widget_item.widget()
-                if widget and hasattr(widget, "layout"):
-                    layout = widget.layout()
-                    if layout:
-                        if layout.count() > 1:
-                            name_label = layout.itemAt(1).widget()
-                            if name_label and isinstance(name_label, QLabel):
-                                game_name = name_label.text().lower()
-                                if text in game_name:
-                                    # Show the widget if the game is matched by the search text
-                                    if current_display_style == "grid":
-                                        widget.show()
-                                        # Calculate the row and column indices for the widget
-                                        row = len(visible_games) // num_cols
-                                        col = len(visible_games) % num_cols
-                                        visible_games.append((widget, row, col))
-                                    else:
-                                        widget.setVisible(True)
-                                    game_count += 1  # Increment game count
-                                else:
-                                    # Hide the widget if the game is not matched by the search text
-                                    if current_display_style == "grid":
-                                        widget.hide()
-                                    else:
-                                        widget.setVisible(False)
-        
-        # Update game count label
-        self.game_count_label.setText(f"Games: {game_count}")
-        
-        if current_display_style == "grid":
-            # Adjust the positions of visible widgets in the grid layout
-            for widget, row, col in visible_games:
-                self.grid_layout.addWidget(widget, row, col)
+        # Ranked matches from the search index, the proxy only hides and reorders rows
+        self.proxy_model.set_results(self.search_index.search(text))
+        self.game_count_label.setText(f"Games: {self.proxy_model.rowCount()}")
 
 
 class SplashScreen(QSplashScreen):
@@ -615,20 +490,17 @@ class SplashScreen(QSplashScreen):
         self.setPixmap(pixmap)
 
 if __name__ == "__main__":
+    configure_logging()
     app = QApplication(sys.argv)
     
     # Load and display splash screen
     splash_pix = QPixmap('icon (png).png')
     splash = SplashScreen(splash_pix)
     splash.show()
+    app.processEvents()
     
-    def launch_game_launcher():
-        launcher = GameLauncherApp()
-        launcher.show()
-    
-    # Close splash screen after 10 seconds and launch game launcher
-    QTimer.singleShot(5000, splash.close)
-    QTimer.singleShot(5000, launch_game_launcher)
+    # Build the launcher while the splash is up, it closes on the launcher's first frame
+    launcher = start_with_splash(splash, GameLauncherApp)
 
     sys.exit(app.exec_())
 
@@ -1,27 +1,67 @@
 import sys
 import os
-import json
+from startup import start_with_splash
+from instrumentation import configure_logging, get_logger, span, timed, dump_metrics_if_requested
+from metrics_overlay import MetricsOverlay
+import bisect
+import threading
+import subprocess
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QLabel, QWidget, 
-    QListWidget, QPushButton, QFrame, QSystemTrayIcon, QMenu, QSplashScreen, QLineEdit, QDialog, QMenu, QAction
+    QListWidget, QListView, QPushButton, QFileDialog, QFrame, QSystemTrayIcon, QMenu, QSplashScreen, QLineEdit, QDialog, QMenu, QAction
 )
-from PyQt5.QtGui import QPixmap, QImage, QIcon
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer
-import win32com.client
-import datetime
-import psutil
-import time
-import winshell
+from PyQt5.QtGui import QPixmap, QImage, QIcon, QColor
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QStringListModel
+from library_index import LibraryIndex
+from library_watcher import LibraryWatcher
+from shortcut_parser import read_cached_shortcut
+from library_resolver import LibraryResolver
+from session_monitor import GameSessionMonitor, is_process_running
+from tracker_store import TrackerStore, TrackerCache, format_duration
+from playtime_stats import PlaytimeStats
+from cover_cache import CoverCache
+from cover_atlas import CoverAtlas
+from cover_index import CoverIndex
+from cover_constants import DETAILS_COVER_SIZE
+from cover_loader import CoverLoader
+from search_index import SearchIndex
+from library_snapshot import LibrarySnapshot
+from library_dedup import LibraryGames, target_key
+from settings_store import SettingsStore
+from game_grid import SearchProxyModel
+
+COVER_SIZE = DETAILS_COVER_SIZE
+PREFETCH_ROWS = 5
+FILTER_DELAY_MS = 150  # Search is applied once typing pauses for this long
+ONLINE_GAMES_DIR = "./Online Games"
+
+log = get_logger("gui_v2")
 
 
 def load_image(image_path):
-    print(f"Loading image from path: {image_path}")
+    log.debug("Loading image from path: %s", image_path)
     image = QImage(image_path)
     if image.isNull():
         raise FileNotFoundError(f"Image file not found: {image_path}")
     image = image.convertToFormat(QImage.Format_RGB888)
     return QPixmap.fromImage(image)
 
+def game_name_from_path(shortcut_path):
+    return os.path.splitext(os.path.basename(shortcut_path))[0]
+
+class GameNameModel(QStringListModel):
+    # Sorted game names; games whose shortcut target is missing are greyed out
+    def __init__(self, missing_games, parent=None):
+        super().__init__(parent)
+        self.missing_games = missing_games
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role in (Qt.ForegroundRole, Qt.ToolTipRole) and index.isValid():
+            if super().data(index, Qt.DisplayRole) not in self.missing_games:
+                return None
+            return QColor("#888888") if role == Qt.ForegroundRole else "Shortcut target is missing"
+        return super().data(index, role)
+
 class SettingsDialog(QDialog):
     dark_mode_changed = pyqtSignal(bool)
     online_games_toggled = pyqtSignal(bool)
@@ -31,6 +71,7 @@ class SettingsDialog(QDialog):
         self.setWindowTitle("Settings")
         self.setModal(True)
         self.parent_app = parent
+        self.settings = parent.settings
 
         self.layout = QVBoxLayout(self)
 
@@ -95,55 +136,47 @@ class SettingsDialog(QDialog):
 
     def load_directories_list(self):
         self.directory_list_widget.clear()
-        filename = "settings2.json"
-        if os.path.exists(filename):
-            with open(filename, "r") as file:
-                settings = json.load(file)
-                selected_directories = settings.get("selected_directories", [])
-                for directory in selected_directories:
-                    self.directory_list_widget.addItem(directory)
-
-                online_games_dir = "./Online Games"
-                if self.show_online_games and online_games_dir not in selected_directories:
-                    self.directory_list_widget.addItem(online_games_dir)
-                elif not self.show_online_games:
-                    for i in range(self.directory_list_widget.count()):
-                        if self.directory_list_widget.item(i).text() == online_games_dir:
-                            self.directory_list_widget.takeItem(i)
-                            break
+        selected_directories = self.settings.get("selected_directories")
+        for directory in selected_directories:
+            self.directory_list_widget.addItem(directory)
+
+        if self.show_online_games and ONLINE_GAMES_DIR not in selected_directories:
+            self.directory_list_widget.addItem(ONLINE_GAMES_DIR)
+        elif not self.show_online_games:
+            for i in range(self.directory_list_widget.count()):
+                if self.directory_list_widget.item(i).text() == ONLINE_GAMES_DIR:
+                    self.directory_list_widget.takeItem(i)
+                    break
 
 
     def load_settings(self):
-        filename = "settings.json"
-        if os.path.exists(filename):
-            with open(filename, "r") as file:
-                settings = json.load(file)
-                self.dark_mode = settings.get("dark_mode", False)
-                self.show_online_games = settings.get("show_online_games", False)
-                self.display_style = settings.get("display_style", "grid")
-                print(f"Loaded settings: {settings}")
+        self.dark_mode = self.settings.get("dark_mode")
+        self.show_online_games = self.settings.get("show_online_games")
+        self.display_style = self.settings.get("display_style")
 
     def save_settings(self):
-        settings = {
+        # The settings store validates, notifies the launcher and writes the file
+        self.settings.update({
             "dark_mode": self.dark_mode,
             "selected_directories": [self.directory_list_widget.item(i).text() for i in range(self.directory_list_widget.count())],
             "display_style": self.display_style,
             "show_online_games": self.show_online_games
-        }
-
-        filename = "settings.json"
-        with open(filename, "w") as file:
-            json.dump(settings, file)
-        print(f"Saved settings: {settings}")  # Debug statement
+        })
 
 
 
 
 class GameLauncherApp(QMainWindow):
-    def __init__(self):
+    library_changed = pyqtSignal(object)
+    shortcut_resolved = pyqtSignal(str, object, object, bool)
+    library_resolved = pyqtSignal(object)
+    library_scanned = pyqtSignal(object)
+
+    def __init__(self, progress=None):
         try:
             super().__init__()
-            print("Initializing GameLauncherApp")
+            self.progress = progress  # Reports startup phases to the splash screen
+            log.debug("Initializing GameLauncherApp")
             self.setWindowTitle("Game Launcher")
             self.setStyleSheet("background-color: #1e1e1e; color: #ffffff;")
             self.dark_mode = False
@@ -151,34 +184,114 @@ class GameLauncherApp(QMainWindow):
             self.selected_game = None
             self.show_online_games = False
             self.tray_icon = None  # Initialize tray_icon to None
+            self.settings = SettingsStore()
+            self.settings.settings_changed.connect(self.on_settings_changed)
+            QApplication.instance().aboutToQuit.connect(self.settings.flush)
+            self.library_index = LibraryIndex()
+            self.cover_cache = CoverCache(atlas=CoverAtlas())
+            self.cover_index = CoverIndex()
+            self.cover_loader = CoverLoader(self.cover_cache, parent=self)
+            self.cover_loader.cover_ready.connect(self.on_cover_ready)
+            self.report_progress("Opening play time database")
+            self.tracker = TrackerCache(TrackerStore())
+            QApplication.instance().aboutToQuit.connect(self.tracker.flush)
+            self.playtime_stats = PlaytimeStats(self.tracker)
+            self.library_games = LibraryGames()  # Game name -> shortcut paths it was found at
+            self.library_watcher = LibraryWatcher(self.library_changed.emit)
+            self.library_changed.connect(self.apply_library_changes)
+            self.missing_games = set()
+            self.missing_shortcuts = set()
+            self.search_index = SearchIndex()
+            self.library_snapshot = LibrarySnapshot()
+            self.library_scanned.connect(self.reconcile_library)
+            self.library_resolver = LibraryResolver(self.shortcut_resolved.emit, self.library_resolved.emit)
+            self.shortcut_resolved.connect(self.on_shortcut_resolved)
+            self.library_resolved.connect(self.on_library_resolved)
+            self.session_monitor = GameSessionMonitor(parent=self)
+            self.session_monitor.session_started.connect(self.on_game_session_started)
+            self.session_monitor.session_ended.connect(self.on_game_session_ended)
+            QApplication.instance().aboutToQuit.connect(self.session_monitor.stop_all)
+            self.report_progress("Building window")
             self.initUI()
-            self.update_game_list()  # Updated to call the new method
+            self.metrics_overlay = MetricsOverlay(self)
+            QApplication.instance().aboutToQuit.connect(dump_metrics_if_requested)
+            self.report_progress("Loading library")
+            if not self.show_library_snapshot():
+                self.update_game_list()  # Updated to call the new method
+            QApplication.instance().aboutToQuit.connect(self.save_library_snapshot)
+            self.report_progress("Finishing up")
             self.settings_dialog = SettingsDialog(self)
             self.settings_dialog.dark_mode_changed.connect(self.update_dark_mode_ui)
-            self.settings_dialog.online_games_toggled.connect(self.update_online_games)  # Connect online_games_toggled signal
             self.settings_dialog.finished.connect(self.refresh_ui)
-            self.settings_dialog.finished.connect(self.update_game_list)  # Connect finished signal to refresh_ui slot
             self.showFullScreen()
             self.setFixedSize(self.screen().size())
             self.tray_icon = self.create_tray_icon()
             self.tray_icon.show()
-            print("GameLauncherApp initialized and shown")
+            log.debug("GameLauncherApp initialized and shown")
         except Exception as e:
-            print(f"Error initializing GameLauncherApp: {e}")
+            log.exception("Error initializing GameLauncherApp: %s", e)
             sys.exit(1)
     
     def refresh_ui(self):
+        # The game list is refreshed by on_settings_changed, only if the library settings changed.
+        # That includes show_online_games, the dialog's toggle only takes effect once saved.
         self.update_colors()
-        self.update_game_list()
 
-    def update_online_games(self, show_online_games):
-        self.show_online_games = show_online_games
-        self.update_game_list()
+    def on_settings_changed(self, changes):
+        if "dark_mode" in changes:
+            self.update_dark_mode_ui(changes["dark_mode"])
+        if {"selected_directories", "show_online_games", "source_precedence"} & changes.keys():
+            self.directories = self.settings.get("selected_directories")
+            self.show_online_games = self.settings.get("show_online_games")
+            self.source_precedence = self.settings.get("source_precedence")
+            self.update_game_list()
 
     def update_dark_mode_ui(self, dark_mode):
         self.dark_mode = dark_mode
         self.update_colors() 
 
+    def update_play_stats(self):
+        stats = self.playtime_stats.game_stats(self.selected_game)
+        if not stats["sessions"]:
+            self.play_stats_label.setText("")
+            return
+        lines = [
+            f"Sessions: {stats['sessions']}  |  Average: {format_duration(stats['average_session'])}"
+            f"  |  Longest: {format_duration(stats['longest_session'])}",
+            f"Today: {format_duration(stats['today'])}  |  This Week: {format_duration(stats['this_week'])}",
+            f"Streak: {stats['current_streak']} days  |  Best Streak: {stats['longest_streak']} days",
+        ]
+        most_played = self.playtime_stats.most_played(limit=1, since_days=7)
+        if most_played:
+            lines.append(f"Most Played This Week: {most_played[0][0]}")
+        self.play_stats_label.setText("\n".join(lines))
+
+    def get_cover_path(self, game_name):
+        # The cover named after the game or the closest match, else None
+        return self.cover_index.cover_path(game_name)
+
+    def placeholder_cover(self):
+        placeholder = self.cover_index.placeholder_pixmap(self.cover_cache, *COVER_SIZE)
+        return placeholder if placeholder is not None else QPixmap()
+
+    def on_cover_ready(self, game_cover_path, pixmap):
+        if pixmap is not None:
+            self.game_cover.setPixmap(pixmap)
+            log.debug("Game cover image loaded and resized successfully")
+        else:
+            log.debug("Cover image not found: %s", game_cover_path)
+            self.game_cover.setPixmap(self.placeholder_cover())
+
+    def prefetch_neighbour_covers(self):
+        row = self.game_list.currentIndex().row()
+        if row < 0:
+            return
+        rows = []
+        for offset in range(1, PREFETCH_ROWS + 1):
+            rows.extend((row + offset, row - offset))
+        names = [self.game_proxy.index(r, 0).data() for r in rows if 0 <= r < self.game_proxy.rowCount()]
+        self.cover_loader.prefetch([path for path in map(self.get_cover_path, names) if path], *COVER_SIZE)
+
     def create_tray_icon(self):
         tray_icon = QSystemTrayIcon(self)
         tray_icon.setIcon(QIcon('./icon (png).png'))
@@ -196,48 +309,40 @@ class GameLauncherApp(QMainWindow):
         return tray_icon
 
     def restore_and_refresh(self):
-        print("Restoring and refreshing the Game Launcher")
+        log.debug("Restoring and refreshing the Game Launcher")
         self.show()  # Show the window
         self.activateWindow()  # Bring the window to the foreground
         self.raise_()  # Ensure the window is not hidden behind others
-        self.update_game_list()  # Refresh the game list
+        # The library watcher keeps the game list current, so no rescan is needed here
         # Optionally, you might want to also update the info view
         if self.selected_game:
             self.update_info_view()
 
-    def filter_games(self, text):
-        text = text.lower()  # Convert search text to lowercase for case-insensitive matching
-        print(f"Filtering games with search text: '{text}'")
+    def schedule_filter(self, text):
+        # Every keystroke restarts the timer, so the list is filtered once typing pauses
+        self.filter_timer.start()
+
+    @timed("ui.filter")
+    def filter_games(self):
+        text = self.search_bar.text()
+        log.debug("Filtering games with search text: '%s'", text)
+
+        # Only the visibility and order of rows changes, the model itself is left alone
+        results = self.search_index.search(text)
+        self.game_proxy.set_results(results)
 
-        # Clear the list widget
-        self.game_list.clear()
-        
-        # Filter items based on the search text
-        filtered_items = [game_name for game_name in self.original_game_list if text in game_name.lower()]
-        
-        # Add filtered items back to the list widget
-        for item in filtered_items:
-            self.game_list.addItem(item)
-        
         # Update game count label
-        game_count = len(filtered_items)
+        game_count = self.game_proxy.rowCount()
         self.game_counter_label.setText(f"Games: {game_count}")
         # Styles te game counter label
         self.game_counter_label.setStyleSheet("font-size: 42px; font-weight: bold;")
 
-        # Handle game selection
-        if filtered_items:
-            # Select the first item in the filtered list
-            self.game_list.setCurrentRow(0)
-            self.selected_game = filtered_items[0]
-            self.update_info_view()
-        else:
-            # No matches found, keep the last selected game
-            if self.original_game_list:
-                self.game_list.setCurrentRow(self.original_game_list.index(self.selected_game))
-                self.update_info_view()
+        # Select the best match; a cleared search keeps the current selection if it has one.
+        # With no matches the info view keeps showing the last selected game.
+        if game_count and (results or not self.game_list.currentIndex().isValid()):
+            self.game_list.setCurrentIndex(self.game_proxy.index(0, 0))
 
-        print(f"Game list filtered. Number of games: {game_count}")
+        log.debug("Game list filtered. Number of games: %d", game_count)
 
 
 
@@ -257,10 +362,16 @@ class GameLauncherApp(QMainWindow):
         self.game_list_layout = QVBoxLayout(self.game_list_container)
         self.game_list_layout.setContentsMargins(10, 10, 10, 10)
 
-        self.game_list = QListWidget()
+        self.game_model = GameNameModel(self.missing_games, self)
+        self.game_proxy = SearchProxyModel(self)
+        self.game_proxy.setSourceModel(self.game_model)
+        self.game_list = QListView()
+        self.game_list.setModel(self.game_proxy)
+        self.game_list.setUniformItemSizes(True)
+        self.game_list.setEditTriggers(QListView.NoEditTriggers)
         self.game_list.setStyleSheet("background-color: transparent; color: #ffffff;")
         self.game_list.setFixedWidth(400)
-        self.game_list.currentItemChanged.connect(self.on_game_selected)
+        self.game_list.selectionModel().currentChanged.connect(self.on_game_selected)
         self.game_list_layout.addWidget(self.game_list)
 
         # Context menu for game list
@@ -312,14 +423,18 @@ class GameLauncherApp(QMainWindow):
         # Initialize labels
         self.last_played_label = QLabel("Last Played: N/A")
         self.last_played_label.setStyleSheet("color: #ffffff; font-size: 16px; font-weight: bold;")
-        #self.total_played_label = QLabel("Total Time Played: N/A")
+        self.total_played_label = QLabel("Total Time Played: N/A")
+        self.total_played_label.setStyleSheet("color: #ffffff; font-size: 16px; font-weight: bold;")
+        self.play_stats_label = QLabel("")
+        self.play_stats_label.setStyleSheet("color: #ffffff; font-size: 14px;")
 
         cover_layout.addWidget(self.game_cover)
 
         # Stack the launch button and labels vertically with no spacing
         button_layout.addWidget(self.launch_button)
         button_layout.addWidget(self.last_played_label)
-        #button_layout.addWidget(self.total_played_label)
+        button_layout.addWidget(self.total_played_label)
+        button_layout.addWidget(self.play_stats_label)
 
         # Set spacing to zero
         button_layout.setSpacing(0)
@@ -338,7 +453,11 @@ class GameLauncherApp(QMainWindow):
         # Add search bar
         self.search_bar = QLineEdit(self)
         self.search_bar.setPlaceholderText("Search games...")
-        self.search_bar.textChanged.connect(self.filter_games)
+        self.search_bar.textChanged.connect(self.schedule_filter)
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DELAY_MS)
+        self.filter_timer.timeout.connect(self.filter_games)
         bottom_layout.addWidget(self.search_bar)
 
         # Add settings button
@@ -370,9 +489,7 @@ class GameLauncherApp(QMainWindow):
 
         self.layout.addWidget(self.details_frame, stretch=2)
 
-        print("Initializing UI")
-        print("Game list container added to layout with custom styling")
-        print("Details frame with game cover and buttons added to layout")
+        log.debug("UI initialized")
         self.load_settings()  # Load settings on startup
         
         # Ensure to connect the launch button after all setup
@@ -387,39 +504,48 @@ class GameLauncherApp(QMainWindow):
             self.view_file_location()
 
     def view_file_location(self):
-        selected_item = self.game_list.currentItem()
-        if selected_item:
-            game_name = selected_item.text()
+        game_name = self.game_list.currentIndex().data()
+        if game_name:
             game_path = self.get_game_path(game_name)
             if game_path:
                 # Open the file location in File Explorer
                 os.startfile(os.path.dirname(game_path))
             else:
-                print(f"File path for {game_name} not found")
+                log.warning("File path for %s not found", game_name)
 
     def get_target_from_shortcut(self, shortcut_path):
-        try:
-            # Resolve the target path of the shortcut
-            shell = win32com.client.Dispatch('WScript.Shell')
-            shortcut = shell.CreateShortcut(shortcut_path)
-            return shortcut.Targetpath
-        except Exception as e:
-            print(f"Error resolving shortcut: {e}")
-            return None
+        # Parsed natively and cached by (path, mtime, size), no COM round trip
+        target, arguments = read_cached_shortcut(shortcut_path)
+        self.library_index.set_target(shortcut_path, target, arguments)
+        return target
+
+    def find_shortcut(self, game_name):
+        # The preferred of the game's shortcuts, then the library index
+        shortcuts = self.library_games.shortcuts(game_name)
+        if shortcuts:
+            return shortcuts[0]
+        entry = self.library_index.find_entry(game_name, self.directories)
+        if entry:
+            return entry["path"]
 
-    def get_game_path(self, game_name):
         for directory in self.directories:
             if not os.path.isdir(directory):
-                print(f"Directory not found: {directory}")
+                log.warning("Directory not found: %s", directory)
                 continue
             
             possible_shortcut_path = os.path.join(directory, f"{game_name}.lnk")
             if os.path.exists(possible_shortcut_path):
-                return self.get_target_from_shortcut(possible_shortcut_path)
+                return possible_shortcut_path
             
             possible_shortcut_path = os.path.join(directory, f"{game_name}.url")
             if os.path.exists(possible_shortcut_path):
-                return self.get_target_from_shortcut(possible_shortcut_path)
+                return possible_shortcut_path
+        return None
+
+    def get_game_path(self, game_name):
+        shortcut_path = self.find_shortcut(game_name)
+        if shortcut_path:
+            return self.get_target_from_shortcut(shortcut_path)
 
 
     def update_colors(self):
@@ -435,261 +561,374 @@ class GameLauncherApp(QMainWindow):
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_F12 or event.key() == Qt.Key_Escape:
-            print("Closing application")
+            log.info("Closing application")
             self.close()
+        elif event.key() == Qt.Key_F3:
+            self.metrics_overlay.toggle()
 
+    @timed("ui.info_view")
     def update_info_view(self):
-        print(f"Updating info view for selected game: {self.selected_game}")
+        log.debug("Updating info view for selected game: %s", self.selected_game)
         if not self.selected_game:
-            print("No game selected")
+            log.debug("No game selected")
             return
 
-        # Example path: assuming each game's cover image is named after the game
-        game_cover_filename = f"{self.selected_game}.jpg"
-        game_cover_path = os.path.join("./photos", game_cover_filename)
-        print(f"Constructed cover image path: {game_cover_path}")
+        game_cover_path = self.get_cover_path(self.selected_game)
+        log.debug("Constructed cover image path: %s", game_cover_path)
 
-        if os.path.exists(game_cover_path):
-            try:
-                # Load and resize the image
-                image = QImage(game_cover_path)
-                if image.isNull():
-                    print(f"Image loading failed: {game_cover_path}")
-                    # Optionally, set a placeholder image
-                    self.game_cover.setPixmap(QPixmap())  # Empty pixmap or a placeholder image
-                    return
-
-                # Resize image
-                resized_image = image.scaled(500, 800, Qt.KeepAspectRatio, Qt.SmoothTransformation)  # Example size: 500x800
-                self.game_cover.setPixmap(QPixmap.fromImage(resized_image))
-                print("Game cover image loaded and resized successfully")
-            except FileNotFoundError as e:
-                print(f"Error loading image: {e}")
-                # Optionally, set a placeholder image
-                self.game_cover.setPixmap(QPixmap())  # Empty pixmap or a placeholder image
+        # Cached covers show at once, others are decoded and scaled off the GUI thread
+        if game_cover_path is None:
+            self.game_cover.setPixmap(self.placeholder_cover())
         else:
-            print(f"Cover image not found: {game_cover_path}")
-            # Optionally, set a placeholder image
-            self.game_cover.setPixmap(QPixmap())  # Empty pixmap or a placeholder image
+            pixmap = self.cover_loader.request(game_cover_path, *COVER_SIZE)
+            self.game_cover.setPixmap(pixmap if pixmap is not None else QPixmap())
+        self.prefetch_neighbour_covers()
 
         # Update button text
         self.launch_button.setText(f"Launch Game")
 
-        # Read game_tracker.json for additional information
-        tracker_file = "game_tracker.json"
+        # In-memory tracker lookup, selection changes never touch the disk
         last_played = "N/A"
         total_played = "N/A"
 
-        if os.path.exists(tracker_file):
-            with open(tracker_file, "r") as file:
-                data = json.load(file)
-                game_data = data.get(self.selected_game, {})
-                last_played = game_data.get("last_played", "N/A")
-                total_played = game_data.get("total_played", "N/A")
+        game_data = self.tracker.get_game(self.selected_game)
+        if game_data:
+            last_played = game_data["last_played"] or "N/A"
+            total_played = format_duration(game_data["total_seconds"])
 
         self.last_played_label.setText(f"Last Played: {last_played}")
-        #self.total_played_label.setText(f"Total Time Played: {total_played}")
-        print("Info view updated")
-
-    def create_or_update_tracker(self):
-        game_tracker_path = "game_tracker.json"
-        if not os.path.exists(game_tracker_path):
-            print(f"Creating game tracker file: {game_tracker_path}")
-            games = [self.game_list.item(i).text() for i in range(self.game_list.count())]
-            tracker_data = {game: {"last_played": "N/A", "total_played": "N/A"} for game in games}
-            with open(game_tracker_path, "w") as file:
-                json.dump(tracker_data, file, indent=4)
-            print("Game tracker file created and initialized")
-        else:
-            print(f"Game tracker file already exists: {game_tracker_path}")
-
-    def on_game_selected(self):
-        selected_item = self.game_list.currentItem()
-        if selected_item:
-            self.selected_game = selected_item.text()
+        self.total_played_label.setText(f"Total Time Played: {total_played}")
+        self.update_play_stats()
+        log.debug("Info view updated")
+
+    def on_game_selected(self, current):
+        game_name = current.data()
+        if game_name:
+            self.selected_game = game_name
             self.update_info_view()
         else:
-            print("No game selected")
+            log.debug("No game selected")
         
-    def update_game_tracker(self, start_time=False):
-        tracker_file = "game_tracker.json"
-        now = datetime.datetime.now()
-        now_str = now.strftime("%Y-%m-%d %I:%M %p")  # Formatted time string
-
-        data = {}
+    def report_progress(self, message):
+        if self.progress:
+            self.progress(message)
 
-        if os.path.exists(tracker_file):
-            with open(tracker_file, "r") as file:
-                data = json.load(file)
-        
-        game_data = data.get(self.selected_game, {"last_played": "N/A", "total_played": "0", "start_time": "N/A"})
+    def update_game_tracker(self, start_time=False, game_name=None, duration=None):
+        game_name = game_name or self.selected_game
 
         if start_time:
-            # Record start time
-            game_data["start_time"] = now_str
+            # Record start time and open a new session
+            self.tracker.start_session(game_name)
         else:
-            # Calculate and update total playtime
-            start_time_str = game_data.get("start_time")
-            if start_time_str and start_time_str != "N/A":
-                try:
-                    start_time = datetime.datetime.strptime(start_time_str, "%Y-%m-%d %I:%M %p")
-                    play_duration = now - start_time
-                    total_played = game_data.get("total_played", "0")
-                    
-                    # Convert total_played from "HH:MM:SS" to timedelta
-                    total_played_td = datetime.timedelta(hours=int(total_played.split(':')[0]), 
-                                                        minutes=int(total_played.split(':')[1]), 
-                                                        seconds=int(total_played.split(':')[2]))
-                    
-                    new_total_played = total_played_td + play_duration
-                    new_total_played_str = str(new_total_played).split()[2]  # "days, HH:MM:SS" -> "HH:MM:SS"
-                    
-                    game_data["total_played"] = new_total_played_str
-                except ValueError as e:
-                    print(f"Error parsing total_played or start_time: {e}")
-
-                game_data["start_time"] = "N/A"  # Clear start time
-
-        game_data["last_played"] = now_str
-        data[self.selected_game] = game_data
-        
-        with open(tracker_file, "w") as file:
-            json.dump(data, file, indent=4)
+            # Close the session and add its duration to the total playtime
+            self.tracker.end_session(game_name, duration=duration)
         
-        print(f"Game tracker updated: {self.selected_game} -> {game_data}")
+        log.debug("Game tracker updated: %s -> %s", game_name, self.tracker.get_game(game_name))
 
     def getLocation(shortcut_path):
         if not os.path.exists(shortcut_path):
-            print(f"Error: {shortcut_path} does not exist.")
+            log.warning("%s does not exist", shortcut_path)
             return None
         
+        import winshell  # Only needed for this rarely used fallback
         shortcut = winshell.shortcut(shortcut_path)
         return shortcut.path
 
     @staticmethod
     def is_process_running(process_name):
-        for proc in psutil.process_iter(['pid', 'name']):
-            if proc.info['name'].lower() == process_name.lower():
-                return True
-        return False
+        return is_process_running(process_name)
 
     def launch_game(self):
-        if not self.selected_game:
-            print("No game selected to launch")
-            return
-
-        shortcut_path = None
-        for directory in self.directories:
-            if not os.path.isdir(directory):
-                print(f"Directory not found: {directory}")
-                continue
-            
-            possible_shortcut_path = os.path.join(directory, f"{self.selected_game}.lnk")
-            if os.path.exists(possible_shortcut_path):
-                shortcut_path = possible_shortcut_path
-                break
-            
-            possible_shortcut_path = os.path.join(directory, f"{self.selected_game}.url")
-            if os.path.exists(possible_shortcut_path):
-                shortcut_path = possible_shortcut_path
-                break
-        
-        if shortcut_path:
-            print(f"Launching game: {self.selected_game} from {shortcut_path}")
-            try:
-                target_path = self.get_target_from_shortcut(shortcut_path)
-                if target_path and os.path.exists(target_path):
-                    self.update_game_tracker(start_time=True)
+        # Timed with a span rather than @timed: this is the launch button's slot, and
+        # clicked's checked argument would be passed on to it
+        with span("game.launch"):
+            if not self.selected_game:
+                log.info("No game selected to launch")
+                return
+
+            shortcut_path = self.find_shortcut(self.selected_game)
+            if shortcut_path:
+                log.info("Launching game: %s from %s", self.selected_game, shortcut_path)
+                try:
+                    target_path = self.get_target_from_shortcut(shortcut_path)
+                    if not (target_path and os.path.exists(target_path)):
+                        # Fall back to another shortcut of the same game
+                        for alternative in self.library_games.shortcuts(self.selected_game)[1:]:
+                            target_path = self.get_target_from_shortcut(alternative)
+                            if target_path and os.path.exists(target_path):
+                                log.info("Using alternative shortcut: %s", alternative)
+                                break
+                    if target_path and os.path.exists(target_path):
+                        if self.session_monitor.is_running(self.selected_game):
+                            log.info("%s is already running", self.selected_game)
+                            return
+                        self.update_game_tracker(start_time=True)
                     
-                    os.startfile(target_path)
-                    self.hide()
-                    self.tray_icon.show()
+                        pid = self.start_game_process(target_path)
+                        self.hide()
+                        self.tray_icon.show()
                     
-                    process_name = os.path.basename(target_path)
-                    print(f"Monitoring process: {process_name}")
-                    if self.monitor_game_execution(process_name):
-                        self.update_game_tracker(start_time=False)
-                else:
-                    print(f"Target path for game '{self.selected_game}' not found: {target_path}")
-            except Exception as e:
-                print(f"Error launching game: {e}")
-        else:
-            print(f"Shortcut for game '{self.selected_game}' not found")
+                        # Monitored on a background thread, the GUI stays responsive
+                        self.monitor_game_execution(self.selected_game, os.path.basename(target_path), pid)
+                    else:
+                        log.warning("Target path for game '%s' not found: %s", self.selected_game, target_path)
+                except Exception as e:
+                    log.error("Error launching game: %s", e)
+            else:
+                log.warning("Shortcut for game '%s' not found", self.selected_game)
 
-    def monitor_game_execution(self, process_name):
-        print(f"Monitoring process: {process_name}")
+    def start_game_process(self, target_path):
+        # Executables are spawned directly so the session can be tracked by PID
+        if target_path.lower().endswith(".exe"):
+            try:
+                process = subprocess.Popen([target_path], cwd=os.path.dirname(target_path))
+                return process.pid
+            except OSError as e:
+                log.warning("Could not spawn %s directly, using the shell: %s", target_path, e)
+        os.startfile(target_path)
+        return None
+
+    def monitor_game_execution(self, game_name, process_name, pid=None):
+        return self.session_monitor.track(game_name, process_name, pid)
+
+    def on_game_session_started(self, game_name):
+        log.info("Game session started: %s", game_name)
+        self.tray_icon.setToolTip(f"Game Launcher - playing {', '.join(self.session_monitor.running_games())}")
+
+    def on_game_session_ended(self, game_name, duration):
+        log.info("Game session ended: %s after %.0f seconds", game_name, duration)
+        self.update_game_tracker(start_time=False, game_name=game_name, duration=duration)
+        self.playtime_stats.invalidate()
+        running_games = self.session_monitor.running_games()
+        self.tray_icon.setToolTip(f"Game Launcher - playing {', '.join(running_games)}" if running_games else "Game Launcher")
+        if game_name == self.selected_game:
+            self.update_info_view()
 
-        try:
-            while GameLauncherApp.is_process_running(process_name):
-                time.sleep(5)
-            
-            print(f"{process_name} has stopped running")
-            return True
-        except Exception as e:
-            print(f"Error while monitoring process: {e}")
-            return False
+    def library_key(self):
+        return {"directories": list(self.directories), "show_online_games": self.show_online_games}
 
-    def update_game_list(self):
-        print("Updating game list")
-        self.game_list.clear()
+    def prune_online_directory(self):
+        # Remove online games directory from directories if not showing online games
+        if not self.show_online_games and ONLINE_GAMES_DIR in self.directories:
+            self.directories.remove(ONLINE_GAMES_DIR)
 
-        games = []
+    @timed("library.scan")
+    def scan_library(self):
+        # Lists the configured directories (only changed ones are listed again) and
+        # folds shortcuts of the same game into one entry. Nothing but the library
+        # index is touched, so this can run off the GUI thread.
+        directories = list(self.directories)
+        if self.show_online_games:
+            directories.append(ONLINE_GAMES_DIR)
 
-        # Load the games from selected directories
-        for directory in self.directories:
-            if not os.path.isdir(directory):
-                print(f"Directory not found: {directory}")
+        sources = []
+        for directory in dict.fromkeys(directories):  # The online folder may be listed twice
+            entries = self.library_index.scan_directory(directory)
+            if entries is None:
+                log.warning("Directory not found: %s", directory)
                 continue  # Skip non-existent directories
+            sources.append((directory, entries))
 
-            for file_name in os.listdir(directory):
-                if file_name.endswith(".lnk") or file_name.endswith(".url"):
-                    game_name = os.path.splitext(file_name)[0]
-                    games.append(game_name)
+        library_games = LibraryGames(self.source_precedence)
+        games = library_games.build(sources)  # Sorted alphabetically
+        if library_games.duplicates:
+            log.info("Merged %d duplicate shortcuts into other games", library_games.duplicates)
+        entries_to_resolve = [entry for _, entries in sources for entry in entries]
+        return games, entries_to_resolve, library_games
 
-        
-        # Handle online games
-        online_games_dir = "./Online Games"
-        if self.show_online_games:
-            if os.path.isdir(online_games_dir):
-                for file_name in os.listdir(online_games_dir):
-                    if file_name.endswith(".lnk") or file_name.endswith(".url"):
-                        game_name = os.path.splitext(file_name)[0]
-                        if game_name not in games:
-                            games.append(game_name)
-        else:
-            # Remove online games directory from directories if not showing online games
-            if online_games_dir in self.directories:
-                self.directories.remove(online_games_dir)
-        
-        # Sort the game list alphabetically
-        games.sort()
+    def update_game_list(self):
+        log.debug("Updating game list")
+        self.prune_online_directory()
+        self.cover_index.refresh()
+        games, entries_to_resolve, self.library_games = self.scan_library()
+        self.missing_games.clear()  # Shared with the game model
+        self.missing_shortcuts.clear()
         
         # Save the original game list for filtering
         self.original_game_list = games.copy()
         
-        # Add sorted games to the list widget
-        for game_name in games:
-            self.game_list.addItem(game_name)
-        
-        game_count = len(games)
+        # Hand the sorted games to the model in one go
+        self.search_index.build(games)
+        self.game_model.setStringList(games)
+        if self.search_bar.text():
+            self.filter_games()
+
+        self.finish_library_update(entries_to_resolve)
+
+    def show_library_snapshot(self):
+        # Paints the list from the last snapshot and scans the library on a worker
+        # thread; reconcile_library() then applies the differences. Returns False
+        # if there is no usable snapshot.
+        self.prune_online_directory()
+        snapshot = self.library_snapshot.load(self.library_key())
+        if snapshot is None:
+            return False
+
+        games = snapshot["games"]
+        self.original_game_list = list(games)
+        self.search_index.build(games)
+        self.game_model.setStringList(games)
+        self.game_counter_label.setText(f"Games: {snapshot['count']}")
+        self.library_snapshot.load_cover(snapshot, self.cover_cache, COVER_SIZE)
+        row = self.game_row(snapshot["selected_game"]) if snapshot["selected_game"] else -1
+        if row >= 0:
+            self.game_list.setCurrentIndex(self.game_proxy.mapFromSource(self.game_model.index(row)))
+        log.info("Game list painted from snapshot with %d games", snapshot["count"])
+
+        threading.Thread(target=lambda: self.library_scanned.emit(self.scan_library()), daemon=True).start()
+        return True
+
+    def reconcile_library(self, scan):
+        games, entries_to_resolve, self.library_games = scan
+        scanned, shown = set(games), set(self.original_game_list)
+        for game_name in shown - scanned:
+            self.remove_game_row(game_name)
+        for game_name in sorted(scanned - shown):
+            self.insert_game_row(game_name)
+        log.info("Reconciled snapshot with library: %d added, %d removed", len(scanned - shown), len(shown - scanned))
+        self.finish_library_update(entries_to_resolve)
+
+    def finish_library_update(self, entries_to_resolve):
+        game_count = self.game_proxy.rowCount()
         self.game_counter_label.setText(f"Games: {game_count}")
-        print(f"Game list updated with {game_count} games")
+        self.library_index.save()
+        log.info("Game list updated with %d games", game_count)
+
+        watched_directories = list(self.directories)
+        if self.show_online_games:
+            watched_directories.append(ONLINE_GAMES_DIR)
+        self.library_watcher.watch(watched_directories)
+
+        # Resolve every shortcut in the background so broken ones are flagged up front
+        self.library_resolver.start(entries_to_resolve)
+        self.cover_index.report_missing(self.original_game_list)
+        self.save_library_snapshot()
+
+    def save_library_snapshot(self):
+        cover_source = self.get_cover_path(self.selected_game) if self.selected_game else None
+        self.library_snapshot.save(self.library_key(), self.original_game_list, self.selected_game,
+                                   cover_source, self.game_cover.pixmap())
+
+    def on_shortcut_resolved(self, shortcut_path, target, arguments, missing):
+        self.library_index.set_target(shortcut_path, target, arguments)
+        if self.library_games.game_for(shortcut_path) is None:
+            return  # Result from a shortcut that has since been removed
+        # The target may show the shortcut is another game's, found under a different name
+        moved = self.library_games.set_target(shortcut_path, target_key(target, arguments))
+        if moved:
+            removed, (game_name, is_new) = moved
+            self.apply_shortcut_removal(removed)
+            if is_new:
+                self.insert_game_row(game_name)
+            self.game_counter_label.setText(f"Games: {self.game_proxy.rowCount()}")
+        game_name = self.library_games.game_for(shortcut_path)
+        if missing:
+            self.missing_shortcuts.add(shortcut_path)
+        else:
+            self.missing_shortcuts.discard(shortcut_path)
+        self.update_missing_game(game_name)
+
+    def update_missing_game(self, game_name):
+        # A game is only flagged when none of its shortcuts works
+        if all(path in self.missing_shortcuts for path in self.library_games.shortcuts(game_name)):
+            self.missing_games.add(game_name)
+        else:
+            self.missing_games.discard(game_name)
+        self.refresh_game_row(game_name)
+
+    def game_row(self, game_name):
+        # original_game_list mirrors the model rows, so the row is a binary search away
+        row = bisect.bisect_left(self.original_game_list, game_name)
+        if row < len(self.original_game_list) and self.original_game_list[row] == game_name:
+            return row
+        return -1
+
+    def refresh_game_row(self, game_name):
+        row = self.game_row(game_name)
+        if row >= 0:
+            index = self.game_model.index(row)
+            self.game_model.dataChanged.emit(index, index, [Qt.ForegroundRole, Qt.ToolTipRole])
+
+    def on_library_resolved(self, stats):
+        self.library_index.save()
+        log.info("Resolved %d shortcuts in %s ms (%s ms each, %d workers, %d missing, %d errors)",
+                 stats["resolved"], stats["elapsed_ms"], stats["per_shortcut_ms"], stats["workers"],
+                 stats["missing"], stats["errors"])
+
+    def apply_library_changes(self, changes):
+        # Applies watcher deltas row by row instead of rebuilding the whole list
+        renamed = {game_name_from_path(old): game_name_from_path(new) for old, new in changes["renamed"]}
+        removed = changes["removed"] + [old for old, new in changes["renamed"]]
+        added = changes["added"] + [new for old, new in changes["renamed"]]
+
+        for path in removed:
+            self.missing_shortcuts.discard(path)
+            removal = self.library_games.remove(path)
+            self.apply_shortcut_removal(removal)
+            game_name, _, new_name = removal
+            if new_name:
+                renamed.setdefault(game_name, new_name)
+
+        for path in added:
+            game_name, is_new = self.library_games.add_path(path)
+            if is_new:
+                self.insert_game_row(game_name)
+
+        # Rewritten shortcuts are resolved again, they may point at another game now
+        changed = [path for path in changes["changed"] if self.library_games.game_for(path) is not None]
+        if added or changed:
+            self.library_resolver.start(({"path": path} for path in added + changed), replace=False)
+
+        # Keep the selection on a game that was renamed
+        new_name = renamed.get(self.selected_game)
+        if new_name and self.selected_game not in self.library_games:
+            row = self.game_row(new_name)
+            if row >= 0:
+                index = self.game_proxy.mapFromSource(self.game_model.index(row))
+                if index.isValid():
+                    self.game_list.setCurrentIndex(index)
+
+        self.game_counter_label.setText(f"Games: {self.game_proxy.rowCount()}")
+        log.debug("Applied library changes: %s", changes)
+
+    def apply_shortcut_removal(self, removed):
+        # Updates the rows after LibraryGames.remove() returned removed
+        game_name, last_shortcut, new_name = removed
+        if last_shortcut:
+            self.remove_game_row(game_name)
+        elif new_name:
+            # Its preferred shortcut is gone, the game now goes by the next one's name
+            self.remove_game_row(game_name)
+            self.insert_game_row(new_name)
+            self.update_missing_game(new_name)
+        elif game_name is not None:
+            self.update_missing_game(game_name)
+
+    def remove_game_row(self, game_name):
+        self.missing_games.discard(game_name)
+        row = self.game_row(game_name)
+        if row >= 0:
+            del self.original_game_list[row]
+            self.game_model.removeRows(row, 1)
+            self.search_index.remove(game_name)
+
+    def insert_game_row(self, game_name):
+        row = bisect.bisect_right(self.original_game_list, game_name)
+        self.original_game_list.insert(row, game_name)
+        self.search_index.add(game_name)
+        self.game_model.insertRows(row, 1)
+        self.game_model.setData(self.game_model.index(row), game_name)
+        if self.search_bar.text():
+            self.filter_timer.start()  # Re-rank so the new game shows up if it matches
 
 
 
     def load_settings(self):
-        print("Loading settings")
-        filename = "settings2.json"
-        if os.path.exists(filename):
-            with open(filename, "r") as file:
-                settings = json.load(file)
-                self.dark_mode = settings.get("dark_mode", False)
-                self.directories = settings.get("selected_directories", [])
-                # Implement settings logic if needed
-            print("Settings loaded:", settings)
-        else:
-            print(f"Settings file not found: {filename}")
-            self.directories = []
+        log.debug("Loading settings")
+        self.dark_mode = self.settings.get("dark_mode")
+        self.directories = self.settings.get("selected_directories")
+        self.show_online_games = self.settings.get("show_online_games")
+        self.source_precedence = self.settings.get("source_precedence")
 
 class SplashScreen(QSplashScreen):
     def __init__(self, pixmap):
@@ -698,19 +937,16 @@ class SplashScreen(QSplashScreen):
         self.setPixmap(pixmap)
 
 if __name__ == "__main__":
+    configure_logging()
     app = QApplication(sys.argv)
     
     # Load and display splash screen
     splash_pix = QPixmap('icon (png).png')
     splash = SplashScreen(splash_pix)
     splash.show()
+    app.processEvents()
     
-    def launch_game_launcher():
-        launcher = GameLauncherApp()
-        launcher.show()
-    
-    # Close splash screen after 10 seconds and launch game launcher
-    QTimer.singleShot(3500, splash.close)
-    QTimer.singleShot(3500, launch_game_launcher)
+    # Build the launcher while the splash is up, it closes on the launcher's first frame
+    launcher = start_with_splash(splash, GameLauncherApp)
 
     sys.exit(app.exec_())
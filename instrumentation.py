@@ -0,0 +1,123 @@
+import os
+import json
+import time
+import logging
+import threading
+from functools import wraps
+from collections import deque
+from contextlib import contextmanager
+
+# LAUNCHER_LOG_LEVEL=DEBUG shows the per-selection and per-keystroke messages,
+# LAUNCHER_METRICS_FILE=path writes the span statistics there on exit
+LOG_LEVEL_VARIABLE = "LAUNCHER_LOG_LEVEL"
+METRICS_FILE_VARIABLE = "LAUNCHER_METRICS_FILE"
+DEFAULT_LOG_LEVEL = "INFO"  # Hot paths log at DEBUG, so they cost one level check by default
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+MAX_SAMPLES = 1000  # Per span, percentiles are over the most recent samples
+
+
+def get_logger(name):
+    return logging.getLogger(f"launcher.{name}")
+
+
+def configure_logging(level=None):
+    # Called by the entry points; importing a module never touches the logging setup
+    level = (level or os.environ.get(LOG_LEVEL_VARIABLE) or DEFAULT_LOG_LEVEL).upper()
+    logger = logging.getLogger("launcher")
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT, "%H:%M:%S"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(getattr(logging, level, logging.INFO))
+
+
+def percentile(samples, fraction):
+    # Nearest rank on sorted samples
+    return samples[min(len(samples) - 1, max(0, round(fraction * len(samples)) - 1))]
+
+
+class Metrics:
+    # Durations of named spans, recorded from any thread. Keeps a count, total and
+    # maximum for every span and the last MAX_SAMPLES durations for the percentiles.
+    def __init__(self, max_samples=MAX_SAMPLES):
+        self.max_samples = max_samples
+        self.lock = threading.Lock()
+        self.spans = {}  # Name -> [count, total ms, max ms, recent ms]
+
+    def record(self, name, elapsed_ms):
+        with self.lock:
+            span = self.spans.get(name)
+            if span is None:
+                span = self.spans[name] = [0, 0.0, 0.0, deque(maxlen=self.max_samples)]
+            span[0] += 1
+            span[1] += elapsed_ms
+            span[2] = max(span[2], elapsed_ms)
+            span[3].append(elapsed_ms)
+
+    def summary(self):
+        with self.lock:
+            spans = {name: (count, total, longest, sorted(recent))
+                     for name, (count, total, longest, recent) in self.spans.items()}
+        return {
+            name: {
+                "count": count,
+                "total_ms": round(total, 3),
+                "p50_ms": round(percentile(recent, 0.5), 3),
+                "p95_ms": round(percentile(recent, 0.95), 3),
+                "max_ms": round(longest, 3),  # Over the whole run, not just the recent samples
+            }
+            for name, (count, total, longest, recent) in sorted(spans.items())
+        }
+
+    def format_summary(self):
+        lines = [f"{'span':<20} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}"]
+        for name, stats in self.summary().items():
+            lines.append(f"{name:<20} {stats['count']:>6} {stats['p50_ms']:>9.2f} "
+                         f"{stats['p95_ms']:>9.2f} {stats['max_ms']:>9.2f}")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        temp_path = f"{path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(self.summary(), file, indent=4)
+            os.replace(temp_path, path)
+        except OSError as e:
+            get_logger("instrumentation").warning("Could not write metrics to %s: %s", path, e)
+            return False
+        get_logger("instrumentation").info("Metrics written to %s", path)
+        return True
+
+    def reset(self):
+        with self.lock:
+            self.spans.clear()
+
+
+metrics = Metrics()
+
+
+@contextmanager
+def span(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.record(name, (time.perf_counter() - started) * 1000)
+
+
+def timed(name):
+    # Decorator form of span()
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def dump_metrics_if_requested():
+    path = os.environ.get(METRICS_FILE_VARIABLE)
+    if path:
+        metrics.dump(path)
@@ -0,0 +1,163 @@
+import os
+
+from search_index import normalize
+
+
+def source_key(directory):
+    return os.path.normcase(os.path.abspath(directory))
+
+
+def name_key(name):
+    # "Assassin's Creed  III" and "assassins creed iii" are the same game
+    return " ".join(normalize(name)) or name.casefold()
+
+
+def target_key(target, arguments=None):
+    # Launchers (Battle.net, upc.exe) start different games from one executable,
+    # so the arguments are part of what a shortcut launches
+    if not target:
+        return None
+    if "://" in target:
+        target = target.casefold()  # steam://rungameid/... and other URL targets
+    else:
+        target = os.path.normcase(os.path.normpath(target))
+    return target, " ".join((arguments or "").split())
+
+
+class LibraryGames:
+    # The library as games instead of shortcuts. Shortcuts with the same normalized
+    # name, or resolved to the same target, are one game shown under the name of the
+    # shortcut from the preferred source; the others stay available as alternatives.
+    # Sources are ranked by precedence (directories listed there first, in that
+    # order), then by the order they were scanned in.
+    def __init__(self, precedence=()):
+        self.precedence = {source_key(source): rank for rank, source in enumerate(precedence)}
+        self.games = {}  # Game name -> [(rank, path)], best first
+        self.path_games = {}  # Shortcut path -> game name
+        self.name_games = {}  # Name key -> game name
+        self.target_games = {}  # Target key -> game name
+        self.path_entries = {}  # Shortcut path -> (shortcut name, name key, target key)
+        self.source_order = {}  # Source key -> scan order
+        self.duplicates = 0
+
+    def source_rank(self, directory):
+        key = source_key(directory)
+        order = self.source_order.setdefault(key, len(self.source_order))
+        return self.precedence.get(key, len(self.precedence)), order
+
+    def build(self, sources):
+        # sources: [(directory, shortcut entries)] in scan order
+        ranked = []
+        for directory, entries in sources:
+            rank = self.source_rank(directory)
+            ranked.extend((rank, entry) for entry in entries)
+        ranked.sort(key=lambda item: item[0])  # Stable, a directory keeps its own order
+        for rank, entry in ranked:
+            self.add(entry["name"], entry["path"], rank, target_key(entry.get("target"), entry.get("arguments")))
+        return sorted(self.games)
+
+    def add(self, name, path, rank, target=None):
+        # Returns (game name, True if the game is new)
+        if path in self.path_games:
+            return self.path_games[path], False  # The same directory configured twice
+        key = name_key(name)
+        game = self.name_games.get(key) or (self.target_games.get(target) if target else None)
+        is_new = game is None
+        if is_new:
+            game = name
+            self.games[game] = []
+        else:
+            self.duplicates += 1
+        shortcuts = self.games[game]
+        shortcuts.append((rank, path))
+        shortcuts.sort(key=lambda shortcut: shortcut[0])
+        self.path_games[path] = game
+        self.path_entries[path] = (name, key, target)
+        self.name_games.setdefault(key, game)
+        if target:
+            self.target_games.setdefault(target, game)
+        return game, is_new
+
+    def add_path(self, path):
+        # A shortcut reported by the library watcher; its target isn't known yet
+        name = os.path.splitext(os.path.basename(path))[0]
+        return self.add(name, path, self.source_rank(os.path.dirname(path)))
+
+    def set_target(self, path, target):
+        # The target key of a shortcut was resolved after it was added, or changed
+        # when it was rewritten. Returns None if the shortcut stays with its game, or
+        # the remove() and add() results if it moves: to the game that already has
+        # the target, or out of a game it only joined through its old target.
+        game = self.path_games.get(path)
+        if game is None:
+            return None
+        name, key, old_target = self.path_entries[path]
+        if target == old_target:
+            return None
+        owner = self.target_games.get(target) if target else None
+        shortcuts = self.games[game]
+        joined_by_name = any(self.path_entries[other][1] == key for _, other in shortcuts if other != path)
+        if owner == game or (owner is None and (len(shortcuts) == 1 or joined_by_name)):
+            self.path_entries[path] = (name, key, target)
+            if old_target:
+                self.release_key(self.target_games, old_target, game, 2)
+            if target:
+                self.target_games.setdefault(target, game)
+            return None
+        rank = next(rank for rank, shortcut_path in shortcuts if shortcut_path == path)
+        return self.remove(path), self.add(name, path, rank, target)
+
+    def remove(self, path):
+        # Returns (game name, True if it was the game's last shortcut, the game's new
+        # name or None), or (None, False, None). A game that loses its preferred
+        # shortcut is renamed after the shortcut preferred now.
+        game = self.path_games.pop(path, None)
+        if game is None:
+            return None, False, None
+        _, key, target = self.path_entries.pop(path)
+        shortcuts = self.games[game]
+        was_preferred = shortcuts[0][1] == path
+        shortcuts[:] = [shortcut for shortcut in shortcuts if shortcut[1] != path]
+        self.release_key(self.name_games, key, game, 1)
+        if target:
+            self.release_key(self.target_games, target, game, 2)
+        if not shortcuts:
+            del self.games[game]
+            return game, True, None
+        self.duplicates -= 1
+        new_name = self.path_entries[shortcuts[0][1]][0]
+        if was_preferred and new_name != game and new_name not in self.games:
+            self.rename(game, new_name)
+            return game, False, new_name
+        return game, False, None
+
+    def release_key(self, index, key, game, field):
+        # After a shortcut of game is removed: a key no other shortcut of the game
+        # produces is handed to a game whose shortcut still does, or dropped
+        if index.get(key) != game:
+            return
+        owners = [self.path_games[path] for path, entry in self.path_entries.items() if entry[field] == key]
+        if game in owners:
+            return
+        if owners:
+            index[key] = owners[0]
+        else:
+            del index[key]
+
+    def rename(self, game, new_name):
+        self.games[new_name] = self.games.pop(game)
+        for _, path in self.games[new_name]:
+            self.path_games[path] = new_name
+        for index in (self.name_games, self.target_games):
+            for key in [key for key, value in index.items() if value == game]:
+                index[key] = new_name
+
+    def shortcuts(self, game):
+        # The game's shortcut paths, preferred first
+        return [path for _, path in self.games.get(game, ())]
+
+    def game_for(self, path):
+        return self.path_games.get(path)
+
+    def __contains__(self, game):
+        return game in self.games
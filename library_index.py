@@ -0,0 +1,135 @@
+import os
+import json
+import threading
+
+from instrumentation import get_logger
+
+SHORTCUT_EXTENSIONS = (".lnk", ".url")
+INDEX_VERSION = 2
+
+log = get_logger("library_index")
+
+
+def make_entry(entry, stat):
+    name, ext = os.path.splitext(entry.name)
+    return {
+        "name": name,
+        "path": entry.path,
+        "kind": ext[1:].lower(),
+        "mtime": stat.st_mtime,
+        "size": stat.st_size,
+        "target": None,
+        "arguments": None,
+    }
+
+
+class LibraryIndex:
+    # On-disk cache of every shortcut found in the library directories.
+    # A directory is only listed again when its own mtime changes, which happens
+    # whenever a shortcut is added, removed or renamed inside it.
+    # The launcher scans on a worker thread while the GUI thread records resolved
+    # targets, so the index is only read or changed under the lock; directory
+    # listings and file writes happen outside it.
+    def __init__(self, index_path="library_index.json"):
+        self.index_path = index_path
+        self.lock = threading.Lock()
+        self.directories = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError) as e:
+            log.warning("Error reading library index, rebuilding: %s", e)
+            return
+        if data.get("version") != INDEX_VERSION:
+            log.info("Library index version changed, rebuilding")
+            return
+        self.directories = data.get("directories", {})
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            data = json.dumps({"version": INDEX_VERSION, "directories": self.directories})
+            self.dirty = False
+        temp_path = f"{self.index_path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                file.write(data)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            log.warning("Error saving library index: %s", e)
+            with self.lock:
+                self.dirty = True
+
+    def scan_directory(self, directory):
+        # Returns the shortcut entries of a directory, or None if it does not exist
+        try:
+            dir_mtime = os.stat(directory).st_mtime
+        except OSError:
+            with self.lock:
+                if directory in self.directories:
+                    del self.directories[directory]
+                    self.dirty = True
+            return None
+
+        with self.lock:
+            cached = self.directories.get(directory)
+            if cached and cached["mtime"] == dir_mtime:
+                return list(cached["entries"].values())
+
+        old_entries = cached["entries"] if cached else {}
+        entries = {}
+        with os.scandir(directory) as it:
+            for entry in it:
+                if not entry.name.lower().endswith(SHORTCUT_EXTENSIONS):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+
+                # Keep the previous entry (and its resolved target) if the file is unchanged
+                old = old_entries.get(entry.name)
+                if old and old["mtime"] == stat.st_mtime and old["size"] == stat.st_size:
+                    entries[entry.name] = old
+                else:
+                    entries[entry.name] = make_entry(entry, stat)
+
+        with self.lock:
+            self.directories[directory] = {"mtime": dir_mtime, "entries": entries}
+            self.dirty = True
+        log.info("Indexed %s shortcuts in %s", len(entries), directory)
+        return list(entries.values())
+
+    def find_entry(self, game_name, directories):
+        # Looks a game up in the cached entries without touching the filesystem
+        with self.lock:
+            for directory in directories:
+                cached = self.directories.get(directory)
+                if not cached:
+                    continue
+                for ext in SHORTCUT_EXTENSIONS:
+                    entry = cached["entries"].get(f"{game_name}{ext}")
+                    if entry:
+                        return entry
+        return None
+
+    def set_target(self, shortcut_path, target, arguments=None):
+        file_name = os.path.basename(shortcut_path)
+        with self.lock:
+            for cached in self.directories.values():
+                entry = cached["entries"].get(file_name)
+                if entry and entry["path"] == shortcut_path:
+                    if (entry["target"], entry["arguments"]) != (target, arguments):
+                        entry["target"] = target
+                        entry["arguments"] = arguments
+                        self.dirty = True
+                    return
@@ -0,0 +1,79 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from shortcut_parser import read_cached_shortcut, shortcut_cache
+from instrumentation import get_logger, timed
+
+DEFAULT_MAX_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+log = get_logger("library_resolver")
+
+
+def is_target_missing(target):
+    if not target:
+        return True
+    if "://" in target:
+        return False  # URL targets (steam://, https://) can't be checked on disk
+    return not os.path.exists(target)
+
+
+@timed("shortcut.resolve")
+def resolve_entry(entry):
+    # Also warms the shortcut cache so launching later is a cache hit
+    target, arguments = read_cached_shortcut(entry["path"])
+    return entry["path"], target, arguments, is_target_missing(target)
+
+
+class LibraryResolver:
+    # Resolves every shortcut of the library on a bounded thread pool.
+    # on_result(path, target, arguments, missing) is called as each shortcut finishes and
+    # on_finished(stats) once the whole batch is done, both from worker threads.
+    def __init__(self, on_result, on_finished, max_workers=DEFAULT_MAX_WORKERS):
+        self.on_result = on_result
+        self.on_finished = on_finished
+        self.max_workers = max_workers
+        self.cancel_event = threading.Event()
+        self.last_stats = None
+
+    def start(self, entries, replace=True):
+        # replace cancels the batch in flight, e.g. when the whole library is reloaded
+        if replace:
+            self.cancel()
+            self.cancel_event = threading.Event()
+        thread = threading.Thread(target=self.run, args=(list(entries), self.cancel_event), daemon=True)
+        thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self, entries, cancel_event):
+        started = time.perf_counter()
+        hits_before = shortcut_cache.hits
+        stats = {"total": len(entries), "resolved": 0, "missing": 0, "errors": 0, "workers": self.max_workers}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="resolver") as pool:
+            futures = [pool.submit(resolve_entry, entry) for entry in entries]
+            for future in as_completed(futures):
+                if cancel_event.is_set():
+                    for pending in futures:
+                        pending.cancel()
+                    return
+                try:
+                    path, target, arguments, missing = future.result()
+                except Exception as e:
+                    log.warning("Error resolving shortcut: %s", e)
+                    stats["errors"] += 1
+                    continue
+                stats["resolved"] += 1
+                if missing:
+                    stats["missing"] += 1
+                self.on_result(path, target, arguments, missing)
+
+        elapsed = time.perf_counter() - started
+        stats["elapsed_ms"] = round(elapsed * 1000, 1)
+        stats["per_shortcut_ms"] = round(elapsed * 1000 / len(entries), 3) if entries else 0.0
+        stats["cache_hits"] = shortcut_cache.hits - hits_before
+        self.last_stats = stats
+        self.on_finished(stats)
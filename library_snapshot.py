@@ -0,0 +1,90 @@
+import os
+import json
+
+from PyQt5.QtGui import QPixmap
+
+from instrumentation import get_logger
+
+SNAPSHOT_VERSION = 1
+COVER_FORMAT = "jpg"
+COVER_QUALITY = 90
+
+log = get_logger("library_snapshot")
+
+
+class LibrarySnapshot:
+    # The game list as it was last shown: sorted names, count, selected game and its
+    # cover already scaled for the info view. Startup paints from it straight away and
+    # reconciles with a real scan afterwards. A snapshot only applies to the same
+    # library settings (directories, online games) it was taken with.
+    def __init__(self, path="library_snapshot.json", cover_path="library_snapshot.jpg"):
+        self.path = path
+        self.cover_path = cover_path
+        self.saved = None
+
+    def load(self, library_key):
+        try:
+            with open(self.path, "r") as file:
+                snapshot = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("library") != library_key:
+            log.info("Library snapshot is out of date, ignoring it")
+            return None
+        self.saved = snapshot
+        return snapshot
+
+    def load_cover(self, snapshot, cover_cache, size):
+        # Seeds the cover cache with the pre-scaled cover, so showing the selected
+        # game doesn't decode the original. Skipped if the cover changed since.
+        source = snapshot.get("cover_source")
+        if not source:
+            return None
+        try:
+            mtime = os.stat(source).st_mtime_ns
+        except OSError:
+            return None
+        if mtime != snapshot.get("cover_mtime"):
+            return None
+        pixmap = QPixmap(self.cover_path)
+        if pixmap.isNull():
+            return None
+        cover_cache.put_pixmap((source, *size), mtime, pixmap)
+        return pixmap
+
+    def save(self, library_key, games, selected_game, cover_source=None, cover_pixmap=None):
+        cover_mtime = None
+        if cover_source and cover_pixmap is not None and not cover_pixmap.isNull():
+            try:
+                cover_mtime = os.stat(cover_source).st_mtime_ns
+            except OSError:
+                cover_source = None
+        else:
+            cover_source = None
+
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "library": library_key,
+            "count": len(games),
+            "selected_game": selected_game,
+            "cover_source": cover_source,
+            "cover_mtime": cover_mtime,
+            "games": list(games),
+        }
+        if snapshot == self.saved:
+            return
+
+        saved_cover = (self.saved or {}).get("cover_source"), (self.saved or {}).get("cover_mtime")
+        if cover_source and (cover_source, cover_mtime) != saved_cover:
+            temp_path = f"{self.cover_path}.tmp"
+            if cover_pixmap.save(temp_path, COVER_FORMAT, COVER_QUALITY):
+                os.replace(temp_path, self.cover_path)
+            else:
+                log.warning("Could not write snapshot cover: %s", self.cover_path)
+                snapshot["cover_source"] = snapshot["cover_mtime"] = None
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(snapshot, file)
+        os.replace(temp_path, self.path)
+        self.saved = snapshot
@@ -0,0 +1,248 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import threading
+import ctypes
+import ctypes.util
+
+from library_index import SHORTCUT_EXTENSIONS
+from instrumentation import get_logger
+
+# inotify event flags (see <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+WATCH_MASK = (IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_MODIFY | IN_CLOSE_WRITE
+              | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+EVENT_HEADER = struct.Struct("iIII")
+
+log = get_logger("library_watcher")
+
+
+def is_shortcut(file_name):
+    return file_name.lower().endswith(SHORTCUT_EXTENSIONS)
+
+
+def empty_changes():
+    # Paths of shortcuts that appeared, disappeared, were renamed (old_path, new_path)
+    # or were rewritten in place, e.g. pointed at another executable
+    return {"added": [], "removed": [], "renamed": [], "changed": []}
+
+
+def has_changes(changes):
+    return bool(changes["added"] or changes["removed"] or changes["renamed"] or changes["changed"])
+
+
+class InotifyBackend:
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+
+    def add_directory(self, directory):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            log.warning("Could not watch directory %s: %s", directory, os.strerror(ctypes.get_errno()))
+            return
+        self.watches[wd] = directory
+
+    def wait(self, stop_fd):
+        readable, _, _ = select.select([self.fd, stop_fd], [], [])
+        if self.fd not in readable:
+            return None
+        # Give the filesystem a moment so that bursts of events arrive in one batch
+        time.sleep(0.05)
+        return self.read_changes()
+
+    def read_changes(self):
+        changes = empty_changes()
+        moved_from = {}
+        changed = {}  # Writes come as several IN_MODIFY and an IN_CLOSE_WRITE, reported once
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                raise
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, cookie, length = EVENT_HEADER.unpack_from(buffer, offset)
+                offset += EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b"\0")
+                offset += length
+
+                directory = self.watches.get(wd)
+                if directory is None:
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    log.info("Watched directory went away: %s", directory)
+                    del self.watches[wd]
+                    continue
+
+                file_name = os.fsdecode(name)
+                if not is_shortcut(file_name):
+                    continue
+                path = os.path.join(directory, file_name)
+                if mask & IN_MOVED_FROM:
+                    moved_from[cookie] = path
+                elif mask & IN_MOVED_TO and cookie in moved_from:
+                    changes["renamed"].append((moved_from.pop(cookie), path))
+                elif mask & (IN_CREATE | IN_MOVED_TO):
+                    changes["added"].append(path)
+                elif mask & IN_DELETE:
+                    changes["removed"].append(path)
+                elif mask & (IN_MODIFY | IN_CLOSE_WRITE):
+                    changed[path] = None
+
+        # A move out of the watched directories looks like a removal
+        changes["removed"].extend(moved_from.values())
+        # A shortcut that is new or gone is handled as such, not as rewritten
+        settled = set(changes["added"]) | set(changes["removed"]) | {new for old, new in changes["renamed"]}
+        changes["changed"] = [path for path in changed if path not in settled]
+        return changes
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingBackend:
+    def __init__(self, interval=2.0):
+        self.interval = interval
+        self.snapshots = {}
+
+    def add_directory(self, directory):
+        self.snapshots[directory] = self.list_directory(directory)
+
+    @staticmethod
+    def list_directory(directory):
+        # Shortcut name -> mtime. Listed on every poll: a shortcut rewritten in place
+        # leaves the directory's own mtime alone. On Windows the stat comes with the
+        # listing.
+        shortcuts = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if is_shortcut(entry.name):
+                        try:
+                            shortcuts[entry.name] = entry.stat().st_mtime
+                        except OSError:
+                            continue
+        except OSError:
+            pass
+        return shortcuts
+
+    def wait(self, stop_fd):
+        readable, _, _ = select.select([stop_fd], [], [], self.interval)
+        if readable:
+            return None
+        return self.read_changes()
+
+    def read_changes(self):
+        changes = empty_changes()
+        for directory, old_shortcuts in list(self.snapshots.items()):
+            shortcuts = self.list_directory(directory)
+            self.snapshots[directory] = shortcuts
+            names, old_names = shortcuts.keys(), old_shortcuts.keys()
+            added = sorted(names - old_names)
+            removed = sorted(old_names - names)
+            changes["changed"].extend(os.path.join(directory, name) for name in sorted(names & old_names)
+                                      if shortcuts[name] != old_shortcuts[name])
+
+            # Polling can't see renames directly; one-out-one-in is treated as a rename
+            if len(added) == 1 and len(removed) == 1:
+                changes["renamed"].append((os.path.join(directory, removed[0]), os.path.join(directory, added[0])))
+                continue
+            changes["added"].extend(os.path.join(directory, name) for name in added)
+            changes["removed"].extend(os.path.join(directory, name) for name in removed)
+        return changes
+
+    def close(self):
+        pass
+
+
+class LibraryWatcher:
+    # Watches the library directories on a background thread and calls
+    # on_changes(changes) with the shortcuts that were added, removed, renamed or changed.
+    # The callback runs on the watcher thread, so GUI code should hand it to a Qt signal.
+    def __init__(self, on_changes, poll_interval=2.0):
+        self.on_changes = on_changes
+        self.poll_interval = poll_interval
+        self.directories = []
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.stop_pipe = None
+
+    def watch(self, directories):
+        directories = [d for d in dict.fromkeys(directories) if os.path.isdir(d)]
+        if directories == self.directories and self.thread and self.thread.is_alive():
+            return
+        self.stop()
+        self.directories = directories
+        if not directories:
+            return
+
+        backend = self.create_backend()
+        for directory in directories:
+            backend.add_directory(directory)
+
+        self.stop_event = threading.Event()
+        self.stop_pipe = os.pipe() if os.name != "nt" else None
+        self.thread = threading.Thread(target=self.run, args=(backend, self.stop_event, self.stop_pipe), daemon=True)
+        self.thread.start()
+        log.info("Watching %s directories with %s", len(directories), type(backend).__name__)
+
+    def create_backend(self):
+        if sys.platform.startswith("linux"):
+            try:
+                return InotifyBackend()
+            except (OSError, AttributeError) as e:
+                log.info("inotify unavailable, falling back to polling: %s", e)
+        return PollingBackend(self.poll_interval)
+
+    def run(self, backend, stop_event, stop_pipe):
+        stop_fd = stop_pipe[0] if stop_pipe else None
+        try:
+            while not stop_event.is_set():
+                if stop_fd is None:
+                    # No pollable stop pipe on Windows, so sleep between polls instead
+                    if stop_event.wait(self.poll_interval):
+                        break
+                    changes = backend.read_changes()
+                else:
+                    changes = backend.wait(stop_fd)
+                if changes is None or stop_event.is_set():
+                    continue
+                if has_changes(changes):
+                    self.on_changes(changes)
+        except Exception as e:
+            log.warning("Library watcher stopped: %s", e)
+        finally:
+            backend.close()
+            if stop_pipe:
+                os.close(stop_pipe[0])
+
+    def stop(self):
+        if not self.thread:
+            return
+        self.stop_event.set()
+        if self.stop_pipe:
+            os.write(self.stop_pipe[1], b"x")
+            os.close(self.stop_pipe[1])
+            self.stop_pipe = None
+        self.thread.join(timeout=1)
+        self.thread = None
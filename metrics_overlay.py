@@ -0,0 +1,34 @@
+from PyQt5.QtWidgets import QLabel
+from PyQt5.QtCore import Qt, QTimer
+
+from instrumentation import metrics
+
+OVERLAY_REFRESH_MS = 1000
+
+
+class MetricsOverlay(QLabel):
+    # Span statistics drawn over the window, refreshed while visible (toggled with F3)
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 180); color: #7CFC00; "
+                           "font-family: Consolas, monospace; font-size: 13px; padding: 8px;")
+        self.timer = QTimer(self)
+        self.timer.setInterval(OVERLAY_REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def toggle(self):
+        if not self.isHidden():
+            self.timer.stop()
+            self.hide()
+        else:
+            self.refresh()
+            self.show()
+            self.raise_()
+            self.timer.start()
+
+    def refresh(self):
+        self.setText(metrics.format_summary())
+        self.adjustSize()
+        self.move(10, 10)
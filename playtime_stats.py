@@ -0,0 +1,114 @@
+import datetime
+import threading
+
+
+def week_start(day):
+    return day - datetime.timedelta(days=day.weekday())
+
+
+def longest_run(days):
+    # Longest run of consecutive dates in a sorted list
+    best = run = 0
+    previous = None
+    for day in days:
+        run = run + 1 if previous and day - previous == datetime.timedelta(days=1) else 1
+        best = max(best, run)
+        previous = day
+    return best
+
+
+def current_run(days, today):
+    # Consecutive days played up to today (or yesterday, so the streak survives until midnight)
+    played = set(days)
+    day = today if today in played else today - datetime.timedelta(days=1)
+    streak = 0
+    while day in played:
+        streak += 1
+        day -= datetime.timedelta(days=1)
+    return streak
+
+
+class PlaytimeStats:
+    # Aggregates built from the daily_totals rollup table, loaded in one pass and
+    # kept in memory until a session ends.
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.lock = threading.Lock()
+        self.daily = None
+        self.summaries = {}
+        self.rankings = {}  # most_played results, asked for on every selection change
+
+    def invalidate(self):
+        with self.lock:
+            self.daily = None
+            self.rankings = {}
+
+    def load(self):
+        self.tracker.flush()  # Make sure pending sessions are in the rollups
+        daily = {}
+        for game, day, seconds in self.tracker.store.daily_totals():
+            daily.setdefault(game, {})[datetime.date.fromisoformat(day)] = seconds
+        summaries = self.tracker.store.session_summaries()
+        with self.lock:
+            self.daily = daily
+            self.summaries = summaries
+
+    def ensure_loaded(self):
+        if self.daily is None:
+            self.load()
+
+    def game_stats(self, name, today=None):
+        self.ensure_loaded()
+        today = today or datetime.date.today()
+        days = self.daily.get(name, {})
+        played_days = sorted(day for day, seconds in days.items() if seconds > 0)
+        summary = self.summaries.get(name, {})
+        record = self.tracker.get_game(name) or {}
+        this_week = week_start(today)
+        return {
+            "total": record.get("total_seconds", 0.0),
+            "sessions": summary.get("sessions", 0),
+            "average_session": summary.get("average") or 0.0,
+            "longest_session": summary.get("longest") or 0.0,
+            "today": days.get(today, 0.0),
+            "this_week": sum(seconds for day, seconds in days.items() if day >= this_week),
+            "current_streak": current_run(played_days, today),
+            "longest_streak": longest_run(played_days),
+        }
+
+    def period_totals(self, period="day", count=7, today=None):
+        # Play time across all games for the last `count` days or weeks, oldest first
+        self.ensure_loaded()
+        today = today or datetime.date.today()
+        if period == "week":
+            starts = [week_start(today) - datetime.timedelta(weeks=i) for i in range(count)]
+            key = week_start
+        else:
+            starts = [today - datetime.timedelta(days=i) for i in range(count)]
+            key = lambda day: day
+        totals = dict.fromkeys(starts, 0.0)
+        for days in self.daily.values():
+            for day, seconds in days.items():
+                start = key(day)
+                if start in totals:
+                    totals[start] += seconds
+        return sorted(totals.items())
+
+    def most_played(self, limit=5, since_days=None, today=None):
+        today = today or datetime.date.today()
+        key = (limit, since_days, today)
+        ranking = self.rankings.get(key)
+        if ranking is None:
+            ranking = self.rankings[key] = self.rank_games(limit, since_days, today)
+        return ranking
+
+    def rank_games(self, limit, since_days, today):
+        self.ensure_loaded()
+        if since_days is None:
+            totals = {name: record["total_seconds"] for name, record in self.tracker.all_games().items()}
+        else:
+            since = today - datetime.timedelta(days=since_days - 1)
+            totals = {name: sum(seconds for day, seconds in days.items() if day >= since)
+                      for name, days in self.daily.items()}
+        ranked = sorted(((seconds, name) for name, seconds in totals.items() if seconds > 0), reverse=True)
+        return [(name, seconds) for seconds, name in ranked[:limit]]
@@ -0,0 +1,225 @@
+import re
+import heapq
+import bisect
+import unicodedata
+from collections import Counter, OrderedDict
+
+# Glyphs that are dropped before matching ("Battlefield™ 2042" -> "battlefield 2042")
+IGNORED_CHARACTERS = str.maketrans("", "", "™®©℠'’`")
+# Letters and digits become separate words, so "bf2042" is searched as "bf 2042"
+WORD_PATTERN = re.compile(r"[^\W\d_]+|\d+")
+
+EXACT_SCORE = 10
+PREFIX_SCORE = 8
+ACRONYM_SCORE = 7
+SUBSEQUENCE_SCORE = 4
+TYPO_SCORE = 3
+LEADING_WORD_BONUS = 2
+
+MAX_ACRONYM_WORDS = 8
+WORD_CACHE_SIZE = 512
+# A single character is a prefix of a large part of the library, only this many names are ranked
+SHORT_QUERY_CANDIDATES = 200
+
+
+def normalize(text):
+    # Casefolded words without accents or trademark glyphs
+    text = unicodedata.normalize("NFKD", text.translate(IGNORED_CHARACTERS))
+    text = "".join(char for char in text if not unicodedata.combining(char)).casefold()
+    return WORD_PATTERN.findall(text)
+
+
+def trigrams(word):
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def is_subsequence(needle, haystack):
+    characters = iter(haystack)
+    return all(char in characters for char in needle)
+
+
+def edit_distance(a, b, limit):
+    # Optimal string alignment distance, gives up as soon as it exceeds limit
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class SearchIndex:
+    # Ranked fuzzy search over game names. Built once per library load and kept
+    # current with add()/remove(). Every query word must match a word of the name,
+    # by (best first) exact word, word prefix, acronym ("ac" -> Assassin's Creed),
+    # abbreviation ("bf" -> Battlefield) or a typo of one or two characters.
+    def __init__(self, names=()):
+        self.build(names)
+
+    def build(self, names):
+        self.words = {}
+        self.word_names = {}
+        self.trigram_words = {}
+        self.acronym_names = {}
+        self.word_cache = OrderedDict()
+        for name in names:
+            self.index_name(name)
+        self.vocabulary = sorted(self.word_names)
+
+    def index_name(self, name):
+        # Returns the words that are new to the vocabulary
+        if name in self.words:
+            return []
+        words = tuple(normalize(name))
+        self.words[name] = words
+        new_words = []
+        for word in set(words):
+            names = self.word_names.get(word)
+            if names is None:
+                names = self.word_names[word] = set()
+                new_words.append(word)
+                for trigram in trigrams(word):
+                    self.trigram_words.setdefault(trigram, set()).add(word)
+            names.add(name)
+        for acronym in self.acronyms(words):
+            self.acronym_names.setdefault(acronym, set()).add(name)
+        return new_words
+
+    @staticmethod
+    def acronyms(words):
+        # Initials of every run of two or more consecutive words
+        initials = "".join(word[0] for word in words[:MAX_ACRONYM_WORDS])
+        return {initials[start:end] for start in range(len(initials)) for end in range(start + 2, len(initials) + 1)}
+
+    def add(self, name):
+        for word in self.index_name(name):
+            bisect.insort(self.vocabulary, word)
+        self.word_cache.clear()
+
+    def remove(self, name):
+        words = self.words.pop(name, None)
+        if words is None:
+            return
+        for word in set(words):
+            names = self.word_names[word]
+            names.discard(name)
+            if names:
+                continue
+            del self.word_names[word]
+            del self.vocabulary[bisect.bisect_left(self.vocabulary, word)]
+            for trigram in trigrams(word):
+                self.trigram_words[trigram].discard(word)
+        for acronym in self.acronyms(words):
+            self.acronym_names[acronym].discard(name)
+        self.word_cache.clear()
+
+    def words_with_prefix(self, prefix):
+        # Indexed rather than sliced, a slice would copy the rest of the vocabulary
+        vocabulary = self.vocabulary
+        for index in range(bisect.bisect_left(vocabulary, prefix), len(vocabulary)):
+            word = vocabulary[index]
+            if not word.startswith(prefix):
+                break
+            yield word
+
+    def match_word(self, query_word):
+        # name -> best score for one query word, cached because typing repeats words
+        cached = self.word_cache.get(query_word)
+        if cached is not None:
+            self.word_cache.move_to_end(query_word)
+            return cached
+
+        scores = {}
+
+        def offer(names, score):
+            for name in names:
+                if scores.get(name, 0) < score:
+                    scores[name] = score
+
+        for word in self.words_with_prefix(query_word):
+            offer(self.word_names[word], EXACT_SCORE if word == query_word else PREFIX_SCORE)
+
+        if len(query_word) >= 2 and query_word.isalpha():
+            offer(self.acronym_names.get(query_word, ()), ACRONYM_SCORE)
+
+        if 2 <= len(query_word) <= 4 and query_word.isalpha():
+            for word in self.words_with_prefix(query_word[0]):
+                if is_subsequence(query_word[1:], word[1:]):
+                    offer(self.word_names[word], SUBSEQUENCE_SCORE)
+
+        if len(query_word) >= 5 and not query_word.isdigit():
+            for word in self.typo_candidates(query_word):
+                offer(self.word_names[word], TYPO_SCORE)
+
+        self.word_cache[query_word] = scores
+        if len(self.word_cache) > WORD_CACHE_SIZE:
+            self.word_cache.popitem(last=False)
+        return scores
+
+    def typo_candidates(self, query_word):
+        # Words sharing enough trigrams with the query, confirmed by edit distance
+        limit = 1 if len(query_word) < 8 else 2
+        query_trigrams = trigrams(query_word)
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(self.trigram_words.get(trigram, ()))
+        needed = max(2, len(query_trigrams) - 3 * limit)
+        for word, count in shared.items():
+            if count < needed:
+                continue
+            # Also accept a typo in a prefix, "witchr" still finds "witcher"
+            if (edit_distance(query_word, word, limit) <= limit
+                    or edit_distance(query_word, word[:len(query_word)], limit) <= limit):
+                yield word
+
+    def search(self, query, limit=None):
+        # Names ranked best first, or None when the query has nothing to search for
+        query_words = normalize(query)
+        if not query_words:
+            return None
+        if len(query_words) == 1 and len(query_words[0]) == 1:
+            return self.search_character(query_words[0], limit)
+
+        scores = None
+        for query_word in query_words:
+            matches = self.match_word(query_word)
+            if scores is None:
+                scores = dict(matches)
+            else:
+                scores = {name: score + matches[name] for name, score in scores.items() if name in matches}
+            if not scores:
+                return []
+        return self.ranked(scores, query_words[0], limit)
+
+    def search_character(self, character, limit):
+        # Candidates come from the prefix bucket in vocabulary order, so the word that
+        # is exactly the character is taken first; the scan stops at SHORT_QUERY_CANDIDATES
+        scores = {}
+        for word in self.words_with_prefix(character):
+            score = EXACT_SCORE if word == character else PREFIX_SCORE
+            for name in self.word_names[word]:
+                scores.setdefault(name, score)
+                if len(scores) >= SHORT_QUERY_CANDIDATES:
+                    return self.ranked(scores, character, limit)
+        return self.ranked(scores, character, limit)
+
+    def ranked(self, scores, first, limit):
+        def rank(name):
+            words = self.words[name]
+            bonus = LEADING_WORD_BONUS if words and words[0].startswith(first) else 0
+            return -(scores[name] + bonus), len(words), name
+
+        if limit is not None:
+            return heapq.nsmallest(limit, scores, key=rank)
+        return sorted(scores, key=rank)
@@ -0,0 +1,259 @@
+import os
+import time
+import select
+import threading
+from functools import lru_cache
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from instrumentation import get_logger
+
+# Follow process trees closely right after launch, when launcher stubs hand off to the game
+HANDOFF_WINDOW = 30.0
+HANDOFF_INTERVAL = 0.25
+# Without pidfds, how often a wait on process handles wakes up to check for a stop
+STOP_CHECK_INTERVAL = 5.0
+
+log = get_logger("session_monitor")
+
+@lru_cache(maxsize=None)
+def _psutil():
+    # Imported on first use, it is only needed once a game is launched
+    import psutil
+    return psutil
+
+
+def is_process_running(process_name):
+    psutil = _psutil()
+    for proc in psutil.process_iter(['pid', 'name']):
+        name = proc.info['name']
+        if name and name.lower() == process_name.lower():
+            return True
+    return False
+
+
+def is_alive(proc):
+    psutil = _psutil()
+    try:
+        if not proc.is_running():
+            return False
+        if proc.status() == psutil.STATUS_ZOMBIE:
+            try:
+                os.waitpid(proc.pid, os.WNOHANG)  # Reap it if we spawned it
+            except ChildProcessError:
+                pass
+            return False
+        return True
+    except psutil.NoSuchProcess:
+        return False
+
+
+def wait_for_exit(procs, timeout=None, stop=None):
+    # Blocks until one of the processes exits, stop is set or the timeout (None for
+    # no timeout) passes, without polling. Linux selects on a pidfd per process and
+    # on stop; elsewhere psutil waits on the process handles (WaitForSingleObject on
+    # Windows), waking up every STOP_CHECK_INTERVAL to look at stop.
+    psutil = _psutil()
+    if hasattr(os, "pidfd_open"):
+        fds = []
+        try:
+            for proc in procs:
+                try:
+                    fds.append(os.pidfd_open(proc.pid))
+                except OSError:
+                    return  # Already gone
+            select.select(fds + ([stop.fileno()] if stop else []), [], [], timeout)
+        finally:
+            for fd in fds:
+                os.close(fd)
+        return
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while not (stop and stop.is_set()):
+        interval = STOP_CHECK_INTERVAL if deadline is None else min(STOP_CHECK_INTERVAL, deadline - time.monotonic())
+        if interval <= 0:
+            return
+        gone, _ = psutil.wait_procs(procs, timeout=interval)
+        if gone:
+            return
+
+
+class StopSignal:
+    # A threading.Event that select() can wait on next to the pidfds
+    def __init__(self):
+        self.event = threading.Event()
+        self.read_fd, self.write_fd = os.pipe()
+
+    def set(self):
+        if not self.event.is_set():
+            self.event.set()
+            os.write(self.write_fd, b"\0")
+
+    def is_set(self):
+        return self.event.is_set()
+
+    def wait(self, timeout=None):
+        return self.event.wait(timeout)
+
+    def fileno(self):
+        return self.read_fd
+
+    def close(self):
+        os.close(self.read_fd)
+        os.close(self.write_fd)
+
+
+class ProcessTree:
+    # The spawned process plus every descendant seen while it was running.
+    # known_pids remembers processes that have exited too, so a game whose
+    # launcher stub has already gone can still be traced back to it.
+    def __init__(self, pid, process_name, launched_at):
+        self.process_name = process_name.lower()
+        self.launched_at = launched_at
+        self.processes = {}
+        self.known_pids = {pid}
+        psutil = _psutil()
+        try:
+            self.processes[pid] = psutil.Process(pid)
+        except psutil.NoSuchProcess:
+            pass
+
+    def collect_children(self):
+        psutil = _psutil()
+        for proc in list(self.processes.values()):
+            try:
+                for child in proc.children(recursive=True):
+                    self.processes.setdefault(child.pid, child)
+                    self.known_pids.add(child.pid)
+            except psutil.NoSuchProcess:
+                pass
+
+    def refresh(self):
+        self.collect_children()
+        self.processes = {pid: proc for pid, proc in self.processes.items() if is_alive(proc)}
+        if not self.processes:
+            self.adopt_handoff()
+            self.collect_children()
+        return bool(self.processes)
+
+    def adopt_handoff(self):
+        # A stub that exits before we saw its child leaves the game orphaned. Pick up
+        # anything started after our launch whose parent was part of the tree (or, where
+        # orphans are reparented, that has the launched exe's name), and its descendants.
+        psutil = _psutil()
+        candidates = []
+        for proc in psutil.process_iter(['pid', 'ppid', 'name', 'create_time']):
+            if (proc.info['create_time'] or 0) >= self.launched_at - 1:
+                candidates.append(proc)
+        candidates.sort(key=lambda proc: proc.info['create_time'])
+        for proc in candidates:  # Oldest first, so a parent is adopted before its children
+            name = proc.info['name']
+            if proc.info['ppid'] in self.known_pids or (name and name.lower() == self.process_name):
+                if is_alive(proc):
+                    self.processes[proc.pid] = proc
+                    self.known_pids.add(proc.pid)
+
+    def wait(self, timeout=None, stop=None):
+        # Blocks until a process of the tree exits, stop is set or the timeout passes.
+        # refresh() looks for new children afterwards.
+        wait_for_exit(list(self.processes.values()), timeout, stop)
+
+
+class GameSessionMonitor(QObject):
+    # Tracks launched games on background threads, one per running game.
+    # The signals are delivered to the GUI thread by Qt's queued connections.
+    session_started = pyqtSignal(str)
+    session_ended = pyqtSignal(str, float)
+
+    def __init__(self, poll_interval=5.0, startup_timeout=60.0, parent=None):
+        super().__init__(parent)
+        self.poll_interval = poll_interval
+        self.startup_timeout = startup_timeout
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def is_running(self, game_name):
+        with self.lock:
+            return game_name in self.sessions
+
+    def running_games(self):
+        with self.lock:
+            return list(self.sessions)
+
+    def track(self, game_name, process_name, pid=None):
+        # With a pid the process tree is waited on directly, otherwise processes are matched by name
+        with self.lock:
+            if game_name in self.sessions:
+                log.info("Already monitoring %s", game_name)
+                return False
+            stop_event = StopSignal()
+            thread = threading.Thread(target=self.run, args=(game_name, process_name, pid, stop_event), daemon=True)
+            self.sessions[game_name] = stop_event
+        thread.start()
+        return True
+
+    def run(self, game_name, process_name, pid, stop_event):
+        log.info("Monitoring process: %s (pid %s)", process_name, pid)
+        launched_at = time.time()
+        started = time.monotonic()
+        duration = None
+        try:
+            if pid is None:
+                finished = self.wait_by_name(game_name, process_name, started, stop_event)
+            else:
+                finished = self.wait_by_pid(game_name, ProcessTree(pid, process_name, launched_at), started, stop_event)
+            if finished is None:
+                duration = 0.0  # Never ran, close the session the launch opened
+            elif finished:
+                log.info("%s has stopped running", process_name)
+                duration = time.monotonic() - started
+        except Exception as e:
+            log.warning("Error while monitoring process: %s", e)
+        finally:
+            with self.lock:
+                self.sessions.pop(game_name, None)
+            stop_event.close()  # stop_all() only reaches sessions still listed
+        # Emitted after the session is dropped so slots see an up to date running list
+        if duration is not None:
+            self.session_ended.emit(game_name, duration)
+
+    # The wait_by_* methods return True when the game exited, False when monitoring
+    # was stopped and None when the game never ran
+    def wait_by_pid(self, game_name, tree, started, stop_event):
+        if not tree.refresh():
+            log.info("%s exited immediately", tree.process_name)
+            return None
+        self.session_started.emit(game_name)
+
+        while not stop_event.is_set():
+            if time.monotonic() - started < HANDOFF_WINDOW:
+                # Children are collected before blocking, so a stub that hands off and
+                # exits during the wait doesn't take its child out of the tree
+                tree.collect_children()
+                tree.wait(HANDOFF_INTERVAL, stop_event)
+            else:
+                # Settled: the process table is only scanned again once a process exits
+                tree.wait(stop=stop_event)
+            if stop_event.is_set():
+                break
+            if not tree.refresh():
+                return True
+        return False
+
+    def wait_by_name(self, game_name, process_name, started, stop_event):
+        # The game may take a while to spawn its process after the launch
+        while not is_process_running(process_name):
+            if time.monotonic() - started > self.startup_timeout or stop_event.wait(1.0):
+                log.warning("%s never started", process_name)
+                return None
+        self.session_started.emit(game_name)
+
+        while is_process_running(process_name):
+            if stop_event.wait(self.poll_interval):
+                return False
+        return True
+
+    def stop_all(self):
+        # Called when the launcher quits
+        with self.lock:
+            for stop_event in self.sessions.values():
+                stop_event.set()
@@ -0,0 +1,143 @@
+import os
+import json
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from instrumentation import get_logger
+
+# name -> (type, default, allowed values or None). Lists hold strings.
+SETTINGS_SCHEMA = {
+    "dark_mode": (bool, False, None),
+    "show_online_games": (bool, False, None),
+    "display_style": (str, "grid", ("grid", "horizontal")),
+    "selected_directories": (list, [], None),
+    "current_directory": (str, "", None),
+    "source_precedence": (list, [], None),  # Directories whose shortcuts win over duplicates elsewhere
+}
+
+SAVE_DELAY_MS = 500
+
+log = get_logger("settings_store")
+
+
+def validate_setting(name, value):
+    # Returns the value if it fits the schema, raises ValueError otherwise
+    if name not in SETTINGS_SCHEMA:
+        return value  # Unknown keys are kept as they are
+    expected_type, _, allowed = SETTINGS_SCHEMA[name]
+    if not isinstance(value, expected_type):
+        raise ValueError(f"{name} must be a {expected_type.__name__}, got {value!r}")
+    if expected_type is list and not all(isinstance(item, str) for item in value):
+        raise ValueError(f"{name} must only contain strings, got {value!r}")
+    if allowed is not None and value not in allowed:
+        raise ValueError(f"{name} must be one of {', '.join(allowed)}, got {value!r}")
+    return value
+
+
+class SettingsStore(QObject):
+    # The one place settings live. Loaded once and held in memory; set()/update()
+    # validate, notify listeners with the changed keys and save a moment later in
+    # one atomic write. Keys missing from the settings file are filled in from the
+    # legacy files, so settings2.json from older versions is merged on first load.
+    setting_changed = pyqtSignal(str, object)
+    settings_changed = pyqtSignal(dict)  # Every key changed by one set()/update()
+
+    def __init__(self, path="settings.json", legacy_paths=("settings2.json",), defaults=None, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.legacy_paths = legacy_paths
+        self.defaults = {name: default for name, (_, default, _) in SETTINGS_SCHEMA.items()}
+        self.defaults.update(defaults or {})
+        self.values = {}
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(SAVE_DELAY_MS)
+        self.save_timer.timeout.connect(self.save)
+        self.load()
+
+    @staticmethod
+    def read_file(path):
+        try:
+            with open(path, "r") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            log.warning("Could not read settings from %s: %s", path, e)
+            return {}
+        if not isinstance(data, dict):
+            log.warning("Ignoring settings in %s: not a JSON object", path)
+            return {}
+        return data
+
+    def load(self):
+        values = self.read_file(self.path)
+        merged = False
+        for legacy_path in self.legacy_paths:
+            for name, value in self.read_file(legacy_path).items():
+                if name not in values:
+                    values[name] = value
+                    merged = True
+
+        self.values = {}
+        for name, value in values.items():
+            try:
+                self.values[name] = validate_setting(name, value)
+            except ValueError as e:
+                log.warning("Invalid setting, using the default: %s", e)
+        log.debug("Loaded settings: %s", self.values)
+        if merged:
+            self.schedule_save()  # Write the merged legacy settings to the settings file
+
+    def get(self, name):
+        value = self.values.get(name, self.defaults.get(name))
+        return list(value) if isinstance(value, list) else value
+
+    def set(self, name, value):
+        self.update({name: value})
+
+    def update(self, values):
+        # Validated as a whole first, an invalid value leaves every setting as it was
+        values = {name: validate_setting(name, value) for name, value in values.items()}
+        changes = {}
+        stored = False
+        for name, value in values.items():
+            current = self.get(name)
+            if name in self.values and current == value:
+                continue
+            self.values[name] = list(value) if isinstance(value, list) else value
+            stored = True
+            if current != value:
+                changes[name] = value
+        if not stored:
+            return
+        self.schedule_save()
+        if changes:
+            for name, value in changes.items():
+                self.setting_changed.emit(name, value)
+            self.settings_changed.emit(changes)
+
+    def schedule_save(self):
+        # Debounced: a burst of changes ends up in a single write
+        self.save_timer.start()
+
+    def save(self):
+        self.save_timer.stop()
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, "w") as file:
+                json.dump(self.values, file, indent=4)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            # Runs from a timer slot, an exception here would abort the launcher
+            log.warning("Could not save settings to %s: %s", self.path, e)
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+        log.debug("Saved settings: %s", self.values)
+
+    def flush(self):
+        if self.save_timer.isActive():
+            self.save()
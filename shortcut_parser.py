@@ -0,0 +1,295 @@
+import os
+import struct
+import threading
+import configparser
+
+from instrumentation import get_logger
+
+# Native readers for Windows shortcuts, following the [MS-SHLLINK] spec for .lnk
+# files and the [InternetShortcut] INI layout for .url files. No COM is needed,
+# so they work on any platform and from worker threads.
+
+LINK_HEADER_SIZE = 0x4C
+LINK_CLSID = bytes.fromhex("0114020000000000c000000000000046")
+
+# LinkFlags
+HAS_LINK_TARGET_ID_LIST = 0x00000001
+HAS_LINK_INFO = 0x00000002
+HAS_NAME = 0x00000004
+HAS_RELATIVE_PATH = 0x00000008
+HAS_WORKING_DIR = 0x00000010
+HAS_ARGUMENTS = 0x00000020
+HAS_ICON_LOCATION = 0x00000040
+IS_UNICODE = 0x00000080
+HAS_EXP_STRING = 0x00000200
+
+# LinkInfoFlags
+VOLUME_ID_AND_LOCAL_BASE_PATH = 0x1
+COMMON_NETWORK_RELATIVE_LINK_AND_PATH_SUFFIX = 0x2
+
+ENVIRONMENT_VARIABLE_DATA_BLOCK = 0xA0000001
+FILE_ENTRY_EXTENSION = 0xBEEF0004
+
+ANSI_CODEPAGE = "mbcs" if os.name == "nt" else "cp1252"
+
+log = get_logger("shortcut_parser")
+
+
+class ShortcutError(ValueError):
+    pass
+
+
+def read_c_string(data, offset, unicode=False):
+    if unicode:
+        end = offset
+        while end + 1 < len(data) and data[end:end + 2] != b"\0\0":
+            end += 2
+        return data[offset:end].decode("utf-16-le", errors="replace")
+    end = data.find(b"\0", offset)
+    if end == -1:
+        end = len(data)
+    return data[offset:end].decode(ANSI_CODEPAGE, errors="replace")
+
+
+def parse_link_info(data, offset):
+    size, header_size, flags = struct.unpack_from("<III", data, offset)
+    volume_id_offset, base_path_offset, network_offset, suffix_offset = struct.unpack_from("<IIII", data, offset + 12)
+    base_path_unicode_offset = suffix_unicode_offset = 0
+    if header_size >= 0x24:
+        base_path_unicode_offset, suffix_unicode_offset = struct.unpack_from("<II", data, offset + 28)
+
+    if suffix_unicode_offset:
+        suffix = read_c_string(data, offset + suffix_unicode_offset, unicode=True)
+    else:
+        suffix = read_c_string(data, offset + suffix_offset)
+
+    if flags & VOLUME_ID_AND_LOCAL_BASE_PATH:
+        if base_path_unicode_offset:
+            base_path = read_c_string(data, offset + base_path_unicode_offset, unicode=True)
+        else:
+            base_path = read_c_string(data, offset + base_path_offset)
+        return base_path + suffix
+
+    if flags & COMMON_NETWORK_RELATIVE_LINK_AND_PATH_SUFFIX:
+        start = offset + network_offset
+        net_name_offset, = struct.unpack_from("<I", data, start + 8)
+        if net_name_offset > 0x14:
+            net_name_unicode_offset, = struct.unpack_from("<I", data, start + 20)
+            net_name = read_c_string(data, start + net_name_unicode_offset, unicode=True)
+        else:
+            net_name = read_c_string(data, start + net_name_offset)
+        return f"{net_name}\\{suffix}" if suffix else net_name
+
+    return None
+
+
+def parse_id_list(data, offset, end):
+    # Rebuilds a path from volume and file entry shell items. Only used when a
+    # shortcut carries no LinkInfo structure.
+    parts = []
+    while offset + 2 <= end:
+        item_size, = struct.unpack_from("<H", data, offset)
+        if item_size == 0:
+            break
+        item = data[offset:offset + item_size]
+        offset += item_size
+        if len(item) < 3:
+            continue
+
+        item_type = item[2] & 0x70
+        if item_type == 0x20:  # Volume
+            parts.append(read_c_string(item, 3).rstrip("\\"))
+        elif item_type == 0x30:  # File entry
+            name = read_c_string(item, 14, unicode=bool(item[2] & 0x04))
+            extension_offset, = struct.unpack_from("<H", item, item_size - 2)
+            if 14 < extension_offset < item_size - 8:
+                long_name = parse_file_entry_extension(item, extension_offset)
+                if long_name:
+                    name = long_name
+            parts.append(name)
+
+    if not parts or not parts[0].endswith(":"):
+        return None
+    return "\\".join(parts)
+
+
+def parse_file_entry_extension(item, offset):
+    version, signature = struct.unpack_from("<HI", item, offset + 2)
+    if signature != FILE_ENTRY_EXTENSION:
+        return None
+    name_offset = offset + 18
+    if version >= 7:
+        name_offset += 18
+    if version >= 3:
+        name_offset += 2
+    if version >= 9:
+        name_offset += 4
+    if version >= 8:
+        name_offset += 4
+    return read_c_string(item, name_offset, unicode=True) or None
+
+
+def parse_lnk(data):
+    # Returns a dict with the target path and the other string data of a .lnk file
+    if len(data) < LINK_HEADER_SIZE or struct.unpack_from("<I", data, 0)[0] != LINK_HEADER_SIZE:
+        raise ShortcutError("Not a shell link file")
+    if data[4:20] != LINK_CLSID:
+        raise ShortcutError("Unknown shell link CLSID")
+
+    flags, = struct.unpack_from("<I", data, 20)
+    unicode = bool(flags & IS_UNICODE)
+    offset = LINK_HEADER_SIZE
+    link = {"target": None, "id_list_target": None, "name": None, "relative_path": None,
+            "working_dir": None, "arguments": None, "icon_location": None}
+
+    try:
+        if flags & HAS_LINK_TARGET_ID_LIST:
+            id_list_size, = struct.unpack_from("<H", data, offset)
+            link["id_list_target"] = parse_id_list(data, offset + 2, offset + 2 + id_list_size)
+            offset += 2 + id_list_size
+
+        if flags & HAS_LINK_INFO:
+            link_info_size, = struct.unpack_from("<I", data, offset)
+            link["target"] = parse_link_info(data, offset)
+            offset += link_info_size
+
+        for flag, key in ((HAS_NAME, "name"), (HAS_RELATIVE_PATH, "relative_path"),
+                          (HAS_WORKING_DIR, "working_dir"), (HAS_ARGUMENTS, "arguments"),
+                          (HAS_ICON_LOCATION, "icon_location")):
+            if not flags & flag:
+                continue
+            count, = struct.unpack_from("<H", data, offset)
+            offset += 2
+            if unicode:
+                link[key] = data[offset:offset + count * 2].decode("utf-16-le", errors="replace")
+                offset += count * 2
+            else:
+                link[key] = data[offset:offset + count].decode(ANSI_CODEPAGE, errors="replace")
+                offset += count
+
+        while offset + 8 <= len(data):
+            block_size, signature = struct.unpack_from("<II", data, offset)
+            if block_size < 4:
+                break
+            if signature == ENVIRONMENT_VARIABLE_DATA_BLOCK and flags & HAS_EXP_STRING:
+                target = read_c_string(data, offset + 268, unicode=True) or read_c_string(data, offset + 8)
+                if target:
+                    link["target"] = os.path.expandvars(target)
+            offset += block_size
+    except struct.error as e:
+        raise ShortcutError(f"Truncated shell link file: {e}")
+
+    if not link["target"]:
+        link["target"] = link["id_list_target"]
+    return link
+
+
+def parse_url(data):
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        text = data.decode("cp1252", errors="replace")
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    try:
+        parser.read_string(text)
+    except configparser.Error as e:
+        raise ShortcutError(f"Invalid internet shortcut: {e}")
+    if not parser.has_option("InternetShortcut", "URL"):
+        raise ShortcutError("Internet shortcut has no URL")
+    return parser.get("InternetShortcut", "URL").strip()
+
+
+def read_shortcut(shortcut_path):
+    # (target, arguments); launchers such as Battle.net tell their games apart by the arguments
+    with open(shortcut_path, "rb") as file:
+        data = file.read()
+    if shortcut_path.lower().endswith(".url"):
+        return parse_url(data), None
+
+    link = parse_lnk(data)
+    target = link["target"]
+    if not target and link["relative_path"]:
+        target = os.path.normpath(os.path.join(os.path.dirname(shortcut_path), link["relative_path"]))
+    return target, link["arguments"]
+
+
+def read_shortcut_target(shortcut_path):
+    return read_shortcut(shortcut_path)[0]
+
+
+def read_shortcut_with_shell(shortcut_path):
+    # Last resort for exotic shortcuts (e.g. shell namespace targets) on Windows
+    if os.name != "nt":
+        return None, None
+    try:
+        import pythoncom
+        import win32com.client
+    except ImportError:
+        return None, None
+    # COM is initialized per thread and the library resolver gets here from its
+    # workers. On a thread that already has COM this only adds a reference.
+    pythoncom.CoInitialize()
+    try:
+        shell = win32com.client.Dispatch("WScript.Shell")
+        link = shell.CreateShortcut(os.path.abspath(shortcut_path))
+        return link.Targetpath or None, link.Arguments or None
+    finally:
+        pythoncom.CoUninitialize()
+
+
+class ShortcutCache:
+    # Resolved targets and arguments keyed by (path, mtime, size), safe to share between threads
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, shortcut_path):
+        return self.read(shortcut_path)[0]
+
+    def read(self, shortcut_path):
+        stat = os.stat(shortcut_path)
+        key = (stat.st_mtime, stat.st_size)
+        with self.lock:
+            cached = self.entries.get(shortcut_path)
+            if cached and cached[0] == key:
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        try:
+            shortcut = read_shortcut(shortcut_path)
+        except ShortcutError as e:
+            log.warning("Could not parse shortcut %s: %s", shortcut_path, e)
+            shortcut = None, None
+        if not shortcut[0]:
+            shortcut = read_shortcut_with_shell(shortcut_path)
+
+        with self.lock:
+            self.entries[shortcut_path] = (key, shortcut)
+        return shortcut
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+shortcut_cache = ShortcutCache()
+
+
+def resolve_shortcut(shortcut_path):
+    try:
+        return shortcut_cache.resolve(shortcut_path)
+    except OSError as e:
+        log.warning("Error resolving shortcut: %s", e)
+        return None
+
+
+def read_cached_shortcut(shortcut_path):
+    # (target, arguments) like resolve_shortcut, or (None, None)
+    try:
+        return shortcut_cache.read(shortcut_path)
+    except OSError as e:
+        log.warning("Error resolving shortcut: %s", e)
+        return None, None
@@ -0,0 +1,71 @@
+import time
+
+PROCESS_START = time.perf_counter()  # Imported first by the GUIs, so this is close to interpreter start
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt, QObject, QEvent, QTimer
+
+from instrumentation import get_logger
+
+log = get_logger("startup")
+
+
+class StartupTimer:
+    # Wall clock time spent in each startup phase, a phase lasts until the next begins
+    def __init__(self, started=PROCESS_START):
+        self.phase = "Imports"
+        self.phase_started = started
+        self.started = started
+        self.phases = []
+
+    def begin(self, phase):
+        now = time.perf_counter()
+        self.phases.append((self.phase, (now - self.phase_started) * 1000))
+        self.phase = phase
+        self.phase_started = now
+
+    def report(self):
+        total = sum(elapsed for _, elapsed in self.phases)
+        lines = [f"Startup took {total:.0f} ms"]
+        lines += [f"  {phase:<28} {elapsed:8.1f} ms" for phase, elapsed in self.phases]
+        return "\n".join(lines)
+
+
+class FirstFrameWatcher(QObject):
+    # Calls back once, right after the widget has painted for the first time
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.widget = widget
+        self.callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self.widget and event.type() == QEvent.Paint:
+            self.widget.removeEventFilter(self)
+            QTimer.singleShot(0, self.callback)  # Runs once the paint has finished
+        return False
+
+
+def start_with_splash(splash, create_window):
+    # Builds the main window while the splash is up and closes the splash as soon as
+    # the window's first frame is on screen. create_window gets a progress callback
+    # that starts a new timed phase and shows its name on the splash.
+    timer = StartupTimer()
+
+    def progress(message):
+        timer.begin(message)
+        splash.showMessage(message, Qt.AlignBottom | Qt.AlignHCenter, Qt.white)
+        QApplication.processEvents()
+
+    progress("Starting")
+    window = create_window(progress)
+    timer.begin("First frame")
+
+    def on_first_frame():
+        splash.finish(window)
+        timer.begin(None)
+        log.info("%s", timer.report())
+
+    FirstFrameWatcher(window, on_first_frame)
+    window.show()
+    return window
@@ -0,0 +1,86 @@
+import os
+import sys
+import struct
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from shortcut_parser import (
+    LINK_HEADER_SIZE, LINK_CLSID, HAS_LINK_INFO, HAS_WORKING_DIR, HAS_ARGUMENTS, IS_UNICODE, HAS_EXP_STRING,
+    VOLUME_ID_AND_LOCAL_BASE_PATH, ENVIRONMENT_VARIABLE_DATA_BLOCK
+)
+
+# Writes the shortcuts in tests/fixtures/shortcuts, laid out as in [MS-SHLLINK].
+# Windows doesn't need to be around to build them; run it again after changing one.
+
+SHORTCUTS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shortcuts")
+FILE_ATTRIBUTE_ARCHIVE = 0x20
+SW_SHOWNORMAL = 1
+DRIVE_FIXED = 3
+
+LOCAL_DIRECTORY = "C:\\Games\\Local Game"
+LOCAL_TARGET = f"{LOCAL_DIRECTORY}\\LocalGame.exe"
+ENVIRONMENT_TARGET = "%GAMELAUNCHER_GAMES%\\Ünïcödé Gämé\\游戏.exe"
+STEAM_URL = "steam://rungameid/730"
+
+
+def link_header(flags):
+    return (struct.pack("<I", LINK_HEADER_SIZE) + LINK_CLSID
+            + struct.pack("<II", flags, FILE_ATTRIBUTE_ARCHIVE)
+            + bytes(24)  # Creation, access and write times
+            + struct.pack("<IiIHHII", 0, 0, SW_SHOWNORMAL, 0, 0, 0, 0))
+
+
+def string_data(text):
+    # A counted UTF-16 StringData structure
+    encoded = text.encode("utf-16-le")
+    return struct.pack("<H", len(encoded) // 2) + encoded
+
+
+def link_info(local_base_path):
+    # LinkInfo with a VolumeID and an ANSI local base path, the form written for local drives
+    header_size = 0x1C
+    volume_id = struct.pack("<IIII", 0x11, DRIVE_FIXED, 0x1234ABCD, 0x10) + b"\0"  # Empty volume label
+    base_path = local_base_path.encode("cp1252") + b"\0"
+    suffix = b"\0"
+    volume_id_offset = header_size
+    base_path_offset = volume_id_offset + len(volume_id)
+    suffix_offset = base_path_offset + len(base_path)
+    body = volume_id + base_path + suffix
+    return struct.pack("<IIIIIII", header_size + len(body), header_size, VOLUME_ID_AND_LOCAL_BASE_PATH,
+                       volume_id_offset, base_path_offset, 0, suffix_offset) + body
+
+
+def environment_block(target):
+    # EnvironmentVariableDataBlock: the ANSI target (lossy) and the UTF-16 one
+    ansi = target.encode("cp1252", errors="replace")[:259].ljust(260, b"\0")
+    unicode = target.encode("utf-16-le")[:518].ljust(520, b"\0")
+    return struct.pack("<II", 8 + 260 + 520, ENVIRONMENT_VARIABLE_DATA_BLOCK) + ansi + unicode
+
+
+TERMINAL_BLOCK = bytes(4)
+
+SHORTCUTS = {
+    "Local Game.lnk": (link_header(HAS_LINK_INFO | HAS_WORKING_DIR | IS_UNICODE)
+                       + link_info(LOCAL_TARGET)
+                       + string_data(LOCAL_DIRECTORY)
+                       + TERMINAL_BLOCK),
+    "Ünïcödé Gämé.lnk": (link_header(HAS_ARGUMENTS | IS_UNICODE | HAS_EXP_STRING)
+                         + string_data("-windowed")
+                         + environment_block(ENVIRONMENT_TARGET)
+                         + TERMINAL_BLOCK),
+    "Steam Game.url": ("[{000214A0-0000-0000-C000-000000000046}]\r\nProp3=19,0\r\n"
+                       f"[InternetShortcut]\r\nIDList=\r\nIconIndex=0\r\nURL={STEAM_URL}\r\n"
+                       "IconFile=C:\\Program Files (x86)\\Steam\\steam\\games\\730.ico\r\n").encode("utf-8"),
+}
+
+
+def write_shortcuts(directory=SHORTCUTS_DIRECTORY):
+    os.makedirs(directory, exist_ok=True)
+    for name, data in SHORTCUTS.items():
+        with open(os.path.join(directory, name), "wb") as file:
+            file.write(data)
+
+
+if __name__ == "__main__":
+    write_shortcuts()
+    print(f"Wrote {len(SHORTCUTS)} shortcuts to {SHORTCUTS_DIRECTORY}")
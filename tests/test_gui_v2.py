@@ -0,0 +1,62 @@
+import os
+import sys
+import json
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+from gui_v2 import GameLauncherApp
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def slot_errors(monkeypatch):
+    # PyQt aborts on an exception raised in a slot unless sys.excepthook is replaced
+    errors = []
+    monkeypatch.setattr(sys, "excepthook", lambda kind, value, traceback: errors.append(value))
+    return errors
+
+
+@pytest.fixture
+def launcher(app, tmp_path, monkeypatch):
+    # A launcher whose files all live in a temporary directory, with one game whose
+    # .url shortcut points at an existing file
+    games = tmp_path / "games"
+    games.mkdir()
+    executable = tmp_path / "Test Game.exe"
+    executable.write_bytes(b"")
+    (games / "Test Game.url").write_text(f"[InternetShortcut]\nURL={executable}\n")
+    (tmp_path / "settings.json").write_text(json.dumps({"selected_directories": [str(games)]}))
+    monkeypatch.chdir(tmp_path)
+    window = GameLauncherApp()
+    yield window
+    window.session_monitor.stop_all()
+    window.tracker.flush()
+    window.deleteLater()
+    app.processEvents()
+
+
+def test_launch_button_without_selection(launcher, slot_errors):
+    launcher.selected_game = None
+    QTest.mouseClick(launcher.launch_button, Qt.LeftButton)
+    assert slot_errors == []
+
+
+def test_launch_button_starts_the_selected_game(launcher, slot_errors, monkeypatch):
+    started = []
+    monkeypatch.setattr(launcher, "start_game_process", lambda target_path: started.append(target_path))
+    monkeypatch.setattr(launcher, "monitor_game_execution", lambda *args: None)
+    launcher.selected_game = "Test Game"
+    QTest.mouseClick(launcher.launch_button, Qt.LeftButton)
+    assert slot_errors == []
+    assert [os.path.basename(path) for path in started] == ["Test Game.exe"]
@@ -0,0 +1,41 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library_dedup import LibraryGames, target_key
+
+BATTLE_NET = os.path.join("Battle.net", "Battle.net.exe")
+
+
+def shortcut(directory, name, target=None, arguments=None):
+    return {"name": name, "path": os.path.join(directory, f"{name}.lnk"), "target": target, "arguments": arguments}
+
+
+def test_launcher_shortcuts_in_different_directories_stay_apart():
+    games = LibraryGames()
+    names = games.build([
+        ("Desktop", [shortcut("Desktop", "WoW", BATTLE_NET, '--exec="launch WoW"')]),
+        ("Start Menu", [shortcut("Start Menu", "Overwatch", BATTLE_NET, '--exec="launch Pro"'),
+                        shortcut("Start Menu", "World of Warcraft", BATTLE_NET, '--exec="launch  WoW"')]),
+    ])
+    assert names == ["Overwatch", "WoW"]
+    assert games.shortcuts("WoW") == [os.path.join("Desktop", "WoW.lnk"), os.path.join("Start Menu", "World of Warcraft.lnk")]
+
+
+def test_resolved_target_merges_into_the_game_with_that_target():
+    games = LibraryGames()
+    games.build([("Games", [shortcut("Games", "Doom"), shortcut("Games", "DOOM 1993")])])
+    doom, classic = os.path.join("Games", "Doom.lnk"), os.path.join("Games", "DOOM 1993.lnk")
+    assert games.set_target(doom, target_key("doom.exe")) is None
+    assert games.set_target(classic, target_key("doom.exe")) == (("DOOM 1993", True, None), ("Doom", False))
+    assert games.shortcuts("Doom") == [doom, classic]
+    assert "DOOM 1993" not in games
+
+
+def test_rewritten_shortcut_leaves_the_game_it_joined_by_target():
+    games = LibraryGames()
+    games.build([("Games", [shortcut("Games", "Doom", "doom.exe"), shortcut("Games", "DOOM 1993", "doom.exe")])])
+    classic = os.path.join("Games", "DOOM 1993.lnk")
+    assert games.set_target(classic, target_key("doom1993.exe")) == (("Doom", False, None), ("DOOM 1993", True))
+    assert games.shortcuts("DOOM 1993") == [classic]
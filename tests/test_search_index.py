@@ -0,0 +1,72 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SHORT_QUERY_CANDIDATES, SearchIndex, normalize
+
+NAMES = [
+    "Assassin's Creed Origins",
+    "Assassin's Creed Odyssey",
+    "Age of Empires II",
+    "Ori and the Blind Forest",
+    "Battlefield™ 2042",
+    "Battlefield 1",
+    "Pokémon Légendes: Arceus",
+    "The Witcher 3: Wild Hunt",
+    "Left4Dead 2",
+]
+
+
+def test_normalize_drops_symbols_and_diacritics():
+    assert normalize("Battlefield™ 2042") == ["battlefield", "2042"]
+    assert normalize("Pokémon Légendes: Arceus") == ["pokemon", "legendes", "arceus"]
+    assert normalize("Assassin's Creed®") == ["assassins", "creed"]
+
+
+def test_normalize_splits_digit_runs():
+    assert normalize("bf2042") == ["bf", "2042"]
+    assert normalize("Left4Dead 2") == ["left", "4", "dead", "2"]
+
+
+def test_acronym_query():
+    assert SearchIndex(NAMES).search("ac origins") == ["Assassin's Creed Origins"]
+
+
+def test_abbreviation_with_digit_run():
+    assert SearchIndex(NAMES).search("bf2042") == ["Battlefield™ 2042"]
+
+
+def test_symbols_and_diacritics_in_the_query():
+    index = SearchIndex(NAMES)
+    assert index.search("Battlefield™ 2042") == ["Battlefield™ 2042"]
+    assert index.search("pokemon legendes") == ["Pokémon Légendes: Arceus"]
+
+
+def test_exact_word_ranks_above_prefix_and_acronym():
+    results = SearchIndex(NAMES).search("ori")
+    assert results[0] == "Ori and the Blind Forest"
+    assert "Assassin's Creed Origins" in results
+
+
+def test_typo():
+    assert SearchIndex(NAMES).search("witchr 3") == ["The Witcher 3: Wild Hunt"]
+
+
+def test_empty_query():
+    assert SearchIndex(NAMES).search("™ ") is None
+
+
+def test_single_character_scan_is_capped():
+    names = [f"Game {number}" for number in range(SHORT_QUERY_CANDIDATES * 2)] + ["G"]
+    results = SearchIndex(names).search("g")
+    assert len(results) == SHORT_QUERY_CANDIDATES
+    assert results[0] == "G"
+
+
+def test_add_and_remove():
+    index = SearchIndex(NAMES)
+    index.remove("Battlefield™ 2042")
+    assert index.search("bf2042") == []
+    index.add("Battlefield™ 2042")
+    assert index.search("bf2042") == ["Battlefield™ 2042"]
@@ -0,0 +1,105 @@
+import os
+import sys
+import json
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+
+from settings_store import SettingsStore
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def settings_path(tmp_path):
+    return tmp_path / "settings.json"
+
+
+@pytest.fixture
+def store(app, settings_path, tmp_path):
+    store = SettingsStore(str(settings_path), legacy_paths=(str(tmp_path / "settings2.json"),))
+    store.notified = []
+    store.settings_changed.connect(store.notified.append)
+    return store
+
+
+def saved(settings_path):
+    with open(settings_path) as file:
+        return json.load(file)
+
+
+@pytest.mark.parametrize("name, value", [
+    ("dark_mode", "yes"),
+    ("dark_mode", 1),
+    ("display_style", None),
+    ("selected_directories", "C:/Games"),
+    ("selected_directories", ["C:/Games", 3]),
+])
+def test_bad_types_are_rejected(store, name, value):
+    before = store.get(name)
+    with pytest.raises(ValueError):
+        store.set(name, value)
+    assert store.get(name) == before
+    assert store.notified == []
+
+
+def test_out_of_range_value_is_rejected(store):
+    with pytest.raises(ValueError):
+        store.set("display_style", "list")
+    assert store.get("display_style") == "grid"
+
+
+def test_invalid_update_changes_nothing(store):
+    with pytest.raises(ValueError):
+        store.update({"dark_mode": True, "display_style": "list"})
+    assert store.get("dark_mode") is False
+    assert store.notified == []
+
+
+def test_unknown_keys_are_kept(store, settings_path):
+    store.set("window_layout", {"width": 800})
+    store.flush()
+    assert saved(settings_path)["window_layout"] == {"width": 800}
+    assert store.notified == [{"window_layout": {"width": 800}}]
+
+
+def test_invalid_values_in_the_file_fall_back_to_defaults(app, settings_path):
+    settings_path.write_text(json.dumps({"dark_mode": "on", "display_style": "list", "show_online_games": True}))
+    store = SettingsStore(str(settings_path), legacy_paths=())
+    assert store.get("dark_mode") is False
+    assert store.get("display_style") == "grid"
+    assert store.get("show_online_games") is True
+
+
+def test_listeners_only_hear_real_changes(store):
+    changed = []
+    store.setting_changed.connect(lambda name, value: changed.append((name, value)))
+    store.set("dark_mode", False)  # The default: stored, but nothing changed
+    store.set("dark_mode", True)
+    store.set("dark_mode", True)
+    store.update({"dark_mode": True, "display_style": "horizontal", "selected_directories": ["C:/Games"]})
+    store.set("selected_directories", ["C:/Games"])
+    assert store.notified == [{"dark_mode": True},
+                              {"display_style": "horizontal", "selected_directories": ["C:/Games"]}]
+    assert changed == [("dark_mode", True), ("display_style", "horizontal"), ("selected_directories", ["C:/Games"])]
+
+
+def test_changes_are_saved_in_one_write(store, settings_path):
+    store.set("dark_mode", True)
+    store.set("display_style", "horizontal")
+    assert not settings_path.exists()
+    store.flush()
+    assert saved(settings_path) == {"dark_mode": True, "display_style": "horizontal"}
+
+
+def test_returned_lists_are_copies(store):
+    store.set("selected_directories", ["C:/Games"])
+    store.get("selected_directories").append("D:/Games")
+    assert store.get("selected_directories") == ["C:/Games"]
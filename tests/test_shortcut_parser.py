@@ -0,0 +1,52 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shortcut_parser import parse_lnk, resolve_shortcut, shortcut_cache
+
+SHORTCUTS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "shortcuts")
+
+
+def shortcut(name):
+    return os.path.join(SHORTCUTS_DIRECTORY, name)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    shortcut_cache.clear()
+    yield
+    shortcut_cache.clear()
+
+
+def test_link_info_local_path():
+    assert resolve_shortcut(shortcut("Local Game.lnk")) == "C:\\Games\\Local Game\\LocalGame.exe"
+    with open(shortcut("Local Game.lnk"), "rb") as file:
+        assert parse_lnk(file.read())["working_dir"] == "C:\\Games\\Local Game"
+
+
+def test_environment_variable_unicode_target(monkeypatch):
+    monkeypatch.setenv("GAMELAUNCHER_GAMES", "D:\\Games")
+    target = resolve_shortcut(shortcut("Ünïcödé Gämé.lnk"))
+    # %VAR% is expanded where the shell would expand it, on Windows
+    assert target == os.path.expandvars("%GAMELAUNCHER_GAMES%\\Ünïcödé Gämé\\游戏.exe")
+    with open(shortcut("Ünïcödé Gämé.lnk"), "rb") as file:
+        assert parse_lnk(file.read())["arguments"] == "-windowed"
+
+
+def test_url_shortcut_with_steam_url():
+    assert resolve_shortcut(shortcut("Steam Game.url")) == "steam://rungameid/730"
+
+
+def test_resolved_targets_are_cached():
+    path = shortcut("Steam Game.url")
+    hits, misses = shortcut_cache.hits, shortcut_cache.misses
+    resolve_shortcut(path)
+    resolve_shortcut(path)
+    assert (shortcut_cache.hits - hits, shortcut_cache.misses - misses) == (1, 1)
+
+
+def test_missing_shortcut():
+    assert resolve_shortcut(shortcut("Missing Game.lnk")) is None
@@ -0,0 +1,88 @@
+import os
+import sys
+import json
+import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tracker_store import SCHEMA_VERSION, TrackerStore, format_duration, parse_duration
+
+# game_tracker.json as the launcher wrote it before the SQLite store
+TRACKER_JSON = {
+    "Long Game": {"last_played": "2024-03-01 09:15 PM", "total_played": "25:01:02", "start_time": "N/A"},
+    "Old Game": {"last_played": "2023-12-24 10:00 AM", "total_played": "1 day, 2:03:04", "start_time": "N/A"},
+    "Unplayed Game": {"last_played": "N/A", "total_played": "N/A", "start_time": "N/A"},
+    "Broken Game": {"last_played": "N/A", "total_played": "soon", "start_time": "N/A"},
+}
+
+
+@pytest.mark.parametrize("text, seconds", [
+    ("0:00:00", 0.0),
+    ("1:02:03", 3723.0),
+    ("25:01:02", 90062.0),
+    ("1 day, 2:03:04", 93784.0),
+    ("3 days, 0:00:01", 259201.0),
+    ("0:00:01.500000", 1.0),
+    ("90", 90.0),
+    ("N/A", 0.0),
+    (None, 0.0),
+])
+def test_parse_duration(text, seconds):
+    assert parse_duration(text) == seconds
+
+
+@pytest.mark.parametrize("text", ["soon", "1:2", "-1:00:00", "1 week, 0:00:00"])
+def test_parse_duration_rejects_other_text(text):
+    with pytest.raises(ValueError):
+        parse_duration(text)
+
+
+def test_format_duration_keeps_hours_past_a_day():
+    assert format_duration(parse_duration("25:01:02")) == "25:01:02"
+    assert format_duration(parse_duration("1 day, 2:03:04")) == "26:03:04"
+
+
+@pytest.fixture
+def migrated(tmp_path):
+    json_path = tmp_path / "game_tracker.json"
+    json_path.write_text(json.dumps(TRACKER_JSON))
+    store = TrackerStore(str(tmp_path / "game_tracker.db"), str(json_path))
+    yield store
+    store.close()
+
+
+def test_json_migration_totals(migrated):
+    games = migrated.all_games()
+    assert {name: game["total_seconds"] for name, game in games.items()} == {
+        "Long Game": 90062.0, "Old Game": 93784.0, "Unplayed Game": 0.0, "Broken Game": 0.0}
+    assert games["Long Game"]["last_played"] == "2024-03-01 09:15 PM"
+    assert games["Unplayed Game"]["last_played"] is None
+    assert games["Long Game"]["start_time"] is None
+    # The old file had no session history
+    assert migrated.sessions("Long Game") == []
+
+
+def test_sessions_after_migration(migrated):
+    started = datetime.datetime(2024, 3, 2, 23, 30)
+    migrated.start_session("Long Game", started)
+    migrated.end_session("Long Game", started + datetime.timedelta(hours=1), duration=3600.0)
+    assert migrated.get_game("Long Game")["total_seconds"] == 90062.0 + 3600.0
+    assert migrated.sessions("Long Game") == [
+        {"started_at": "2024-03-02T23:30:00", "ended_at": "2024-03-03T00:30:00", "duration": 3600.0}]
+    assert migrated.session_summaries()["Long Game"] == {
+        "game": "Long Game", "sessions": 1, "average": 3600.0, "longest": 3600.0}
+    # Split at midnight in the daily rollups
+    assert migrated.daily_totals() == [("Long Game", "2024-03-02", 1800.0), ("Long Game", "2024-03-03", 1800.0)]
+
+
+def test_migration_runs_once(migrated, tmp_path):
+    migrated.end_session("Old Game", datetime.datetime(2024, 1, 1), duration=60.0)
+    migrated.close()
+    reopened = TrackerStore(str(tmp_path / "game_tracker.db"), str(tmp_path / "game_tracker.json"))
+    try:
+        assert reopened.connection.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        assert reopened.get_game("Old Game")["total_seconds"] == 93784.0 + 60.0
+    finally:
+        reopened.close()
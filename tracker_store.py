@@ -0,0 +1,330 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import datetime
+import threading
+
+from instrumentation import get_logger, timed
+
+DISPLAY_FORMAT = "%Y-%m-%d %I:%M %p"  # Format used by the old game_tracker.json
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+-- session_count, session_seconds and longest_session roll up the recorded sessions;
+-- total_seconds also holds time imported from game_tracker.json
+CREATE TABLE IF NOT EXISTS games (
+    name TEXT PRIMARY KEY,
+    last_played TEXT,
+    total_seconds REAL NOT NULL DEFAULT 0,
+    start_time TEXT,
+    session_count INTEGER NOT NULL DEFAULT 0,
+    session_seconds REAL NOT NULL DEFAULT 0,
+    longest_session REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    ended_at TEXT,
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS sessions_by_game ON sessions (game, started_at);
+CREATE TABLE IF NOT EXISTS daily_totals (
+    game TEXT NOT NULL,
+    day TEXT NOT NULL,
+    seconds REAL NOT NULL DEFAULT 0,
+    sessions INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (game, day)
+);
+CREATE INDEX IF NOT EXISTS daily_totals_by_day ON daily_totals (day);
+"""
+
+DURATION_PATTERN = re.compile(r"^(?:(\d+) days?, )?(\d+):(\d{1,2}):(\d{1,2})(?:\.\d+)?$")
+
+log = get_logger("tracker_store")
+
+
+def parse_duration(text):
+    # Parses "HH:MM:SS" (hours may exceed 24) and str(timedelta) forms like "1 day, 2:03:04"
+    if not text or text == "N/A":
+        return 0.0
+    if text.isdigit():
+        return float(text)
+    match = DURATION_PATTERN.match(text.strip())
+    if not match:
+        raise ValueError(f"Unrecognised duration: {text}")
+    days, hours, minutes, seconds = (int(group or 0) for group in match.groups())
+    return float(((days * 24 + hours) * 60 + minutes) * 60 + seconds)
+
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def split_by_day(ended, duration):
+    # Splits a session that ended at `ended` into (day, seconds) chunks at midnight
+    start = ended - datetime.timedelta(seconds=duration)
+    if duration <= 0:
+        yield ended.date().isoformat(), 0.0
+        return
+    while start < ended:
+        next_midnight = datetime.datetime.combine(start.date() + datetime.timedelta(days=1), datetime.time.min)
+        chunk_end = min(ended, next_midnight)
+        yield start.date().isoformat(), (chunk_end - start).total_seconds()
+        start = chunk_end
+
+
+class TrackerStore:
+    # Play time data in SQLite (WAL mode): one row per game plus a session history.
+    # Every write is a small transaction, so a crash can't corrupt the whole file.
+    def __init__(self, db_path="game_tracker.db", json_path="game_tracker.json"):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.upgrade(json_path)
+
+    def upgrade(self, json_path):
+        with self.lock, self.connection:
+            version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                return
+            self.connection.executescript(SCHEMA)
+            if os.path.exists(json_path):
+                self.migrate_json(json_path)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def migrate_json(self, json_path):
+        # One-time import of game_tracker.json, the file itself is left as a backup
+        try:
+            with open(json_path, "r") as file:
+                data = json.load(file)
+        except (OSError, ValueError) as e:
+            log.warning("Could not migrate %s: %s", json_path, e)
+            return
+
+        rows = []
+        for name, game_data in data.items():
+            try:
+                total_seconds = parse_duration(game_data.get("total_played"))
+            except ValueError as e:
+                log.warning("Error parsing total_played for %s: %s", name, e)
+                total_seconds = 0.0
+            last_played = game_data.get("last_played")
+            start_time = game_data.get("start_time")
+            rows.append((
+                name,
+                None if last_played in (None, "N/A") else last_played,
+                total_seconds,
+                None if start_time in (None, "N/A") else start_time,
+            ))
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO games (name, last_played, total_seconds, start_time) VALUES (?, ?, ?, ?)", rows)
+        log.info("Migrated %s games from %s", len(rows), json_path)
+
+    def add_to_daily_totals(self, name, ended, duration):
+        # Rollups are maintained on every write so statistics never scan the session history
+        for index, (day, seconds) in enumerate(split_by_day(ended, duration)):
+            self.connection.execute(
+                "INSERT INTO daily_totals (game, day, seconds, sessions) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(game, day) DO UPDATE SET seconds = seconds + excluded.seconds, "
+                "sessions = sessions + excluded.sessions",
+                (name, day, seconds, 1 if index == 0 else 0))
+
+    def get_game(self, name):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT name, last_played, total_seconds, start_time FROM games WHERE name = ?", (name,)).fetchone()
+        return dict(row) if row else None
+
+    def all_games(self):
+        with self.lock:
+            rows = self.connection.execute("SELECT name, last_played, total_seconds, start_time FROM games").fetchall()
+        return {row["name"]: dict(row) for row in rows}
+
+    def start_session(self, name, now=None):
+        now = now or datetime.datetime.now()
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT INTO games (name, last_played, start_time) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET last_played = excluded.last_played, start_time = excluded.start_time",
+                (name, now.strftime(DISPLAY_FORMAT), now.strftime(DISPLAY_FORMAT)))
+            cursor = self.connection.execute(
+                "INSERT INTO sessions (game, started_at) VALUES (?, ?)", (name, now.isoformat(timespec="seconds")))
+        return cursor.lastrowid
+
+    def end_session(self, name, now=None, duration=None):
+        # duration should come from a monotonic clock; wall clock time is only a fallback
+        now = now or datetime.datetime.now()
+        with self.lock, self.connection:
+            session = self.connection.execute(
+                "SELECT id, started_at FROM sessions WHERE game = ? AND ended_at IS NULL "
+                "ORDER BY started_at DESC LIMIT 1", (name,)).fetchone()
+            if duration is None:
+                if not session:
+                    log.warning("No open session for %s", name)
+                    duration = 0.0
+                else:
+                    duration = max(0.0, (now - datetime.datetime.fromisoformat(session["started_at"])).total_seconds())
+            if session:
+                self.connection.execute(
+                    "UPDATE sessions SET ended_at = ?, duration = ? WHERE id = ?",
+                    (now.isoformat(timespec="seconds"), duration, session["id"]))
+            # Only a recorded session counts towards the session statistics
+            recorded = 1 if session else 0
+            self.connection.execute(
+                "INSERT INTO games (name, last_played, total_seconds, session_count, session_seconds, longest_session) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET last_played = excluded.last_played, "
+                "total_seconds = total_seconds + excluded.total_seconds, start_time = NULL, "
+                "session_count = session_count + excluded.session_count, "
+                "session_seconds = session_seconds + excluded.session_seconds, "
+                "longest_session = MAX(longest_session, excluded.longest_session)",
+                (name, now.strftime(DISPLAY_FORMAT), duration, recorded, duration * recorded, duration * recorded))
+            self.add_to_daily_totals(name, now, duration)
+        return duration
+
+    def sessions(self, name):
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT started_at, ended_at, duration FROM sessions WHERE game = ? ORDER BY started_at",
+                (name,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def session_summaries(self):
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT name AS game, session_count AS sessions, session_seconds / session_count AS average, "
+                "longest_session AS longest FROM games WHERE session_count > 0").fetchall()
+        return {row["game"]: dict(row) for row in rows}
+
+    def daily_totals(self, since=None):
+        # (game, day, seconds) rollup rows, optionally from an ISO date onwards
+        with self.lock:
+            if since:
+                rows = self.connection.execute(
+                    "SELECT game, day, seconds FROM daily_totals WHERE day >= ? ORDER BY day", (since,)).fetchall()
+            else:
+                rows = self.connection.execute("SELECT game, day, seconds FROM daily_totals ORDER BY day").fetchall()
+        return [tuple(row) for row in rows]
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+class TrackerCache:
+    # In-memory view of the tracker for the GUI. Lookups never touch the disk,
+    # writes are applied in memory at once and flushed to the store in batches.
+    # The data is reloaded if another process changes the database file.
+    def __init__(self, store, flush_delay=2.0, check_interval=5.0):
+        self.store = store
+        self.flush_delay = flush_delay
+        self.check_interval = check_interval
+        self.lock = threading.RLock()
+        self.games = None
+        self.open_sessions = {}
+        self.pending = []
+        self.timer = None
+        self.file_mtime = None
+        self.last_check = 0.0
+
+    def data_mtime(self):
+        mtimes = []
+        for path in (self.store.db_path, f"{self.store.db_path}-wal"):
+            try:
+                mtimes.append(os.stat(path).st_mtime)
+            except OSError:
+                pass
+        return max(mtimes, default=None)
+
+    @timed("tracker.load")
+    def load(self):
+        with self.lock:
+            self.games = self.store.all_games()
+            self.file_mtime = self.data_mtime()
+            self.last_check = time.monotonic()
+
+    def check_for_changes(self):
+        now = time.monotonic()
+        if now - self.last_check < self.check_interval or self.pending:
+            return
+        self.last_check = now
+        if self.data_mtime() != self.file_mtime:
+            log.info("Tracker database changed on disk, reloading")
+            self.load()
+
+    def get_game(self, name):
+        with self.lock:
+            if self.games is None:
+                self.load()
+            else:
+                self.check_for_changes()
+            return self.games.get(name)
+
+    def all_games(self):
+        with self.lock:
+            if self.games is None:
+                self.load()
+            return dict(self.games)
+
+    def game_record(self, name):
+        if self.games is None:
+            self.load()
+        return self.games.setdefault(name, {"name": name, "last_played": None, "total_seconds": 0.0, "start_time": None})
+
+    def start_session(self, name, now=None):
+        now = now or datetime.datetime.now()
+        with self.lock:
+            game = self.game_record(name)
+            game["last_played"] = game["start_time"] = now.strftime(DISPLAY_FORMAT)
+            self.open_sessions[name] = now
+            self.pending.append(("start", name, now, None))
+            self.schedule_flush()
+
+    def end_session(self, name, now=None, duration=None):
+        now = now or datetime.datetime.now()
+        with self.lock:
+            started = self.open_sessions.pop(name, None)
+            if duration is None:
+                duration = (now - started).total_seconds() if started else 0.0
+            game = self.game_record(name)
+            game["total_seconds"] += duration
+            game["last_played"] = now.strftime(DISPLAY_FORMAT)
+            game["start_time"] = None
+            self.pending.append(("end", name, now, duration))
+            self.schedule_flush()
+        return duration
+
+    def sessions(self, name):
+        self.flush()
+        return self.store.sessions(name)
+
+    def schedule_flush(self):
+        # Debounced: a burst of writes ends up in a single flush
+        if self.timer:
+            self.timer.cancel()
+        self.timer = threading.Timer(self.flush_delay, self.flush)
+        self.timer.daemon = True
+        self.timer.start()
+
+    @timed("tracker.flush")
+    def flush(self):
+        with self.lock:
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+            pending, self.pending = self.pending, []
+            for action, name, now, duration in pending:
+                if action == "start":
+                    self.store.start_session(name, now)
+                else:
+                    self.store.end_session(name, now, duration)
+            if pending:
+                self.file_mtime = self.data_mtime()
+                log.debug("Flushed %s tracker updates", len(pending))